@@ -3,89 +3,75 @@ Google Form Automation Script with Selenium and Flask Email Integration
 Complete Solution for Assignment Submission
 """
 
+import sys
 import time
 import os
+import uuid
 from datetime import datetime
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from flask import Flask
-from flask_mail import Mail, Message
-import logging
-from configg import EMAIL_CONFIG, FORM_DATA, GITHUB_REPO_URL,GOOGLE_FORM_URL, logger
-from emaill import send_email_with_latest_screenshot
-import re
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from configg import SCREENSHOTS_FOLDER, SCREENSHOT_OPTIONS, logger
+from field_matching import match_field
+from driver_pool import create_chrome_driver, is_session_error
+from form_dom import (Question, CHOICE_INPUT_TYPES, tag_questions, batch_fill, fill_section,
+                      click_next_section)
+from form_definition import parse_form_definition
+from page_snapshot import PageSnapshot, find_verification_code
+from schema_cache import fill_plan_cache
+from screenshot_writer import screenshot_writer
+from metrics import metrics, timed
+from rate_limit import get_limiter
+from readiness import (CONFIRMATION_SELECTOR, STEP_TIMEOUTS, LatencyBudget,
+                       wait_for_form_rendered, wait_for_interactable, detect_submission_outcome)
+from submission_result import SubmissionResult, should_capture_screenshot, record_result, ERROR
 # ==================== SELENIUM FORM FILLER CLASS ====================
 class SmartGoogleFormFiller:
     """Enhanced form filler with intelligent field detection"""
     
-    def __init__(self, form_url, form_data):
+    def __init__(self, form_url, form_data, driver_pool=None, batch_fill=True, plan_cache=None,
+                 run_id=None, browser_profile=None):
         self.form_url = form_url
         self.form_data = form_data
+        self.driver_pool = driver_pool
+        self.batch_fill = batch_fill
+        self.plan_cache = plan_cache or fill_plan_cache
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        # BROWSER_PROFILE when None; a driver_pool brings its own drivers
+        self.browser_profile = browser_profile
         self.driver = None
         self.wait = None
+        self.snapshot = None
+        self.screenshots = {}
+        self.result = None
+        self.section_plan = None
+        self.section_stats = []
         
+    @timed("setup_driver")
     def setup_driver(self):
-        """Initialize Chrome WebDriver"""
-        chrome_options = Options()
-        chrome_options.add_argument('--start-maximized')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        
-        self.driver = webdriver.Chrome(options=chrome_options)
+        """Initialize Chrome WebDriver, or check a warm one out of the pool"""
+        if self.driver_pool:
+            self.driver = self.driver_pool.acquire()
+        else:
+            self.driver = create_chrome_driver(self.browser_profile)
+            logger.info("✓ Chrome WebDriver initialized")
         self.wait = WebDriverWait(self.driver, 20)
-        logger.info("✓ Chrome WebDriver initialized")
         
+    def page_snapshot(self):
+        """HTML and question layout of the current page, fetched at most once"""
+        if self.snapshot is None:
+            self.snapshot = PageSnapshot.capture(self.driver)
+        return self.snapshot
+
+    @timed("extract_verification_code")
     def extract_verification_code(self):
         """Automatically extract verification code from the form"""
         try:
-            # Method 1: Look for "Type this code:" pattern
-            code_patterns = [
-                r"Type this code:\s*<b>(.*?)</b>",
-                r"Type this code:\s*(\w+)",
-                r"code:\s*<b>(.*?)</b>",
-                r"code:\s*(\w+)",
-                r"CAPTCHA:\s*(\w+)"
-            ]
-            
-            page_source = self.driver.page_source
-            
-            for pattern in code_patterns:
-                match = re.search(pattern, page_source, re.IGNORECASE)
-                if match:
-                    code = match.group(1).strip()
-                    logger.info(f"✓ Extracted verification code: {code}")
-                    return code
-            
-            # Method 2: Find bold text in verification div
-            try:
-                code_element = self.driver.find_element(By.XPATH, 
-                    "//div[contains(text(), 'Type this code') or contains(text(), 'code:')]//b")
-                code = code_element.text.strip()
-                if code:
-                    logger.info(f"✓ Extracted verification code: {code}")
-                    return code
-            except:
-                pass
-            
-            # Method 3: Look for any bold text near "code" keyword
-            try:
-                bold_elements = self.driver.find_elements(By.TAG_NAME, "b")
-                for elem in bold_elements:
-                    text = elem.text.strip()
-                    parent_text = elem.find_element(By.XPATH, "./..").text.lower()
-                    if "code" in parent_text and text and len(text) == 6:
-                        logger.info(f"✓ Extracted verification code: {text}")
-                        return text
-            except:
-                pass
+            # Precompiled patterns over the shared page snapshot, no extra round-trip
+            code = self.page_snapshot().verification_code()
+            if code:
+                logger.info("✓ Extracted verification code: %s", code)
+                return code
             
             logger.warning("Could not extract verification code automatically")
             return self.form_data.get("verification_code", "")
@@ -95,136 +81,356 @@ class SmartGoogleFormFiller:
             return self.form_data.get("verification_code", "")
     
     def fill_form(self):
-        """Main method to fill the form intelligently"""
+        """
+        Main method to fill the form intelligently.
+
+        The outcome is kept in `self.result` (a SubmissionResult) and
+        appended to the submission log.
+
+        Returns:
+            bool: True only if Google's confirmation page was shown
+        """
+        result = self.result = SubmissionResult(self.run_id, "browser", self.form_url)
+        with metrics.context(run_id=self.run_id, engine="browser"):
+            self._fill_form(result)
+        metrics.incr("submissions", engine="browser", result=result.status)
+        record_result(result)
+        return result.ok
+
+    def _fill_form(self, result):
+        driver_healthy = True
         try:
             self.setup_driver()
-            logger.info(f"Navigating to: {self.form_url}")
-            self.driver.get(self.form_url)
-            time.sleep(3)
-            # Extract verification code
-            verification_code = self.extract_verification_code()
-            if verification_code:
-                self.form_data["verification_code"] = verification_code
-            logger.info("Starting intelligent form filling...")
-            questions = self.analyze_form_structure()
-            self.smart_fill_all_fields(questions)
-            self._smart_submit()
-            time.sleep(3)
-            self._save_screenshot("after_submission")
-            logger.info("✓ Form completed successfully!")
-            return True
-            
+            logger.info("Navigating to: %s", self.form_url)
+            with LatencyBudget("navigate"), metrics.span("navigate"):
+                self.driver.get(self.form_url)
+                wait_for_form_rendered(self.driver)
+            self.snapshot = None
+            matched = self.load_fill_plan()
+            if self.section_plan:
+                self.fill_sections(self.section_plan)
+            else:
+                self.fill_matched(matched)
+            limiter = get_limiter("form")
+            if limiter is not None:
+                # Shared with the HTTP engine and every bulk worker
+                limiter.acquire()
+            with LatencyBudget("submit"):
+                if not self._smart_submit():
+                    raise NoSuchElementException("Submit button not found")
+                result.posted = True
+                with metrics.span("confirmation"):
+                    status = detect_submission_outcome(self.driver)
+            result.finish(status, final_url=self.driver.current_url)
+            if result.ok:
+                if limiter is not None:
+                    limiter.succeeded()
+                logger.info("✓ Form completed successfully!")
+            else:
+                logger.error("❌ Submission %s: no confirmation page", status)
+
         except Exception as e:
             logger.error(f"Error: {str(e)}")
-            self._save_screenshot("error")
-            return False
-            
+            # A timeout or missing element leaves the warm driver reusable
+            driver_healthy = not is_session_error(e)
+            result.finish(ERROR, error=str(e))
+
+        if not result.ok:
+            # The form (or its verification code) may have changed; re-analyze next time
+            self.plan_cache.invalidate("browser", self.form_url)
+
+        try:
+            if self.driver and should_capture_screenshot(self.run_id, result.ok):
+                if result.ok:
+                    result.screenshot = self._save_screenshot("after_submission",
+                                                              CONFIRMATION_SELECTOR)
+                else:
+                    result.screenshot = self._save_screenshot(result.status)
         finally:
-            if self.driver:
-                time.sleep(2)
+            if self.driver and self.driver_pool:
+                self.driver_pool.release(self.driver, healthy=driver_healthy)
+            elif self.driver:
                 self.driver.quit()
     
+    @timed("load_fill_plan")
+    def load_fill_plan(self):
+        """
+        Resolve which question gets which FORM_DATA value.
+
+        Uses the cached plan when the form's question layout is unchanged,
+        skipping code extraction and analysis entirely. A form with several
+        sections gets its plan for every section from the embedded form
+        definition, left in `self.section_plan` for fill_sections().
+
+        Returns:
+            list: (question, value, label) triples to fill on this page
+        """
+        content_hash = tag_questions(self.driver)
+        plan = self.plan_cache.get("browser", self.form_url, content_hash)
+
+        if plan is not None:
+            logger.info("✓ Using cached fill plan")
+            metrics.incr("plan_cache", result="hit")
+        else:
+            metrics.incr("plan_cache", result="miss")
+            plan = self.compile_fill_plan()
+            if plan.get('steps') or plan.get('sections'):
+                self.plan_cache.put("browser", self.form_url, content_hash, plan)
+
+        self.section_plan = plan.get('sections')
+        steps = [(Question(*fields), key, label) for key, label, fields in plan.get('steps', [])]
+        matched = (sum(len(section['fields']) for section in self.section_plan)
+                   if self.section_plan else len(steps))
+        metrics.incr("fields_matched", matched, engine="browser")
+        metrics.incr("fields_unmatched", plan.get('unmatched', 0), engine="browser")
+
+        if plan['verification_code']:
+            self.form_data["verification_code"] = plan['verification_code']
+        return self._values_for(steps)
+
+    def _values_for(self, steps):
+        """
+        Look up the form_data value of each (question, key, label) step.
+
+        Returns:
+            list: (question, value, label) for every step whose key has a value
+        """
+        matched = []
+        for question, key, label in steps:
+            value = self.form_data.get(key)
+            if value is None:
+                # e.g. an optional bulk column, or a code the page did not show
+                logger.warning("No value for %s", label)
+                continue
+            matched.append((question, value, label))
+        return matched
+
+    def compile_fill_plan(self):
+        """
+        Analyze the form and match its questions against FORM_DATA keys.
+
+        Returns:
+            dict: Cacheable plan with the verification code and either the
+            'steps' for this page or, for a multi-section form, the
+            'sections' to fill in order
+        """
+        verification_code = self.extract_verification_code()
+        try:
+            definition = parse_form_definition(self.page_snapshot().html, self.form_url)
+        except ValueError:
+            definition = None
+        if definition is not None and definition.section_count > 1:
+            return self.compile_section_plan(definition, verification_code)
+
+        logger.info("Starting intelligent form filling...")
+        questions = self.analyze_form_structure()
+        steps = self.match_questions(questions)
+        return {
+            'verification_code': verification_code,
+            'steps': [(key, label, [q.index, q.text, q.required, q.input_type,
+                                    q.locator, q.input_locator])
+                      for q, key, label in steps],
+            'unmatched': len(questions) - len(steps),
+        }
+
+    def compile_section_plan(self, definition, verification_code):
+        """
+        Plan every section of a multi-section form up front.
+
+        The embedded definition lists the questions of all sections, so no
+        section has to be rendered, scanned or matched before it is filled.
+
+        Returns:
+            dict: Plan with 'sections', each holding every entry ID of the
+            section and [entry_id, key, label] for its matched fields
+        """
+        sections = []
+        unmatched = 0
+        for number, fields in enumerate(definition.sections()):
+            matched = []
+            for field in fields:
+                match = match_field(field.title)
+                if match:
+                    key, label = match
+                    matched.append([field.entry_id, key, label])
+                else:
+                    unmatched += 1
+            sections.append({'entries': [field.entry_id for field in fields], 'fields': matched})
+            logger.info(f"✓ Section {number + 1}: {len(fields)} questions, "
+                        f"{len(matched)} matched")
+
+        # The code on the first page wins; otherwise it may be printed in a
+        # later section's description. Titles are left out, or a "Pin code"
+        # question described as "6 digits" would read as the code "6".
+        code = (self.page_snapshot().verification_code()
+                or find_verification_code("\n".join(definition.descriptions))
+                or verification_code)
+        return {
+            'verification_code': code,
+            'sections': sections,
+            'unmatched': unmatched,
+        }
+
+    @timed("analyze_form_structure")
     def analyze_form_structure(self):
-        """Analyze form structure to identify all questions"""
-        questions = []
-        
+        """Analyze form structure to identify all questions from the page snapshot"""
         try:
-            # Find all question containers
-            question_divs = self.driver.find_elements(By.CSS_SELECTOR, 
-                "div[jsmodel='CP1oW'], div[role='listitem']")
-            
-            for idx, div in enumerate(question_divs):
-                try:
-                    # Get question text
-                    heading = div.find_element(By.CSS_SELECTOR, 
-                        "div[role='heading'], .M4DNQ")
-                    question_text = heading.text.strip()
-                    
-                    # Get input field
-                    input_field = None
-                    try:
-                        input_field = div.find_element(By.CSS_SELECTOR, 
-                            "input[type='text'], input[type='email'], input[type='tel'], textarea")
-                    except:
-                        # Might be radio button
-                        pass
-                    
-                    # Check if required
-                    is_required = "*" in question_text
-                    
-                    questions.append({
-                        'index': idx,
-                        'text': question_text.replace('*', '').strip(),
-                        'element': div,
-                        'input': input_field,
-                        'required': is_required
-                    })
-                    
-                    logger.info(f"Found question {idx + 1}: {question_text[:50]}...")
-                    
-                except:
-                    continue
+            questions = self.page_snapshot().questions
+            for question in questions:
+                logger.info("Found question %d: %.50s...", question.index + 1, question.text)
             
-            logger.info(f"✓ Analyzed {len(questions)} questions")
+            logger.info("✓ Analyzed %d questions", len(questions))
             return questions
             
         except Exception as e:
             logger.error(f"Error analyzing form: {str(e)}")
             return []
     
-    def smart_fill_all_fields(self, questions):
-        """Intelligently fill all form fields"""
+    def match_questions(self, questions):
+        """
+        Match questions to FORM_DATA keys.
+
+        Returns:
+            list: (question, form_data_key, label) for every matched question
+        """
+        steps = []
         for question in questions:
-            question_text = question['text'].lower()
-            
             # Match question to data
-            if any(keyword in question_text for keyword in ['name', 'full name']):
-                self._fill_input(question, self.form_data['full_name'], "Full Name")
-                
-            elif any(keyword in question_text for keyword in ['contact', 'phone', 'mobile', 'number']):
-                self._fill_input(question, self.form_data['contact_number'], "Contact Number")
-                
-            elif any(keyword in question_text for keyword in ['email', 'e-mail']):
-                self._fill_input(question, self.form_data['email'], "Email")
-                
-            elif any(keyword in question_text for keyword in ['address', 'full address']):
-                self._fill_input(question, self.form_data['address'], "Address")
-                
-            elif any(keyword in question_text for keyword in ['pin', 'pincode', 'pin code', 'postal', 'zip']):
-                self._fill_input(question, self.form_data['pin_code'], "Pin Code")
-                
-            elif any(keyword in question_text for keyword in ['dob', 'date of birth', 'birth', 'birthday']):
-                self._fill_input(question, self.form_data['dob'], "Date of Birth")
-                
-            elif any(keyword in question_text for keyword in ['gender', 'sex']):
-                self._fill_input(question, self.form_data['gender'], "Gender")
-                
-            elif any(keyword in question_text for keyword in ['code', 'captcha', 'verify', 'verification']):
-                self._fill_input(question, self.form_data['verification_code'], "Verification Code")
+            match = match_field(question.text)
+            if match:
+                key, label = match
+                steps.append((question, key, label))
+        return steps
+
+    @timed("fill_sections")
+    def fill_sections(self, sections):
+        """
+        Fill a multi-section form from its section plan and advance through it.
+
+        Each section costs one script call that waits for it to render and
+        fills it, plus one to click Next. Per-section timings and round-trips
+        are kept in `self.section_stats`.
+        """
+        self.section_stats = []
+        for number, section in enumerate(sections):
+            started = time.perf_counter()
+            with LatencyBudget("section"), metrics.span("section", section=number):
+                round_trips = self._fill_section(section)
+                if number < len(sections) - 1:
+                    if not click_next_section(self.driver):
+                        raise NoSuchElementException(
+                            f"Next button not found in section {number + 1}")
+                    round_trips += 1
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.section_stats.append({'section': number, 'fields': len(section['fields']),
+                                       'elapsed_ms': round(elapsed_ms, 1),
+                                       'round_trips': round_trips})
+            metrics.incr("round_trips", round_trips, engine="browser")
+            logger.info("✓ Section %d/%d: %d fields in %.0f ms (%d round trips)",
+                        number + 1, len(sections), len(section['fields']), elapsed_ms,
+                        round_trips)
+
+    def _fill_section(self, section):
+        """
+        Wait for a section to render and fill it.
+
+        Returns:
+            int: WebDriver round-trips used
+        """
+        values = {}
+        labels = {}
+        for entry_id, key, label in section['fields']:
+            value = self.form_data.get(key)
+            if value is None:
+                logger.warning("No value for %s", label)
+                continue
+            values[entry_id] = value
+            labels[entry_id] = label
+
+        polls = 0
+
+        def section_filled(driver):
+            nonlocal polls
+            polls += 1
+            return fill_section(driver, section['entries'], values.items())
+
+        # On a timeout the section plan may be stale; fill_form() drops it
+        missing, rejected = WebDriverWait(
+            self.driver, STEP_TIMEOUTS['section_rendered']).until(section_filled)
+
+        for entry_id in missing:
+            logger.warning("Could not locate %s on the page", labels[entry_id])
+        for entry_id, value in values.items():
+            if entry_id in rejected:
+                locator = f"[data-gff-entry='{entry_id}']"
+                question = Question(entry_id, labels[entry_id], False, None, locator, locator)
+                self._fill_input(question, value, labels[entry_id])
+            elif entry_id not in missing:
+                logger.info("✓ Filled %s", labels[entry_id], extra={'value': value})
+        if rejected:
+            metrics.incr("retries", len(rejected), step="fill_field")
+        return polls
+
+    @timed("smart_fill_all_fields")
+    def smart_fill_all_fields(self, questions):
+        """Intelligently fill all form fields"""
+        self.fill_matched(self._values_for(self.match_questions(questions)))
+
+    @timed("fill_fields")
+    def fill_matched(self, matched):
+        """Fill (question, value, label) triples"""
+        # Set every text field in one script; anything it rejects falls
+        # back to the per-field clear/send_keys path
+        if self.batch_fill:
+            batched = [(q, v, l) for q, v, l in matched if q.input_locator]
+            try:
+                rejected = batch_fill(self.driver,
+                                      [(q.input_locator, v) for q, v, _ in batched])
+                for question, value, label in batched:
+                    if question.input_locator not in rejected:
+                        logger.info("✓ Filled %s", label, extra={'value': value})
+                matched = [(q, v, l) for q, v, l in matched
+                           if not q.input_locator or q.input_locator in rejected]
+                if rejected:
+                    metrics.incr("retries", len(rejected), step="fill_field")
+            except WebDriverException as e:
+                logger.warning(f"Batch fill failed, filling field by field: {e}")
+
+        for question, value, label in matched:
+            self._fill_input(question, value, label)
     
     def _fill_input(self, question, value, field_name):
         """Fill a text input field"""
+        if not question.input_locator and question.input_type in CHOICE_INPUT_TYPES:
+            # Nothing to type into; waiting on the hidden entry input would only time out
+            logger.warning("Could not fill %s: %s questions are not supported",
+                           field_name, question.input_type)
+            return
         try:
-            if question['input']:
-                input_field = question['input']
+            with LatencyBudget("fill_field"):
+                if question.input_locator:
+                    input_field = self.driver.find_element(By.CSS_SELECTOR, 
+                        question.input_locator)
+                else:
+                    input_field = self.driver.find_element(By.CSS_SELECTOR, 
+                        f"{question.locator} input:not([type='hidden']), "
+                        f"{question.locator} textarea")
+                wait_for_interactable(self.driver, input_field)
                 input_field.clear()
-                time.sleep(0.3)
                 input_field.send_keys(value)
-                logger.info(f"✓ Filled {field_name}: {value}")
-            else:
-
-                input_field = question['element'].find_element(By.CSS_SELECTOR, 
-                    "input, textarea")
-                input_field.clear()
-                time.sleep(0.3)
-                input_field.send_keys(value)
-                logger.info(f"✓ Filled {field_name}: {value}")
+            logger.info("✓ Filled %s", field_name, extra={'value': value})
         except Exception as e:
-            logger.warning(f"Could not fill {field_name}: {str(e)}")
+            logger.warning("Could not fill %s: %s", field_name, e)
 
     
+    @timed("submit")
     def _smart_submit(self):
-        """Smart form submission"""
+        """
+        Smart form submission.
+
+        Returns:
+            bool: True if a submit button was clicked
+        """
         try:
             # Method 1: Find submit button by text
             submit_buttons = self.driver.find_elements(By.CSS_SELECTOR, 
@@ -234,7 +440,7 @@ class SmartGoogleFormFiller:
                 if 'submit' in button.text.lower():
                     button.click()
                     logger.info("✓ Form submitted")
-                    return
+                    return True
             
             # Method 2: Find by specific class
             try:
@@ -242,7 +448,7 @@ class SmartGoogleFormFiller:
                     "div[role='button'].uArJ5e")
                 submit_btn.click()
                 logger.info("✓ Form submitted")
-                return
+                return True
             except:
                 pass
             
@@ -250,15 +456,32 @@ class SmartGoogleFormFiller:
             
         except Exception as e:
             logger.error(f"Error submitting: {str(e)}")
+        return False
     
-    def _save_screenshot(self, name):
-        """Save screenshot and return its filename"""
+    @timed("screenshot")
+    def _save_screenshot(self, name, element_selector=None):
+        """
+        Capture a screenshot and return its filename.
+        
+        Only the capture happens here; compression, the disk write and the
+        manifest entry run on the background screenshot writer. With
+        `element_selector` (and SCREENSHOT_OPTIONS['element_only']) only that
+        element is captured when it is present.
+        """
         try:
-            os.makedirs("screenshots", exist_ok=True)
-            filename = f"screenshots/{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+            filename = os.path.join(SCREENSHOTS_FOLDER,
+                f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{self.run_id}.png")
             # Take screenshot using Selenium
-            self.driver.save_screenshot(filename)
-            logger.info(f"Screenshot saved: {filename}")
+            elements = []
+            if element_selector and SCREENSHOT_OPTIONS['element_only']:
+                elements = self.driver.find_elements(By.CSS_SELECTOR, element_selector)
+            if elements:
+                png_bytes = elements[0].screenshot_as_png
+            else:
+                png_bytes = self.driver.get_screenshot_as_png()
+            screenshot_writer.submit(png_bytes, filename, self.run_id, name)
+            self.screenshots[name] = filename
+            logger.info("Screenshot queued: %s", filename)
             return filename  # ✅ Return the path
         except Exception as e:
             logger.error(f"Screenshot failed: {e}")
@@ -268,61 +491,7 @@ class SmartGoogleFormFiller:
 
 
 # ==================== MAIN ====================
-def main():
-
-    # Validate config
-    if "YOUR_" in GOOGLE_FORM_URL or "your." in EMAIL_CONFIG['sender_email']:
-        logger.error("❌ Please update configuration first!")
-        return
-
-    logger.info("=" * 70)
-    logger.info("STEP 1: Smart Form Filling")
-    logger.info("=" * 70)
-
-    filler = SmartGoogleFormFiller(GOOGLE_FORM_URL, FORM_DATA)
-    form_success = filler.fill_form()
-
-    if not form_success:
-        logger.error("❌ Form filling failed")
-        return
-
-
-    screenshots = []
-    try:
-        time.sleep(3)  # Wait to ensure confirmation page is fully loaded
-        after = filler._save_screenshot("after_submission")
-        if after:
-            screenshots.append(after)
-    except Exception as e:
-        logger.warning(f"Screenshot capture failed: {e}")
-
-    # Quit driver safely
-    try:
-        filler.driver.quit()
-    except Exception as e:
-        logger.warning(f"Driver quit issue: {e}")
-
-    time.sleep(2)
-
-    logger.info("\n" + "=" * 70)
-    logger.info("STEP 2: Email Submission")
-    logger.info("=" * 70)
-
-    email_success = send_email_with_latest_screenshot()
-
-    if email_success:
-        logger.info("\n" + "=" * 70)
-        logger.info("✓ ✓ ✓  ASSIGNMENT COMPLETED!  ✓ ✓ ✓")
-        logger.info("=" * 70)
-    else:
-        logger.error("❌ Email failed (but form was submitted)")
-
-
+# `python Form.py` is kept as an alias of `python cli.py fill`
 if __name__ == "__main__":
-    try:
-        main()
-    except KeyboardInterrupt:
-        logger.info("\nInterrupted by user")
-    except Exception as e:
-        logger.error(f"Error: {str(e)}")
-        raise
\ No newline at end of file
+    from cli import main
+    sys.exit(main(["fill"]))
@@ -0,0 +1,155 @@
+"""
+Shared cache of base64-encoded email attachments.
+
+Each file is read and encoded once (memory-mapped when large) and the
+encoded MIME payload is reused for every message that attaches it. An
+entry is invalidated when the file's mtime or size changes, and the
+cache is held under a memory budget with LRU eviction.
+"""
+
+import base64
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from flask_mail import Message
+from configg import logger
+
+CONTENT_TYPES = {
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif',
+    '.pdf': 'application/pdf',
+    '.doc': 'application/msword',
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    '.txt': 'text/plain'
+}
+
+# Header that marks a placeholder part to be swapped for a cached payload
+CACHE_HEADER = 'X-Attachment-Cache'
+
+
+class CachedAttachment:
+    """A file's base64 MIME payload plus what is needed to validate it"""
+
+    __slots__ = ('path', 'filename', 'content_type', 'encoded', 'size', 'mtime')
+
+    def __init__(self, path, filename, content_type, encoded, size, mtime):
+        self.path = path
+        self.filename = filename
+        self.content_type = content_type
+        self.encoded = encoded
+        self.size = size
+        self.mtime = mtime
+
+
+def _encode_file(path, size, mmap_threshold):
+    """Base64-encode a file exactly as email.encoders.encode_base64 would"""
+    with open(path, 'rb') as f:
+        if size == 0:
+            return ""
+        if size >= mmap_threshold:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                encoded = base64.encodebytes(data)
+                ends_with_newline = data[-1:] == b"\n"
+        else:
+            data = f.read()
+            encoded = base64.encodebytes(data)
+            ends_with_newline = data[-1:] == b"\n"
+    if not ends_with_newline and encoded.endswith(b"\n"):
+        encoded = encoded[:-1]
+    return encoded.decode('ascii')
+
+
+class AttachmentCache:
+    """Thread-safe LRU cache of encoded attachments under a byte budget"""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, mmap_threshold=1024 * 1024):
+        self.max_bytes = max_bytes
+        self.mmap_threshold = mmap_threshold
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, file_path):
+        """
+        Return the encoded attachment for a file, encoding it on a miss.
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.mtime == stat.st_mtime_ns and entry.size == stat.st_size:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry
+            if entry is not None:
+                self._drop(path)
+
+        self.misses += 1
+        ext = os.path.splitext(path)[1].lower()
+        entry = CachedAttachment(
+            path=path,
+            filename=os.path.basename(path),
+            content_type=CONTENT_TYPES.get(ext, 'application/octet-stream'),
+            encoded=_encode_file(path, stat.st_size, self.mmap_threshold),
+            size=stat.st_size,
+            mtime=stat.st_mtime_ns,
+        )
+
+        if len(entry.encoded) <= self.max_bytes:
+            with self._lock:
+                if path in self._entries:
+                    self._drop(path)
+                self._entries[path] = entry
+                self._bytes += len(entry.encoded)
+                while self._bytes > self.max_bytes:
+                    self._drop(next(iter(self._entries)))
+        else:
+            logger.warning(f"⚠️ {entry.filename} exceeds the attachment cache budget, not cached")
+        return entry
+
+    def _drop(self, path):
+        entry = self._entries.pop(path)
+        self._bytes -= len(entry.encoded)
+
+    @property
+    def size_bytes(self):
+        return self._bytes
+
+
+class CachedMessage(Message):
+    """Flask-Mail message that reuses pre-encoded attachment payloads"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cached_attachments = {}
+
+    def attach_cached(self, entry):
+        """Attach a CachedAttachment without re-reading or re-encoding it"""
+        key = str(len(self.cached_attachments))
+        self.cached_attachments[key] = entry
+        # Flask-Mail encodes an empty placeholder; _message swaps in the payload
+        self.attach(filename=entry.filename, content_type=entry.content_type,
+                    data=b"", headers=[(CACHE_HEADER, key)])
+
+    def _message(self):
+        msg = super()._message()
+        if self.cached_attachments:
+            for part in msg.walk():
+                key = part.get(CACHE_HEADER)
+                if key is not None:
+                    part.set_payload(self.cached_attachments[key].encoded)
+                    del part[CACHE_HEADER]
+        return msg
+
+
+# Shared per-process cache used by emaill
+attachment_cache = AttachmentCache()
@@ -0,0 +1,80 @@
+"""
+Compare the "default" and "lean" Chrome profiles on page weight and
+time-to-interactive against the local fixture form (with its stylesheet,
+fonts, header image, scripts and analytics tag).
+
+Needs Chrome and chromedriver on PATH. Bytes are counted by the local
+server, so requests the lean profile blocks never show up; the browser
+cache is cleared before every load.
+
+    python -m benchmarks.bench_browser_profile --loads 10
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks.form_server import FormServer
+from configg import setup_logging
+from driver_pool import create_chrome_driver
+from readiness import wait_for_form_rendered
+
+
+def _measure(profile, form_url, server, loads):
+    driver = create_chrome_driver(profile)
+    tti, dom_interactive, transferred = [], [], []
+    try:
+        for _ in range(loads):
+            driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+            driver.get("about:blank")
+            before = server.bytes_served
+
+            started = time.perf_counter()
+            driver.get(form_url)
+            wait_for_form_rendered(driver)
+            tti.append(time.perf_counter() - started)
+
+            dom_interactive.append(driver.execute_script(
+                "const t = performance.getEntriesByType('navigation')[0];"
+                "return t ? t.domInteractive : null;") or 0)
+            # Let async requests (analytics, fonts) land before counting bytes
+            time.sleep(0.5)
+            transferred.append(server.bytes_served - before)
+    finally:
+        driver.quit()
+
+    return {
+        'profile': profile,
+        'tti_ms': round(statistics.median(tti) * 1000, 1),
+        'dom_interactive_ms': round(statistics.median(dom_interactive), 1),
+        'bytes': int(statistics.median(transferred)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chrome profile benchmark")
+    parser.add_argument("--loads", type=int, default=10)
+    parser.add_argument("--questions", type=int, default=20)
+    args = parser.parse_args()
+    setup_logging()
+
+    server = FormServer().start()
+    form_url = server.add_form("profile", questions=args.questions, assets=True)
+    try:
+        results = [_measure(profile, form_url, server, args.loads)
+                   for profile in ("default", "lean")]
+    finally:
+        server.stop()
+
+    print(f"{'profile':<10}{'time-to-interactive':>22}{'domInteractive':>17}{'bytes':>12}")
+    for r in results:
+        print(f"{r['profile']:<10}{r['tti_ms']:>19} ms{r['dom_interactive_ms']:>14} ms"
+              f"{r['bytes']:>12}")
+    default, lean = results
+    if default['bytes']:
+        print(f"lean transfers {100 - lean['bytes'] * 100 // default['bytes']}% fewer bytes, "
+              f"time-to-interactive {default['tti_ms'] - lean['tti_ms']:.1f} ms lower")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Verification-code extraction over large saved page sources.
+
+Compares the original chain of five uncompiled regex scans with the
+precompiled patterns used by page_snapshot, after checking on random
+snippets that both pick the same code.
+
+    python -m benchmarks.bench_code_extraction --questions 100 1000 5000 --fuzz 20000
+"""
+
+import argparse
+import random
+import re
+import timeit
+
+from benchmarks.form_fixtures import build_form_html
+from field_matching import VERIFICATION_CODE_PATTERNS
+from page_snapshot import code_from_patterns, find_verification_code
+
+# Pieces random snippets are built from: every keyword in both cases, bold
+# tags in both cases, separators and candidate codes
+FUZZ_TOKENS = ["Type this code:", "type THIS code: ", "code:", "Code:", "CODE: ", "captcha:",
+               "CAPTCHA: ", "<b>", "</b>", "<B>", "</B>", " ", "\n", ":", "x:", "AB12", "Q9",
+               "GF2025", "_", "-", "é"]
+
+
+def legacy_find(page_source):
+    for pattern in VERIFICATION_CODE_PATTERNS:
+        match = re.search(pattern, page_source, re.IGNORECASE)
+        if match:
+            return match.group(1).strip()
+    return None
+
+
+def check_equivalence(samples, seed=0):
+    """
+    Compare code_from_patterns() with the legacy chain on random snippets.
+
+    Raises:
+        AssertionError: On the first snippet where they disagree
+    """
+    rng = random.Random(seed)
+    for _ in range(samples):
+        snippet = "".join(rng.choice(FUZZ_TOKENS) for _ in range(rng.randint(0, 25)))
+        expected, actual = legacy_find(snippet), code_from_patterns(snippet)
+        assert expected == actual, f"{snippet!r}: legacy {expected!r}, precompiled {actual!r}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verification code extraction benchmark")
+    parser.add_argument("--questions", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--fuzz", type=int, default=20000,
+                        help="Random snippets to check against the legacy chain first")
+    args = parser.parse_args()
+
+    check_equivalence(args.fuzz)
+    print(f"{args.fuzz} random snippets: same code as the legacy chain")
+
+    for size in args.questions:
+        for label, code in (("code present", "GF2025"), ("code absent", None)):
+            page = build_form_html(questions=size, verification_code=code)
+            assert legacy_find(page) == find_verification_code(page) or code is None
+            legacy = timeit.timeit(lambda: legacy_find(page), number=args.repeats) / args.repeats
+            precompiled = timeit.timeit(lambda: find_verification_code(page),
+                                        number=args.repeats) / args.repeats
+            print(f"{size:>5} questions ({len(page) // 1024:>5} KiB) {label:<12}  "
+                  f"legacy {legacy * 1000:8.3f} ms  precompiled {precompiled * 1000:8.3f} ms  "
+                  f"x{legacy / precompiled:.1f}")
+
+
+if __name__ == "__main__":
+    main()
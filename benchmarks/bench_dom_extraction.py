@@ -0,0 +1,88 @@
+"""
+Per-element vs single round-trip question extraction on a large fixture form.
+
+Needs Chrome and chromedriver on PATH.
+
+    python -m benchmarks.bench_dom_extraction --questions 100 300
+"""
+
+import argparse
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+
+from benchmarks.form_server import FormServer
+from form_dom import QUESTION_SELECTOR, extract_questions
+
+
+def legacy_analyze(driver):
+    """The original find_elements + per-question find_element walk"""
+    questions = []
+    for idx, div in enumerate(driver.find_elements(By.CSS_SELECTOR, QUESTION_SELECTOR)):
+        try:
+            heading = div.find_element(By.CSS_SELECTOR, "div[role='heading'], .M4DNQ")
+            text = heading.text.strip()
+            try:
+                input_field = div.find_element(
+                    By.CSS_SELECTOR,
+                    "input[type='text'], input[type='email'], input[type='tel'], textarea")
+            except Exception:
+                input_field = None
+            questions.append({'index': idx, 'text': text, 'element': div,
+                              'input': input_field, 'required': "*" in text})
+        except Exception:
+            continue
+    return questions
+
+
+class RoundTripCounter:
+    """Counts WebDriver commands by wrapping driver.execute"""
+
+    def __init__(self, driver):
+        self.count = 0
+        original = driver.execute
+
+        def execute(*args, **kwargs):
+            self.count += 1
+            return original(*args, **kwargs)
+
+        driver.execute = execute
+
+
+def _measure(driver, counter, analyze, repeats):
+    counter.count = 0
+    started = time.perf_counter()
+    for _ in range(repeats):
+        found = analyze(driver)
+    elapsed = (time.perf_counter() - started) / repeats
+    return elapsed, counter.count // repeats, len(found)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DOM extraction benchmark")
+    parser.add_argument("--questions", type=int, nargs="+", default=[20, 100, 300])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    options = Options()
+    options.add_argument("--headless=new")
+    driver = webdriver.Chrome(options=options)
+    server = FormServer().start()
+    counter = RoundTripCounter(driver)
+    try:
+        for size in args.questions:
+            driver.get(server.add_form(f"q{size}", questions=size))
+            for label, analyze in (("per-element", legacy_analyze),
+                                   ("single-script", extract_questions)):
+                elapsed, trips, found = _measure(driver, counter, analyze, args.repeats)
+                print(f"{size:>4} questions  {label:<13} {elapsed * 1000:8.1f} ms  "
+                      f"{trips:>5} round-trips  {found} found")
+    finally:
+        driver.quit()
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
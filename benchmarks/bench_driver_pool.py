@@ -0,0 +1,60 @@
+"""
+Compare one-Chrome-per-submission against the warm driver pool.
+
+Needs Chrome and chromedriver on PATH.
+
+    python -m benchmarks.bench_driver_pool --submissions 10
+"""
+
+import argparse
+import time
+
+from benchmarks.form_server import FormServer
+from benchmarks.local_state import isolate_state
+from configg import RATE_LIMITS, setup_logging
+from driver_pool import DriverPool
+from Form import SmartGoogleFormFiller
+
+FORM_DATA = {
+    "full_name": "Test User", "contact_number": "9876543210",
+    "email": "test@example.com", "address": "221B Baker Street",
+    "pin_code": "411001", "dob": "01/01/2000", "gender": "Female",
+}
+
+
+def _run(form_url, submissions, driver_pool=None):
+    started = time.perf_counter()
+    for _ in range(submissions):
+        SmartGoogleFormFiller(form_url, dict(FORM_DATA), driver_pool=driver_pool).fill_form()
+    return (time.perf_counter() - started) / submissions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Driver pool benchmark")
+    parser.add_argument("--submissions", type=int, default=10)
+    parser.add_argument("--max-uses", type=int, default=50)
+    args = parser.parse_args()
+    setup_logging()
+    isolate_state()
+    RATE_LIMITS.update(form=None, email=None)  # measure the engine, not the pacing
+
+    server = FormServer().start()
+    form_url = server.add_form()
+    try:
+        cold = _run(form_url, args.submissions)
+        pool = DriverPool(size=1, max_uses=args.max_uses)
+        try:
+            warm = _run(form_url, args.submissions, driver_pool=pool)
+            report = pool.report()
+        finally:
+            pool.close()
+    finally:
+        server.stop()
+
+    print(f"per submission, fresh Chrome: {cold * 1000:.0f} ms")
+    print(f"per submission, pooled:       {warm * 1000:.0f} ms")
+    print(f"cold start: {report['cold_start_ms']} ms  warm reuse: {report['warm_reuse_ms']} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Submit the fixture form repeatedly through the HTTP engine.
+
+    python -m benchmarks.bench_http_engine --submissions 200 --questions 20
+"""
+
+import argparse
+import time
+
+from benchmarks.form_server import FormServer
+from benchmarks.local_state import isolate_state
+from configg import RATE_LIMITS, setup_logging
+from http_filler import HttpGoogleFormFiller, HttpSession
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP engine benchmark")
+    parser.add_argument("--submissions", type=int, default=100)
+    parser.add_argument("--questions", type=int, default=8)
+    args = parser.parse_args()
+    setup_logging()
+    isolate_state()
+    RATE_LIMITS.update(form=None, email=None)  # measure the engine, not the pacing
+
+    server = FormServer().start()
+    server.add_form(questions=args.questions)
+    form_data = {
+        "full_name": "Test User", "contact_number": "9876543210",
+        "email": "test@example.com", "address": "221B Baker Street",
+        "pin_code": "411001", "dob": "01/01/2000", "gender": "Female",
+    }
+
+    session = HttpSession()
+    latencies = []
+    try:
+        for _ in range(args.submissions):
+            start = time.perf_counter()
+            ok = HttpGoogleFormFiller(server.short_url(), dict(form_data), session=session).fill_form()
+            latencies.append(time.perf_counter() - start)
+            if not ok:
+                raise SystemExit("Submission failed")
+    finally:
+        session.close()
+        server.stop()
+
+    latencies.sort()
+    total = sum(latencies)
+    print(f"submissions: {len(server.submissions)}")
+    print(f"mean: {total / len(latencies) * 1000:.2f} ms  "
+          f"p50: {latencies[len(latencies) // 2] * 1000:.2f} ms  "
+          f"throughput: {len(latencies) / total:.1f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Hot-path cost of logging: synchronous f-string records vs the queued pipeline.
+
+Several threads each "fill" submissions the way the fillers do, logging
+one record per field inside a metrics.context(). The synchronous mode
+logs like the fillers used to: a StreamHandler on the root logger and
+an f-string message that includes the value. The queued mode uses
+log_pipeline with %-style messages and the value as a redacted field.
+
+The sink is a file. --sink-latency-us adds a delay to every write, to
+stand in for a slow or contended console.
+
+    python -m benchmarks.bench_logging --threads 8 --submissions 500 --sink-latency-us 0 100
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+import log_pipeline
+from configg import LOG_FORMAT, logger
+from metrics import metrics
+
+FIELDS = [
+    ("Full Name", "Test User"), ("Contact Number", "9876543210"),
+    ("Email", "test.user@example.com"), ("Address", "221B Baker Street, Pune"),
+    ("Pin Code", "411001"), ("Date of Birth", "01/01/2000"), ("Gender", "Female"),
+]
+
+
+class SlowFile:
+    """File whose every write takes at least `latency` seconds, like a busy terminal"""
+
+    def __init__(self, path, latency):
+        self.file = open(path, 'w', encoding='utf-8')
+        self.latency = latency
+
+    def write(self, text):
+        if self.latency:
+            time.sleep(self.latency)
+        return self.file.write(text)
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def _sync_call(label, value):
+    logger.info(f"✓ Filled {label}: {value}")
+
+
+def _queued_call(label, value):
+    logger.info("✓ Filled %s", label, extra={'value': value})
+
+
+def _run(call, threads, submissions):
+    """Per-call latencies (seconds) measured on the logging threads"""
+    latencies = [[] for _ in range(threads)]
+
+    def worker(index):
+        samples = latencies[index]
+        for submission in range(submissions):
+            with metrics.context(run_id=f"run{index}-{submission}", row_id=str(submission)):
+                for label, value in FIELDS:
+                    started = time.perf_counter()
+                    call(label, value)
+                    samples.append(time.perf_counter() - started)
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return [s for samples in latencies for s in samples], time.perf_counter() - started
+
+
+def _measure(mode, path, latency, threads, submissions):
+    sink = SlowFile(path, latency)
+    root = logging.getLogger()
+    if mode == "sync":
+        handler = logging.StreamHandler(sink)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+        samples, elapsed = _run(_sync_call, threads, submissions)
+        total = elapsed
+        root.removeHandler(handler)
+    else:
+        log_pipeline.start_logging(logging.INFO, stream=sink)
+        started = time.perf_counter()
+        samples, elapsed = _run(_queued_call, threads, submissions)
+        # Everything queued is written out before the listener stops
+        log_pipeline.stop_logging()
+        total = time.perf_counter() - started
+    sink.close()
+
+    with open(path, encoding='utf-8') as f:
+        lines = f.readlines()
+    personal = [value for label, value in FIELDS if label != "Gender"]
+    leaked = sum(1 for line in lines if any(value in line for value in personal))
+    ordered = sorted(samples)
+    return {
+        'p50_us': statistics.median(ordered) * 1e6,
+        'p99_us': ordered[int(len(ordered) * 0.99)] * 1e6,
+        'hot_path_s': elapsed,
+        'total_s': total,
+        'records': len(lines),
+        'leaked': leaked,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Logging hot-path benchmark")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--submissions", type=int, default=500, help="Submissions per thread")
+    parser.add_argument("--sink-latency-us", type=float, nargs="+", default=[0, 100],
+                        help="Extra time each write to the sink takes")
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp(prefix="gff-logging-")
+    records = args.threads * args.submissions * len(FIELDS)
+    print(f"{args.threads} threads, {records} records")
+    for latency in args.sink_latency_us:
+        print(f"sink latency {latency:g} us/write")
+        for mode in ("sync", "queued"):
+            stats = _measure(mode, os.path.join(folder, f"{mode}.log"), latency / 1e6,
+                             args.threads, args.submissions)
+            print(f"  {mode:7} per call p50 {stats['p50_us']:7.1f} us, "
+                  f"p99 {stats['p99_us']:8.1f} us; hot path {stats['hot_path_s']:.2f}s, "
+                  f"all written {stats['total_s']:.2f}s; "
+                  f"{stats['leaked']}/{stats['records']} lines with personal data")
+
+
+if __name__ == "__main__":
+    main()
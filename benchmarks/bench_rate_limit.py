@@ -0,0 +1,107 @@
+"""
+Throughput against a throttling endpoint: backoff alone vs the adaptive
+shared token bucket.
+
+The local form server answers 429 once more than --limit posts per
+second arrive. Several threads submit as fast as they are allowed for
+--duration seconds in each mode.
+
+    python -m benchmarks.bench_rate_limit --limit 20 --threads 8 --duration 30
+"""
+
+import argparse
+import logging
+import statistics
+import threading
+import time
+
+import rate_limit
+from benchmarks.form_server import FormServer
+from benchmarks.local_state import isolate_state
+from configg import RATE_LIMITS, setup_logging, logger
+from http_filler import HttpGoogleFormFiller
+
+FORM_DATA = {
+    "full_name": "Test User", "contact_number": "9876543210",
+    "email": "test@example.com", "address": "221B Baker Street",
+    "pin_code": "411001", "dob": "01/01/2000", "gender": "Female",
+}
+
+
+def _count(server, kind):
+    with server._lock:
+        return sum(1 for event in server.events if event[0] == kind)
+
+
+def _run(server, form_url, threads, duration):
+    stop = time.monotonic() + duration
+    accepted_before = _count(server, "submitted")
+    throttled_before = _count(server, "throttled")
+    failed = [0]
+    lock = threading.Lock()
+
+    def worker():
+        filler = HttpGoogleFormFiller(form_url, dict(FORM_DATA))
+        while time.monotonic() < stop:
+            filler.form_data = dict(FORM_DATA)
+            if not filler.fill_form():
+                with lock:
+                    failed[0] += 1
+        filler.session.close()
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.monotonic()
+    for thread in pool:
+        thread.start()
+
+    # Accepted submissions per second, to show how steady the pace is
+    per_second = []
+    last = accepted_before
+    while any(thread.is_alive() for thread in pool):
+        time.sleep(1.0)
+        now = _count(server, "submitted")
+        per_second.append(now - last)
+        last = now
+    elapsed = time.monotonic() - started
+
+    return {
+        'accepted_per_sec': round((last - accepted_before) / elapsed, 2),
+        'throttled': _count(server, "throttled") - throttled_before,
+        'failed': failed[0],
+        'stdev_per_sec': round(statistics.pstdev(per_second[:-1] or [0]), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rate limiter benchmark")
+    parser.add_argument("--limit", type=float, default=20.0, help="Server limit, posts/second")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30.0)
+    args = parser.parse_args()
+    setup_logging()
+    isolate_state()
+    logger.setLevel(logging.ERROR)
+
+    server = FormServer(throttle_rate=args.limit).start()
+    form_url = server.add_form()
+    try:
+        RATE_LIMITS['form'] = None
+        backoff = _run(server, form_url, args.threads, args.duration)
+
+        RATE_LIMITS['form'] = {"rate": args.limit / 4, "burst": 2, "min_rate": 0.5,
+                               "max_rate": args.limit * 4, "increase": args.limit / 10}
+        limiter = rate_limit.get_limiter("form")
+        adaptive = _run(server, form_url, args.threads, args.duration)
+    finally:
+        server.stop()
+
+    print(f"server limit: {args.limit}/s, {args.threads} threads, {args.duration}s each")
+    for name, stats in (("backoff only", backoff), ("adaptive bucket", adaptive)):
+        print(f"  {name:16} {stats['accepted_per_sec']:7.2f} accepted/s "
+              f"(stdev {stats['stdev_per_sec']}/s), {stats['throttled']} throttled, "
+              f"{stats['failed']} failed")
+    print(f"  limiter settled at {limiter.rate:.2f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Per-section latency and round-trips for multi-section forms.
+
+The HTTP engine posts every section in one request; the browser filler
+fills each section from the prefetched plan (needs Chrome and
+chromedriver on PATH, skipped otherwise).
+
+    python -m benchmarks.bench_sections --sections 1 5 20 --questions-per-section 4
+"""
+
+import argparse
+import logging
+import statistics
+import time
+
+from benchmarks.form_server import FormServer
+from benchmarks.local_state import isolate_state
+from configg import RATE_LIMITS, setup_logging, logger
+from http_filler import HttpGoogleFormFiller
+
+FORM_DATA = {
+    "full_name": "Test User", "contact_number": "9876543210",
+    "email": "test@example.com", "address": "221B Baker Street",
+    "pin_code": "411001", "dob": "01/01/2000", "gender": "Female",
+}
+
+
+def _http(server, form_url, submissions):
+    filler = HttpGoogleFormFiller(form_url, dict(FORM_DATA))
+    events = len(server.events)
+    started = time.perf_counter()
+    for _ in range(submissions):
+        filler.form_data = dict(FORM_DATA)
+        filler.fill_form()
+    elapsed = time.perf_counter() - started
+    filler.session.close()
+    requests = len(server.events) - events
+    print(f"  http:    {elapsed / submissions * 1000:7.2f} ms/submission, "
+          f"{requests / submissions:.2f} requests/submission")
+
+
+def _browser(form_url, submissions):
+    try:
+        from driver_pool import DriverPool
+        from Form import SmartGoogleFormFiller
+    except ImportError as e:
+        print(f"  browser: skipped ({e})")
+        return
+
+    pool = DriverPool(size=1)
+    per_section, round_trips, totals = [], [], []
+    try:
+        for _ in range(submissions):
+            filler = SmartGoogleFormFiller(form_url, dict(FORM_DATA), driver_pool=pool)
+            started = time.perf_counter()
+            filler.fill_form()
+            totals.append(time.perf_counter() - started)
+            per_section.extend(stat['elapsed_ms'] for stat in filler.section_stats)
+            round_trips.append(sum(stat['round_trips'] for stat in filler.section_stats))
+    finally:
+        pool.close()
+
+    if per_section:
+        print(f"  browser: {statistics.mean(totals) * 1000:7.0f} ms/submission, "
+              f"{statistics.median(per_section):.1f} ms/section (p50), "
+              f"{statistics.mean(round_trips):.1f} section round-trips/submission")
+    else:
+        print(f"  browser: {statistics.mean(totals) * 1000:7.0f} ms/submission (single page)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-section form benchmark")
+    parser.add_argument("--sections", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--questions-per-section", type=int, default=4)
+    parser.add_argument("--submissions", type=int, default=20)
+    parser.add_argument("--browser-submissions", type=int, default=3)
+    args = parser.parse_args()
+    setup_logging()
+    isolate_state()
+    RATE_LIMITS.update(form=None, email=None)  # measure the engine, not the pacing
+    logger.setLevel(logging.WARNING)
+
+    server = FormServer().start()
+    try:
+        for sections in args.sections:
+            form_url = server.add_form(f"sections{sections}",
+                                       questions=sections * args.questions_per_section,
+                                       sections=sections)
+            print(f"{sections} section(s), {sections * args.questions_per_section} questions")
+            _http(server, form_url, args.submissions)
+            if args.browser_submissions:
+                _browser(form_url, args.browser_submissions)
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+One SMTP session per email vs a pooled BulkMailer connection.
+
+Runs against the local SMTP sink, so nothing leaves the machine.
+
+    python -m benchmarks.bench_smtp --messages 200 --drop-after 50
+"""
+
+import argparse
+import time
+
+from flask_mail import Message
+
+import emaill
+from benchmarks.smtp_sink import SMTPSink
+from configg import RATE_LIMITS, setup_logging
+
+
+def point_mailer_at(port):
+    """Point Flask-Mail at the local sink; returns the (app, mail) pair"""
+    return emaill.configure_mail(MAIL_SERVER="127.0.0.1", MAIL_PORT=port, MAIL_USE_TLS=False)
+
+
+def _message(i):
+    return Message(subject=f"Benchmark {i}", sender="bench@example.com",
+                   recipients=["sink@example.com"], body="x" * 2048)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SMTP connection pooling benchmark")
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--max-per-connection", type=int, default=100)
+    parser.add_argument("--drop-after", type=int, default=0,
+                        help="Have the sink drop each connection after N messages")
+    args = parser.parse_args()
+    setup_logging()
+    RATE_LIMITS.update(form=None, email=None)  # measure the engine, not the pacing
+
+    sink = SMTPSink(drop_after=args.drop_after).start()
+    app, mail = point_mailer_at(sink.port)
+    try:
+        with app.app_context():
+            started = time.perf_counter()
+            for i in range(args.messages):
+                mail.send(_message(i))
+            per_message = (time.perf_counter() - started) / args.messages
+
+        started = time.perf_counter()
+        report = emaill.send_bulk_emails(
+            (lambda i=i: _message(i) for i in range(args.messages)),
+            max_per_connection=args.max_per_connection)
+        pooled = (time.perf_counter() - started) / args.messages
+    finally:
+        sink.stop()
+
+    print(f"connection per email: {per_message * 1000:.2f} ms/message")
+    print(f"pooled connection:    {pooled * 1000:.2f} ms/message over "
+          f"{report['connections']} connection(s), p95 {report['p95_ms']} ms, "
+          f"{report['failed']} failed")
+
+
+if __name__ == "__main__":
+    main()
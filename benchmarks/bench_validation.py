@@ -0,0 +1,78 @@
+"""
+Throughput of the bulk validation stage.
+
+Generates rows in the formats people actually type (mixed date styles,
++91 / spaced phone numbers, free-text gender) with a share of invalid
+ones, then measures rows per second for validation alone and for a full
+CSV-in, JSONL-out pass.
+
+    python -m benchmarks.bench_validation --rows 1000000
+"""
+
+import argparse
+import csv
+import logging
+import os
+import random
+import tempfile
+import time
+
+from configg import setup_logging, logger
+from validation import RejectFile, validate_file, validated_rows
+
+DATES = ["{d:02d}/{m:02d}/{y}", "{d}-{m}-{y}", "{y}-{m:02d}-{d:02d}", "{d:02d}.{m:02d}.{y}"]
+PHONES = ["{n}", "+91 {a} {b}", "0{n}", "91-{a}-{b}"]
+GENDERS = ["Male", "female", " F ", "M", "Other", "woman"]
+
+
+def make_rows(count, invalid_share=0.1, seed=7):
+    """Yield (row_id, row) pairs; about `invalid_share` of them fail validation"""
+    rng = random.Random(seed)
+    for i in range(count):
+        number = str(rng.randint(6000000000, 9999999999))
+        row = {
+            "full_name": f"  User   {i} ",
+            "contact_number": rng.choice(PHONES).format(n=number, a=number[:5], b=number[5:]),
+            "email": f"user{i}@example.com",
+            "address": f"{i} MG Road,  Pune",
+            "pin_code": str(rng.randint(110001, 855999)),
+            "dob": rng.choice(DATES).format(d=rng.randint(1, 28), m=rng.randint(1, 12),
+                                            y=rng.randint(1960, 2005)),
+            "gender": rng.choice(GENDERS),
+        }
+        if rng.random() < invalid_share:
+            row[rng.choice(["dob", "contact_number", "pin_code", "gender"])] = "31/02/2001"
+        yield str(i + 1), row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validation stage benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    setup_logging()
+    logger.setLevel(logging.WARNING)
+
+    rows = list(make_rows(args.rows))
+    folder = tempfile.mkdtemp(prefix="gff-validate-")
+    with RejectFile(os.path.join(folder, "rejects.jsonl")) as rejects:
+        started = time.perf_counter()
+        valid = sum(1 for _ in validated_rows(iter(rows), rejects))
+        elapsed = time.perf_counter() - started
+    print(f"validation only: {args.rows / elapsed:,.0f} rows/s "
+          f"({args.rows / elapsed * 60 / 1e6:.1f}M rows/min), "
+          f"{valid} valid, {rejects.count} rejected")
+
+    input_path = os.path.join(folder, "rows.csv")
+    with open(input_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=["row_id"] + list(rows[0][1]))
+        writer.writeheader()
+        for row_id, row in rows:
+            writer.writerow(dict(row, row_id=row_id))
+    report = validate_file(input_path, os.path.join(folder, "clean.jsonl"),
+                           os.path.join(folder, "rejects.jsonl"))
+    print(f"csv -> jsonl:    {report['rows_per_sec']:,.0f} rows/s "
+          f"({report['rows_per_sec'] * 60 / 1e6:.1f}M rows/min)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Generators for realistic Google Form fixture pages.
+
+The pages carry both the rendered DOM the Selenium filler walks and the
+embedded FB_PUBLIC_LOAD_DATA_ definition the HTTP engine parses. Forms
+can be split into sections: each page renders one section, while the
+embedded definition always describes the whole form, as on Google.
+"""
+
+import html
+import json
+
+CONFIRMATION_HTML = """<!DOCTYPE html>
+<html><head><title>Form response</title></head>
+<body><div class="vHW8K">Your response has been recorded.</div></body></html>
+"""
+
+# Static assets a real viewform page pulls in: (content type, size in bytes).
+# Sizes are in the range Google Forms serves; the bodies are filler.
+ASSETS = {
+    "/static/forms.css": ("text/css", 80_000),
+    "/static/roboto.woff2": ("font/woff2", 64_000),
+    "/static/google_sans.woff2": ("font/woff2", 48_000),
+    "/static/header.png": ("image/png", 150_000),
+    "/static/forms.js": ("application/javascript", 120_000),
+    "/gtag/js": ("application/javascript", 90_000),
+}
+
+
+def asset_body(path):
+    """Deterministic filler body for an asset in ASSETS"""
+    content_type, size = ASSETS[path]
+    if path == "/static/forms.css":
+        head = ("@font-face{font-family:Roboto;src:url(/static/roboto.woff2) format('woff2')}\n"
+                "@font-face{font-family:'Google Sans';src:url(/static/google_sans.woff2) "
+                "format('woff2')}\n"
+                "body{font-family:Roboto,'Google Sans',sans-serif}\n"
+                ".F9yp7e{background:url(/static/header.png) no-repeat;min-height:40px}\n")
+        return (head + "/*" + "x" * (size - len(head) - 4) + "*/").encode("ascii")
+    if content_type == "application/javascript":
+        return (b"/*" + b"x" * (size - 4) + b"*/")
+    return (bytes(range(256)) * (size // 256 + 1))[:size]
+
+
+# (title, item type) pairs that match the keyword rules in field_matching
+BASE_QUESTIONS = [
+    ("Full Name", 0),
+    ("Contact Number", 0),
+    ("Email ID", 0),
+    ("Full Address", 1),
+    ("Pin Code", 0),
+    ("Date of Birth", 0),
+    ("Gender", 0),
+]
+
+
+def entry_id_for(index):
+    """Deterministic entry ID for the question at `index`"""
+    return 1000000 + index * 7
+
+
+def build_questions(questions=8, verification_code="GF2025", sections=1):
+    """
+    Build the question list for a fixture form.
+
+    Args:
+        questions: Total number of questions, including the verification one
+        verification_code: Code printed in the verification question, or None
+        sections: Number of sections the questions are spread evenly over
+
+    Returns:
+        list: dicts with index, title, type, entry_id, required, description
+        and section
+    """
+    items = []
+    answerable = questions - (1 if verification_code else 0)
+    for i in range(max(answerable, 0)):
+        if i < len(BASE_QUESTIONS):
+            title, item_type = BASE_QUESTIONS[i]
+        else:
+            title, item_type = f"Extra detail {i - len(BASE_QUESTIONS) + 1}", 0
+        items.append({
+            "title": title,
+            "type": item_type,
+            "required": i < len(BASE_QUESTIONS),
+            "description": "",
+        })
+
+    if verification_code:
+        items.append({
+            "title": "Verification code",
+            "type": 0,
+            "required": True,
+            "description": f"Type this code: <b>{verification_code}</b>",
+        })
+
+    for index, item in enumerate(items):
+        item["index"] = index
+        item["entry_id"] = entry_id_for(index)
+        item["section"] = index * sections // len(items)
+    return items
+
+
+def build_fb_public_load_data(items, title, sections=1):
+    """Build an FB_PUBLIC_LOAD_DATA_ array shaped like Google's"""
+    fb_items = []
+    section = 0
+    for item in items:
+        # A page-break item opens every section after the first
+        while section < item.get("section", 0):
+            section += 1
+            fb_items.append([700000 + section, f"Section {section + 1}", None, 8, None])
+        fb_items.append([
+            500000 + item["index"],
+            item["title"],
+            item["description"] or None,
+            item["type"],
+            [[item["entry_id"], None, 1 if item["required"] else 0]],
+        ])
+    while section < sections - 1:
+        section += 1
+        fb_items.append([700000 + section, f"Section {section + 1}", None, 8, None])
+    return [None, ["", fb_items, None, None, None, None, None, None, title],
+            "/forms", title, None, None, None, "", None, 0, 0]
+
+
+def build_form_html(questions=8, verification_code="GF2025", title="Local Test Form",
+                    fbzx="-1234567890", assets=False, sections=1, section=0, answers=None):
+    """
+    Render a viewform page for the fixture form.
+
+    Args:
+        assets: Reference the stylesheet, web fonts, header image, scripts
+            and analytics tag (see ASSETS) like a real viewform page
+        sections: Number of sections the form is split into
+        section: Section this page shows
+        answers: Answers from earlier sections, carried in partialResponse
+
+    Returns:
+        str: Complete HTML page
+    """
+    items = build_questions(questions, verification_code, sections)
+    parts = [
+        "<!DOCTYPE html><html><head>",
+        f"<title>{html.escape(title)}</title>",
+    ]
+    if assets:
+        parts.extend([
+            '<link rel="stylesheet" href="/static/forms.css">',
+            '<script async src="/gtag/js?id=G-LOCAL"></script>',
+        ])
+    parts.extend([
+        "</head><body>",
+        '<form id="mG61Hd" action="formResponse" method="POST">',
+        f'<div class="F9yp7e">{html.escape(title)}</div>',
+    ])
+    if assets:
+        parts.append('<img src="/static/header.png" alt="" width="640" height="160">')
+    parts.append('<div role="list">')
+
+    for item in items:
+        if item["section"] != section:
+            continue
+        star = ' <span class="vnumgf">*</span>' if item["required"] else ""
+        parts.append('<div role="listitem"><div jsmodel="CP1oW">')
+        parts.append(f'<div role="heading" class="M4DNQ">{html.escape(item["title"])}{star}</div>')
+        if item["description"]:
+            parts.append(f'<div class="gubaDc">{item["description"]}</div>')
+        name = f'entry.{item["entry_id"]}'
+        if item["type"] == 1:
+            parts.append(f'<textarea class="KHxj8b" name="{name}"></textarea>')
+        else:
+            parts.append(f'<input type="text" class="whsOnd" name="{name}">')
+        parts.append("</div></div>")
+
+    page_history = ",".join(str(i) for i in range(section + 1))
+    parts.extend([
+        "</div>",
+        '<input type="hidden" name="fvv" value="1">',
+        f'<input type="hidden" name="pageHistory" value="{page_history}">',
+        f'<input type="hidden" name="fbzx" value="{html.escape(fbzx)}">',
+    ])
+    if answers:
+        parts.append('<input type="hidden" name="partialResponse" '
+                     f'value="{html.escape(json.dumps(answers))}">')
+    if section < sections - 1:
+        parts.extend([
+            '<input type="hidden" name="continue" value="">',
+            '<div role="button" class="uArJ5e" '
+            "onclick=\"var f = document.getElementById('mG61Hd'); "
+            "f.elements['continue'].value = '1'; f.submit()\">"
+            '<span class="NPEfkd">Next</span></div>',
+        ])
+    else:
+        parts.append('<div role="button" class="uArJ5e" '
+                     "onclick=\"document.getElementById('mG61Hd').submit()\">"
+                     '<span class="NPEfkd">Submit</span></div>')
+    parts.extend([
+        "</form>",
+        "<script>var FB_PUBLIC_LOAD_DATA_ = "
+        f"{json.dumps(build_fb_public_load_data(items, title, sections))};</script>",
+    ])
+    if assets:
+        parts.append('<script src="/static/forms.js"></script>')
+    parts.append("</body></html>")
+    return "\n".join(parts)
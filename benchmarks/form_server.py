@@ -0,0 +1,208 @@
+"""
+Local stand-in for the Google Forms endpoints.
+
+Serves fixture viewform pages (optionally with their stylesheet, fonts,
+images and analytics tag), a forms.gle-style short link that redirects
+to them, and accepts formResponse posts so both submission engines can
+be exercised without touching Google. Multi-section forms answer a
+"Next" post with the following section, carrying earlier answers along
+in partialResponse. With `throttle_rate` set, posts beyond that many per
+second are answered with 429 like an overloaded endpoint. Bytes served are counted so page
+weight can be compared between browser profiles.
+
+    python -m benchmarks.form_server --questions 20 --port 8765
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.form_fixtures import (ASSETS, CONFIRMATION_HTML, asset_body, build_form_html,
+                                      build_questions)
+
+
+class _FormRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body, content_type="text/html; charset=utf-8", headers=None):
+        data = body if isinstance(body, bytes) else body.encode("utf-8")
+        self.server.count_bytes(len(data))
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _form_id(self, path, suffix):
+        prefix = "/forms/d/e/"
+        if path.startswith(prefix) and path.endswith(suffix):
+            return path[len(prefix):-len(suffix)]
+        return None
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path.startswith("/short/"):
+            form_id = path[len("/short/"):]
+            self._reply(302, "", headers={"Location": f"/forms/d/e/{form_id}/viewform"})
+            return
+        if path in ASSETS:
+            self.server.record("asset", path)
+            self._reply(200, self.server.asset(path), content_type=ASSETS[path][0],
+                        headers={"Cache-Control": "public, max-age=3600"})
+            return
+
+        form = self.server.forms.get(self._form_id(path, "/viewform"))
+        if form is None:
+            self._reply(404, "Not found")
+            return
+        self.server.record("view", path)
+        self._reply(200, form["html"])
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        length = int(self.headers.get("Content-Length") or 0)
+        fields = parse_qs(self.rfile.read(length).decode("utf-8"), keep_blank_values=True)
+
+        form = self.server.forms.get(self._form_id(path, "/formResponse"))
+        if form is None:
+            self._reply(404, "Not found")
+            return
+        if not self.server.admit():
+            self.server.record("throttled", path)
+            self._reply(429, "Too many requests")
+            return
+
+        # Answers from earlier sections plus the ones on this page
+        answers = json.loads(fields.pop("partialResponse", ["{}"])[0] or "{}")
+        answers.update((name, values) for name, values in fields.items()
+                       if name.startswith("entry."))
+        next_page = fields.get("continue", [""])[0] == "1"
+        section = int(fields.get("pageHistory", ["0"])[0].split(",")[-1] or 0)
+
+        missing = [item["title"] for item in form["items"]
+                   if item["required"] and (not next_page or item["section"] == section)
+                   and not answers.get(f'entry.{item["entry_id"]}', [""])[0]]
+        if missing:
+            self.server.record("rejected", path, fields)
+            self._reply(400, f"Missing required answers: {', '.join(missing)}")
+            return
+
+        if next_page:
+            self.server.record("section", path, fields)
+            self._reply(200, build_form_html(**form["params"], section=section + 1,
+                                             answers=answers))
+            return
+
+        self.server.record("submitted", path, dict(fields, **answers))
+        self._reply(200, CONFIRMATION_HTML)
+
+
+class FormServer(ThreadingHTTPServer):
+    """Threaded local form server that records every submission"""
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, throttle_rate=None):
+        super().__init__((host, port), _FormRequestHandler)
+        self.throttle_rate = throttle_rate
+        self._allowance = throttle_rate or 0.0
+        self._allowance_at = time.monotonic()
+        self.forms = {}
+        self.events = []
+        self.bytes_served = 0
+        self._assets = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add_form(self, form_id="local", questions=8, verification_code="GF2025", assets=False,
+                 sections=1):
+        """Register a fixture form and return its viewform URL"""
+        params = {"questions": questions, "verification_code": verification_code,
+                  "assets": assets, "sections": sections}
+        self.forms[form_id] = {
+            "params": params,
+            "html": build_form_html(**params),
+            "items": build_questions(questions, verification_code, sections),
+        }
+        return f"{self.base_url}/forms/d/e/{form_id}/viewform"
+
+    def short_url(self, form_id="local"):
+        """forms.gle-style URL that redirects to the viewform page"""
+        return f"{self.base_url}/short/{form_id}"
+
+    def asset(self, path):
+        with self._lock:
+            if path not in self._assets:
+                self._assets[path] = asset_body(path)
+            return self._assets[path]
+
+    def admit(self):
+        """Token bucket for posts; False once `throttle_rate` per second is exceeded"""
+        if not self.throttle_rate:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._allowance = min(self.throttle_rate, self._allowance
+                                  + (now - self._allowance_at) * self.throttle_rate)
+            self._allowance_at = now
+            if self._allowance < 1:
+                return False
+            self._allowance -= 1
+            return True
+
+    def count_bytes(self, size):
+        with self._lock:
+            self.bytes_served += size
+
+    def record(self, kind, path, fields=None):
+        with self._lock:
+            self.events.append((kind, path, fields))
+
+    @property
+    def submissions(self):
+        with self._lock:
+            return [fields for kind, _, fields in self.events if kind == "submitted"]
+
+    def start(self):
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in Google Form server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--questions", type=int, default=8)
+    parser.add_argument("--sections", type=int, default=1)
+    args = parser.parse_args()
+
+    server = FormServer(port=args.port)
+    print(f"Form: {server.add_form(questions=args.questions, sections=args.sections)}")
+    print(f"Short link: {server.short_url()}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
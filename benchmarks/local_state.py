@@ -0,0 +1,32 @@
+"""
+Keep benchmark runs out of the user's real state.
+
+Submissions made by a benchmark would otherwise be appended to
+SUBMISSION_LOG, and their fill plans (one per random local port) would
+push real forms out of the plan cache. isolate_state() points those,
+the job journal and the outbox at a fresh temporary folder.
+"""
+
+import os
+import tempfile
+
+import submission_result
+from configg import JOB_JOURNAL, OUTBOX_CONFIG
+from schema_cache import fill_plan_cache
+
+
+def isolate_state(prefix="gff-bench-"):
+    """
+    Redirect everything a submission writes to a new temporary folder.
+
+    Returns:
+        str: The folder
+    """
+    folder = tempfile.mkdtemp(prefix=prefix)
+    submission_result.SUBMISSION_LOG = os.path.join(folder, "submissions.jsonl")
+    # Shared instance (both engines hold a reference), so it is redirected in place
+    fill_plan_cache.cache_dir = os.path.join(folder, "fill_plans")
+    fill_plan_cache.clear_memory()
+    JOB_JOURNAL['path'] = os.path.join(folder, "jobs.sqlite3")
+    OUTBOX_CONFIG['folder'] = os.path.join(folder, "outbox")
+    return folder
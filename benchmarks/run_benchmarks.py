@@ -0,0 +1,327 @@
+"""
+Offline end-to-end benchmark suite.
+
+Starts the local stand-in form server and SMTP sink, drives the real
+entry points against them and records p50/p95 latency per phase plus
+throughput to JSON, so runs can be compared between versions.
+
+    python -m benchmarks.run_benchmarks --runs 20
+    python -m benchmarks.run_benchmarks --scenarios http email --compare benchmarks/results/old.json
+
+Scenarios whose dependencies are missing (Chrome for `browser`,
+Flask-Mail for `email`/`main`) are recorded as skipped.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+
+from benchmarks.form_server import FormServer
+from benchmarks.local_state import isolate_state
+from benchmarks.smtp_sink import SMTPSink
+from configg import RATE_LIMITS, setup_logging, logger
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+FORM_SIZES = (10, 50, 200)
+FORM_DATA = {
+    "full_name": "Bench User", "contact_number": "9876543210",
+    "email": "bench@example.com", "address": "221B Baker Street, London",
+    "pin_code": "411001", "dob": "01/01/2000", "gender": "Female",
+}
+# Flag a phase as regressed when its p95 grows by more than this factor
+# and by at least this many milliseconds (sub-ms phases are mostly noise)
+REGRESSION_THRESHOLD = 1.2
+REGRESSION_MIN_MS = 0.5
+
+
+# ==================== MEASUREMENT ====================
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    return {
+        'count': len(samples),
+        'mean_ms': round(sum(samples) / len(samples) * 1000, 3),
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 95) * 1000, 3),
+    }
+
+
+class PhaseRecorder:
+    """Collects per-phase durations across the runs of one scenario"""
+
+    def __init__(self):
+        self.phases = {}
+
+    def add(self, phase, seconds):
+        self.phases.setdefault(phase, []).append(seconds)
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def wrap(self, obj, method, phase=None):
+        """Time every call of obj.method under `phase`"""
+        original = getattr(obj, method)
+        recorder = self
+
+        def timed(*args, **kwargs):
+            with recorder.phase(phase or method):
+                return original(*args, **kwargs)
+
+        setattr(obj, method, timed)
+
+
+def run_scenario(name, runs, body):
+    """
+    Run `body(recorder)` `runs` times and summarize it.
+
+    `body` returns False on a failed run and raises ImportError or
+    RuntimeError to mark the scenario as skipped.
+    """
+    recorder = PhaseRecorder()
+    failures = 0
+    started = time.perf_counter()
+    try:
+        for _ in range(runs):
+            with recorder.phase("total"):
+                ok = body(recorder)
+            if ok is False:
+                failures += 1
+    except (ImportError, RuntimeError) as e:
+        print(f"  {name}: skipped ({e})")
+        return {'skipped': str(e)}
+
+    elapsed = time.perf_counter() - started
+    result = {
+        'runs': runs,
+        'failures': failures,
+        'throughput_per_s': round(runs / elapsed, 3) if elapsed else None,
+        'phases': {phase: summarize(samples) for phase, samples in recorder.phases.items()},
+    }
+    total = result['phases']['total']
+    print(f"  {name}: p50 {total['p50_ms']} ms, p95 {total['p95_ms']} ms, "
+          f"{result['throughput_per_s']}/s, {failures} failed")
+    return result
+
+
+# ==================== SCENARIOS ====================
+def http_scenario(form_url):
+    from http_filler import HttpGoogleFormFiller, HttpSession
+    session = HttpSession()
+
+    def body(recorder):
+        filler = HttpGoogleFormFiller(form_url, dict(FORM_DATA), session=session)
+        recorder.wrap(filler, "load_plan")
+        recorder.wrap(filler, "build_payload")
+        return filler.fill_form()
+    return body
+
+
+def _require_chrome():
+    try:
+        from Form import SmartGoogleFormFiller
+        from driver_pool import create_chrome_driver
+        create_chrome_driver().quit()
+    except ImportError:
+        raise
+    except Exception as e:
+        raise RuntimeError(f"Chrome unavailable: {e}")
+    return SmartGoogleFormFiller
+
+
+def browser_scenario(form_url):
+    SmartGoogleFormFiller = _require_chrome()
+
+    def body(recorder):
+        filler = SmartGoogleFormFiller(form_url, dict(FORM_DATA))
+        for method in ("setup_driver", "load_fill_plan", "fill_matched",
+                       "_smart_submit", "_save_screenshot"):
+            recorder.wrap(filler, method)
+        return filler.fill_form()
+    return body
+
+
+def _point_mailer_at(sink):
+    import emaill
+    _, mail = emaill.configure_mail(MAIL_SERVER="127.0.0.1", MAIL_PORT=sink.port,
+                                    MAIL_USE_TLS=False)
+    return emaill, mail
+
+
+def email_scenario(sink):
+    emaill, mail = _point_mailer_at(sink)
+    recorder_ref = {}
+
+    original_build = emaill.build_submission_message
+    original_send = mail.send
+
+    def build(*args, **kwargs):
+        with recorder_ref['recorder'].phase("build_message"):
+            return original_build(*args, **kwargs)
+
+    def send(msg):
+        with recorder_ref['recorder'].phase("smtp_send"):
+            return original_send(msg)
+
+    emaill.build_submission_message = build
+    mail.send = send
+
+    def body(recorder):
+        recorder_ref['recorder'] = recorder
+        return emaill.send_email_with_latest_screenshot()
+    return body
+
+
+def main_scenario(form_url, sink, engine):
+    import cli
+    import email_outbox
+    import http_filler
+    emaill, _ = _point_mailer_at(sink)
+    cli.GOOGLE_FORM_URL = form_url
+    # Shared with configg, so this also satisfies cli.config_errors()
+    emaill.EMAIL_CONFIG.update(sender_email="bench@example.com",
+                               recipient_email="sink@example.com", cc_email="sink@example.com")
+    recorder_ref = {}
+
+    def timed(phase, func):
+        def wrapper(*args, **kwargs):
+            with recorder_ref['recorder'].phase(phase):
+                return func(*args, **kwargs)
+        return wrapper
+
+    filler_class = http_filler.HttpGoogleFormFiller
+    if engine == "browser":
+        filler_class = _require_chrome()
+    filler_class.fill_form = timed("form", filler_class.fill_form)
+    emaill.submission_message_spec = timed("email_spool", emaill.submission_message_spec)
+    email_outbox.OutboxSender.stop = timed("email_drain", email_outbox.OutboxSender.stop)
+
+    def body(recorder):
+        recorder_ref['recorder'] = recorder
+        # Fresh answers per run, otherwise the journal skips it as already done
+        cli.FORM_DATA = dict(FORM_DATA, full_name=f"Bench User {uuid.uuid4().hex[:8]}")
+        return cli.main(["fill", "--engine", engine]) == 0
+    return body
+
+
+# ==================== RUNNER ====================
+def _version():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current, previous_path):
+    """Print phases whose p95 regressed against a previous results file"""
+    with open(previous_path, encoding="utf-8") as f:
+        previous = json.load(f)
+    regressions = 0
+    for name, result in current['scenarios'].items():
+        before = previous.get('scenarios', {}).get(name, {})
+        for phase, stats in result.get('phases', {}).items():
+            old = before.get('phases', {}).get(phase)
+            if (old and stats['p95_ms'] > old['p95_ms'] * REGRESSION_THRESHOLD
+                    and stats['p95_ms'] - old['p95_ms'] >= REGRESSION_MIN_MS):
+                regressions += 1
+                print(f"  REGRESSION {name}/{phase}: p95 {old['p95_ms']} -> {stats['p95_ms']} ms")
+    print(f"{regressions} regression(s) vs {previous.get('version', previous_path)}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmarks")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--scenarios", nargs="+", default=["http", "browser", "email", "main"],
+                        choices=["http", "browser", "email", "main"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(FORM_SIZES))
+    parser.add_argument("--main-engine", default="http", choices=["http", "browser"],
+                        help="Submit engine used by the main (cli.py fill) scenario")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<time>.json)")
+    parser.add_argument("--compare", help="Previous results file to check for regressions")
+    parser.add_argument("--verbose", action="store_true", help="Keep per-submission INFO logs")
+    args = parser.parse_args()
+    setup_logging()
+
+    if not args.verbose:
+        # Per-submission log lines would dominate the timings being measured
+        logger.setLevel(logging.WARNING)
+
+    # Result records, plans, jobs and spooled emails are still written (they are part of
+    # every submission), just not into the user's files
+    isolate_state()
+    # The token buckets stay in the path, so their cost is measured, but never run dry
+    for name in RATE_LIMITS:
+        RATE_LIMITS[name] = {"rate": 1e9, "burst": 1e9, "max_rate": 1e9}
+
+    server = FormServer().start()
+    sink = SMTPSink().start()
+    results = {
+        'version': _version(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'runs': args.runs,
+        'scenarios': {},
+    }
+
+    try:
+        for size in args.sizes:
+            form_url = server.add_form(f"bench{size}", questions=size)
+            for scenario in ("http", "browser"):
+                if scenario in args.scenarios:
+                    factory = http_scenario if scenario == "http" else browser_scenario
+                    name = f"{scenario}_fill_{size}q"
+                    try:
+                        body = factory(form_url)
+                    except (ImportError, RuntimeError) as e:
+                        print(f"  {name}: skipped ({e})")
+                        results['scenarios'][name] = {'skipped': str(e)}
+                        continue
+                    results['scenarios'][name] = run_scenario(name, args.runs, body)
+
+        for scenario in ("email", "main"):
+            if scenario not in args.scenarios:
+                continue
+            try:
+                body = (email_scenario(sink) if scenario == "email"
+                        else main_scenario(server.add_form("bench_main"), sink, args.main_engine))
+            except (ImportError, RuntimeError) as e:
+                print(f"  {scenario}: skipped ({e})")
+                results['scenarios'][scenario] = {'skipped': str(e)}
+                continue
+            results['scenarios'][scenario] = run_scenario(scenario, args.runs, body)
+    finally:
+        server.stop()
+        sink.stop()
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{time.strftime('%Y%m%d_%H%M%S')}_{results['version']}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        sys.exit(1 if compare(results, args.compare) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Local stand-in SMTP server that accepts and counts every message.
+
+Speaks enough ESMTP for smtplib/Flask-Mail (EHLO, AUTH PLAIN/LOGIN, MAIL,
+RCPT, DATA, RSET, NOOP, QUIT) without TLS, so set `use_tls` to False in
+EMAIL_CONFIG when pointing the mailer at it. `drop_after` closes each
+connection after that many messages to exercise reconnect handling.
+
+    python -m benchmarks.smtp_sink --port 2525
+"""
+
+import argparse
+import socketserver
+import threading
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    disable_nagle_algorithm = True
+
+    def _reply(self, line):
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        server.record_connection()
+        self._reply("220 localhost SMTP sink ready")
+        sent_here = 0
+        auth_login_steps = 0
+
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+
+            if auth_login_steps:
+                auth_login_steps -= 1
+                self._reply("334 UGFzc3dvcmQ6" if auth_login_steps else "235 Authenticated")
+                continue
+
+            command = line[:4].upper()
+            if command == "EHLO":
+                self._reply("250-localhost")
+                self._reply("250-AUTH PLAIN LOGIN")
+                self._reply("250 8BITMIME")
+            elif command == "HELO":
+                self._reply("250 localhost")
+            elif command == "AUTH":
+                if line.upper().startswith("AUTH LOGIN"):
+                    auth_login_steps = 2
+                    self._reply("334 VXNlcm5hbWU6")
+                else:
+                    self._reply("235 Authenticated")
+            elif command in ("MAIL", "RCPT", "RSET", "NOOP"):
+                self._reply("250 OK")
+            elif command == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                size = 0
+                while True:
+                    chunk = self.rfile.readline()
+                    if not chunk or chunk in (b".\r\n", b".\n"):
+                        break
+                    size += len(chunk)
+                server.record_message(size)
+                self._reply("250 Queued")
+                sent_here += 1
+                if server.drop_after and sent_here >= server.drop_after:
+                    return
+            elif command == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """Threaded SMTP sink that counts connections, messages and bytes"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=0, drop_after=0):
+        super().__init__((host, port), _SMTPHandler)
+        self.drop_after = drop_after
+        self.connections = 0
+        self.messages = 0
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def record_connection(self):
+        with self._lock:
+            self.connections += 1
+
+    def record_message(self, size):
+        with self._lock:
+            self.messages += 1
+            self.bytes_received += size
+
+    def start(self):
+        """Serve in a background thread"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local SMTP sink")
+    parser.add_argument("--port", type=int, default=2525)
+    parser.add_argument("--drop-after", type=int, default=0)
+    args = parser.parse_args()
+
+    sink = SMTPSink(port=args.port, drop_after=args.drop_after)
+    print(f"SMTP sink listening on 127.0.0.1:{sink.port}")
+    try:
+        sink.serve_forever()
+    except KeyboardInterrupt:
+        sink.server_close()
+
+
+if __name__ == "__main__":
+    main()
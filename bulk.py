@@ -0,0 +1,394 @@
+"""
+Bulk submission mode.
+
+Streams FORM_DATA-shaped rows from a CSV or JSONL file and shards them
+across worker processes, each running its own submission engine.
+
+    python bulk.py rows.csv --workers 8 --engine http --results results.jsonl
+
+Progress is kept in the job journal, so re-running the same command after
+a crash skips rows that were already submitted.
+"""
+
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from configg import GOOGLE_FORM_URL, SUBMIT_ENGINE, METRICS_CONFIG, logger
+from log_pipeline import setup_worker_logging, worker_log_queue
+from metrics import metrics
+from job_journal import JobJournal, job_id_for, PENDING, SUBMITTED, EMAILED, FAILED
+from rate_limit import install_limiters, shared_limiters
+from validation import RejectFile, validated_rows
+
+# Rows buffered per worker between the reader and the workers
+QUEUE_DEPTH_PER_WORKER = 4
+# How often (seconds) the coordinator checks that workers are still alive
+WORKER_POLL_INTERVAL = 1.0
+
+
+# ==================== INPUT ====================
+def read_rows(input_path):
+    """
+    Lazily yield (row_id, row) pairs from a CSV or JSONL file.
+
+    A `row_id` column is used as the row ID when present, otherwise a hash
+    of the row's answers (job_id_for()), so resuming after lines were
+    inserted, removed or reordered still matches rows to the journal.
+    """
+    ext = os.path.splitext(input_path)[1].lower()
+    with open(input_path, newline='', encoding='utf-8') as f:
+        if ext in ('.jsonl', '.ndjson'):
+            rows = (json.loads(line) for line in f if line.strip())
+        elif ext == '.csv':
+            rows = csv.DictReader(f)
+        else:
+            raise ValueError(f"Unsupported input format: {ext}")
+
+        for row in rows:
+            row_id = str(row.pop('row_id', '') or job_id_for(row))
+            yield row_id, row
+
+
+# ==================== WORKER ====================
+class _WorkerEngine:
+    """Per-process submission engine that reuses state across rows"""
+
+    def __init__(self, engine, form_url, browser_profile=None):
+        self.engine = engine
+        self.form_url = form_url
+        self.browser_profile = browser_profile
+        self.http_filler = None
+        self.driver_pool = None
+        self.last_result = None
+
+    def submit(self, row):
+        self.last_result = None
+        if self.engine == "http":
+            from http_filler import HttpGoogleFormFiller
+            if self.http_filler is None:
+                self.http_filler = HttpGoogleFormFiller(self.form_url, row)
+            # The form definition and keep-alive session carry over between rows
+            self.http_filler.form_data = row
+            ok = self.http_filler.fill_form()
+            self.last_result = self.http_filler.result
+            return ok
+
+        from Form import SmartGoogleFormFiller
+        if self.driver_pool is None:
+            from driver_pool import DriverPool, create_chrome_driver
+            self.driver_pool = DriverPool(
+                size=1, factory=lambda: create_chrome_driver(self.browser_profile))
+        filler = SmartGoogleFormFiller(self.form_url, row, driver_pool=self.driver_pool)
+        ok = filler.fill_form()
+        self.last_result = filler.result
+        return ok
+
+    def close(self):
+        if self.http_filler is not None:
+            self.http_filler.session.close()
+        if self.driver_pool is not None:
+            from screenshot_writer import screenshot_writer
+            self.driver_pool.report()
+            self.driver_pool.close()
+            screenshot_writer.report()
+            screenshot_writer.close()
+
+
+def _spool_email(outbox, submitter, form_url, row_id, row):
+    """Queue the submission email for a row on the outbox"""
+    from emaill import submission_message_spec
+    result = submitter.last_result
+    spec = submission_message_spec(result.run_id if result else row_id,
+                                   result.screenshot if result else None, form_data=row)
+    outbox.enqueue(dict(spec, job_id=row_id, form_url=form_url))
+
+
+def _worker_main(worker_id, engine, form_url, task_queue, result_queue, metrics_enabled=False,
+                 email=False, limiters=None, log_queue=None, log_level=logging.INFO,
+                 browser_profile=None):
+    """Worker process loop: submit rows until the sentinel arrives"""
+    submitter = outbox = None
+    submitted = failed = 0
+    worker_error = None
+    started = time.perf_counter()
+
+    # Stats are always reported, even if setup fails, so the coordinator never waits for them
+    try:
+        # Records go to the coordinator's listener, tagged with this row's context
+        setup_worker_logging(log_queue, log_level)
+        # Every worker draws from the coordinator's token buckets
+        install_limiters(limiters)
+        if metrics_enabled:
+            # One textfile per worker; the textfile collector sums them
+            root, ext = os.path.splitext(metrics.prometheus_path
+                                         or METRICS_CONFIG['prometheus_path'])
+            metrics.enable(prometheus_path=f"{root}_worker{worker_id}{ext}")
+        submitter = _WorkerEngine(engine, form_url, browser_profile)
+        if email:
+            from email_outbox import Outbox
+            outbox = Outbox()
+
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            row_id, row = task
+            row_started = time.perf_counter()
+            error = None
+            try:
+                with metrics.context(row_id=row_id, worker=worker_id):
+                    ok = submitter.submit(row)
+            except Exception as e:
+                ok, error = False, str(e)
+            result = submitter.last_result
+            if not ok and error is None and result is not None:
+                error = result.error or f"submission {result.status}"
+
+            if ok and outbox is not None:
+                try:
+                    # Blocks when the spool is full, pacing workers to the sender
+                    _spool_email(outbox, submitter, form_url, row_id, row)
+                except Exception as e:
+                    # The row was submitted; only its email is missing
+                    error = f"Email not spooled: {e}"
+                    logger.error("❌ %s", error)
+
+            if ok:
+                submitted += 1
+            else:
+                failed += 1
+            result_queue.put(("result", {
+                'row_id': row_id,
+                'worker': worker_id,
+                'ok': bool(ok),
+                'status': result.status if result else "error",
+                'run_id': result.run_id if result else None,
+                'elapsed': round(time.perf_counter() - row_started, 4),
+                'error': error,
+            }))
+    except Exception as e:
+        worker_error = str(e)
+        logger.error("❌ Worker %s stopped: %s", worker_id, e)
+    finally:
+        try:
+            if submitter is not None:
+                submitter.close()
+            metrics.export()
+        finally:
+            elapsed = time.perf_counter() - started
+            result_queue.put(("stats", {
+                'worker': worker_id,
+                'submitted': submitted,
+                'failed': failed,
+                'elapsed': round(elapsed, 3),
+                'rows_per_sec': round((submitted + failed) / elapsed, 2) if elapsed else 0.0,
+                'error': worker_error,
+            }))
+
+
+# ==================== COORDINATOR ====================
+def _collect_results(result_queue, results_path, processes, worker_stats, journal):
+    """
+    Write per-row results as they arrive until every worker reports stats.
+
+    A worker that exits without reporting (killed, out of memory) is
+    recorded with an error instead of being waited for forever; the row
+    it was on stays pending in the journal and is retried next run.
+    """
+    remaining = set(range(len(processes)))
+    exited = set()
+    counts = {worker_id: [0, 0] for worker_id in remaining}
+    with open(results_path, 'w', encoding='utf-8') as out:
+        while remaining:
+            try:
+                kind, record = result_queue.get(timeout=WORKER_POLL_INTERVAL)
+            except queue.Empty:
+                for worker_id in sorted(remaining):
+                    exitcode = processes[worker_id].exitcode
+                    if exitcode is None:
+                        continue
+                    # Stats sent just before exiting have had a whole poll to arrive
+                    if worker_id in exited:
+                        remaining.discard(worker_id)
+                        submitted, failed = counts[worker_id]
+                        worker_stats.append({'worker': worker_id, 'submitted': submitted,
+                                             'failed': failed, 'elapsed': None,
+                                             'rows_per_sec': 0.0,
+                                             'error': f"exited with code {exitcode}"})
+                        logger.error("❌ Worker %s exited with code %s without reporting",
+                                     worker_id, exitcode)
+                    exited.add(worker_id)
+                continue
+            if kind == "stats":
+                worker_stats.append(record)
+                remaining.discard(record['worker'])
+            else:
+                counts[record['worker']][0 if record['ok'] else 1] += 1
+                out.write(json.dumps(record) + "\n")
+                journal.mark(record['row_id'], SUBMITTED if record['ok'] else FAILED,
+                             error=record['error'])
+
+
+def _put_task(task_queue, task, processes):
+    """
+    Queue a task for the workers.
+
+    Returns:
+        bool: False if every worker has exited, so nothing would ever take it
+    """
+    while True:
+        try:
+            task_queue.put(task, timeout=WORKER_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            if not any(process.is_alive() for process in processes):
+                return False
+
+
+def run_bulk(input_path, results_path, form_url=GOOGLE_FORM_URL, workers=4, engine=SUBMIT_ENGINE,
+             journal_path=None, max_attempts=None, email=False, validate=True,
+             browser_profile=None):
+    """
+    Submit every row of `input_path` using a pool of worker processes.
+
+    Rows already submitted in an earlier run, or that have failed
+    `max_attempts` times, are skipped.
+    Submissions (and emails) from all workers share the RATE_LIMITS
+    token buckets.
+
+    Args:
+        input_path: CSV or JSONL file with one FORM_DATA dict per row
+        results_path: JSONL file that receives one result per row
+        form_url: Form to submit to
+        workers: Number of worker processes
+        engine: "http" or "browser"
+        journal_path: Job journal database (default: JOB_JOURNAL['path'])
+        max_attempts: Attempts per row before it is given up on
+        email: Send the submission email for every submitted row through
+            the outbox, concurrently with filling
+        validate: Validate and normalize rows first (see validation.py);
+            invalid rows go to `<results_path>.rejects.jsonl` unsubmitted
+        browser_profile: Chrome profile for the browser engine ("default"
+            or "lean"; BROWSER_PROFILE when None)
+
+    Returns:
+        dict: Aggregated run summary (also written next to the results file)
+    """
+    task_queue = multiprocessing.Queue(maxsize=workers * QUEUE_DEPTH_PER_WORKER)
+    result_queue = multiprocessing.Queue()
+    worker_stats = []
+    journal = JobJournal(form_url, path=journal_path, max_attempts=max_attempts)
+    done, exhausted = journal.load_resume_state()
+
+    limiters = shared_limiters()
+    log_queue = worker_log_queue()
+    sender = None
+    if email:
+        from email_outbox import OutboxSender
+
+        def on_sent(record):
+            if record.get('form_url') == form_url:
+                journal.mark(record['job_id'], EMAILED)
+
+        sender = OutboxSender(on_sent=on_sent).start()
+
+    processes = [
+        multiprocessing.Process(target=_worker_main,
+                                args=(i, engine, form_url, task_queue, result_queue,
+                                      metrics.enabled, email, limiters, log_queue,
+                                      logging.getLogger().getEffectiveLevel(), browser_profile),
+                                daemon=True)
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    collector = threading.Thread(target=_collect_results,
+                                 args=(result_queue, results_path, processes, worker_stats,
+                                       journal))
+    collector.start()
+
+    started = time.perf_counter()
+    total = skipped = 0
+    queued = set()
+    rejects = RejectFile(results_path + ".rejects.jsonl") if validate else None
+    rows = read_rows(input_path)
+    if validate:
+        rows = validated_rows(rows, rejects)
+    try:
+        # The bounded queue blocks the reader, so memory stays flat
+        for task in rows:
+            total += 1
+            row_id = task[0]
+            # A repeated row_id (or identical answers) is the same job
+            if row_id in done or row_id in exhausted or row_id in queued:
+                skipped += 1
+                continue
+            queued.add(row_id)
+            journal.mark(row_id, PENDING)
+            if not _put_task(task_queue, task, processes):
+                logger.error("❌ Every worker has exited, stopping the run")
+                break
+    finally:
+        for _ in processes:
+            if not _put_task(task_queue, None, processes):
+                break
+        collector.join()
+        for process in processes:
+            process.join()
+        if sender is not None:
+            sender.stop(drain=True)
+        journal.close()
+        if rejects is not None:
+            rejects.close()
+
+    elapsed = time.perf_counter() - started
+    rejected = rejects.count if rejects is not None else 0
+    submitted = sum(s['submitted'] for s in worker_stats)
+    failed = sum(s['failed'] for s in worker_stats)
+    summary = {
+        'rows': total + rejected,
+        'skipped': skipped,
+        'rejected': rejected,
+        'submitted': submitted,
+        'failed': failed,
+        # Queued rows no worker finished; they stay pending in the journal
+        'pending': len(queued) - submitted - failed,
+        'worker_errors': sum(1 for s in worker_stats if s.get('error')),
+        'workers': sorted(worker_stats, key=lambda s: s['worker']),
+        'elapsed': round(elapsed, 3),
+        'rows_per_sec': round((total - skipped) / elapsed, 2) if elapsed else 0.0,
+    }
+    with open(results_path + ".summary.json", 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+
+    for stats in summary['workers']:
+        logger.info(f"Worker {stats['worker']}: {stats['submitted']} ok, "
+                    f"{stats['failed']} failed, {stats['rows_per_sec']} rows/s")
+    if skipped:
+        logger.info(f"↷ Skipped {skipped} row(s) already submitted, repeated "
+                    f"or out of attempts")
+    if summary['worker_errors']:
+        logger.error(f"❌ {summary['worker_errors']} worker(s) failed, {summary['pending']} "
+                     f"row(s) left pending for the next run")
+    if rejected:
+        logger.warning(f"⚠️ Rejected {rejected} invalid row(s), see {rejects.path}")
+    logger.info(f"✓ Bulk run finished: {summary['submitted']}/{total - skipped} submitted "
+                f"in {summary['elapsed']}s ({summary['rows_per_sec']} rows/s)")
+    return summary
+
+
+def main():
+    # Same options as `python cli.py bulk`
+    from cli import main as cli_main
+    sys.exit(cli_main(["bulk"] + sys.argv[1:]))
+
+
+if __name__ == "__main__":
+    main()
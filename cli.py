@@ -0,0 +1,300 @@
+"""
+Command-line entry point.
+
+    python cli.py fill                    # fill the form for FORM_DATA and email the proof
+    python cli.py fill --dry-run          # check the configuration, submit nothing
+    python cli.py send --run-id RUN_ID    # (re)send the email for one submission
+    python cli.py bulk rows.csv --workers 8 --email
+    python cli.py validate rows.csv --output clean.jsonl
+
+Only configg and metrics are imported up front; every command imports
+what it uses when it runs. Selenium is loaded only when the browser
+engine actually fills a form and Flask/Flask-Mail only when an email is
+built, so dry runs, validation and the HTTP engine start without either
+stack.
+"""
+
+import argparse
+import logging
+import os
+import sys
+from configg import (EMAIL_CONFIG, FORM_DATA, GOOGLE_FORM_URL, RESUME_PATH, SUBMIT_ENGINE,
+                     setup_logging, logger)
+from metrics import metrics
+
+
+# ==================== FILL ====================
+def config_errors():
+    """Reasons the configuration cannot be used for a real submission"""
+    errors = []
+    if "YOUR_" in GOOGLE_FORM_URL or "your." in EMAIL_CONFIG['sender_email']:
+        errors.append("GOOGLE_FORM_URL / EMAIL_CONFIG still hold the placeholders")
+    return errors
+
+
+def dry_run(engine):
+    """
+    Check everything a submission needs without loading Selenium or Flask.
+
+    Returns:
+        int: 0 if a real run could start, 1 otherwise
+    """
+    from validation import normalize_row
+
+    errors = config_errors()
+    _, row_errors = normalize_row(FORM_DATA)
+    errors.extend(f"FORM_DATA {error}" for error in row_errors)
+    if not os.path.exists(RESUME_PATH):
+        logger.warning(f"⚠️ Resume not found at: {RESUME_PATH}")
+
+    for error in errors:
+        logger.error(f"❌ {error}")
+    if errors:
+        return 1
+    logger.info(f"✓ Configuration OK: {engine} engine, form {GOOGLE_FORM_URL}")
+    return 0
+
+
+def run_job(journal, engine=None, browser_profile=None):
+    """
+    Fill the form and send the email, skipping whatever the journal says is done.
+
+    Returns:
+        bool: True once the form is submitted and its email sent
+    """
+    from job_journal import job_id_for, FILLED, SUBMITTED, EMAILED, FAILED
+    from email_outbox import Outbox, OutboxSender
+    from emaill import submission_message_spec
+    from submission_result import UNCONFIRMED
+
+    engine = engine or SUBMIT_ENGINE
+    job_id = job_id_for(FORM_DATA)
+    state, attempts, run_id = journal.state(job_id)
+
+    if state == EMAILED:
+        logger.info("✓ Already submitted and emailed for this FORM_DATA, nothing to do")
+        return True
+    if state != SUBMITTED and attempts >= journal.max_attempts:
+        logger.error(f"❌ Giving up after {attempts} failed attempts "
+                     f"(see {journal.path})")
+        return False
+
+    # The sender starts right away so messages left over from an earlier
+    # run go out while the form is being filled
+    outbox = Outbox()
+    already_spooled = outbox.has_job(job_id)
+    emailed = set()
+
+    def on_sent(record):
+        if record.get('form_url') == journal.form_url:
+            journal.mark(record['job_id'], EMAILED)
+            emailed.add(record['job_id'])
+
+    sender = OutboxSender(outbox, on_sent=on_sent).start()
+    filler = None
+    try:
+        if state == SUBMITTED:
+            logger.info("↷ Form already submitted for this FORM_DATA, skipping to email")
+        else:
+            logger.info("=" * 70)
+            logger.info("STEP 1: Smart Form Filling")
+            logger.info("=" * 70)
+
+            journal.mark(job_id, FILLED)
+            journal.flush()
+            form_success = False
+            run_id = None
+
+            result = None
+
+            if engine == "http":
+                from http_filler import HttpGoogleFormFiller
+                http_filler = HttpGoogleFormFiller(GOOGLE_FORM_URL, FORM_DATA)
+                form_success = http_filler.fill_form()
+                result = http_filler.result
+                run_id = result.run_id
+                # An unconfirmed POST (including one whose reply was lost) may
+                # still have been recorded; submitting again through the
+                # browser could create a duplicate response
+                if not form_success and result.status != UNCONFIRMED and not result.posted:
+                    logger.warning("⚠️ HTTP submission failed, falling back to the browser")
+                    metrics.incr("retries", step="engine_fallback")
+                    result = None
+
+            if result is None:
+                # Selenium is only loaded here, when the browser is really needed
+                from Form import SmartGoogleFormFiller
+                filler = SmartGoogleFormFiller(GOOGLE_FORM_URL, FORM_DATA,
+                                               browser_profile=browser_profile)
+                form_success = filler.fill_form()
+                result = filler.result
+                run_id = filler.run_id
+
+            if not form_success:
+                journal.mark(job_id, FAILED, run_id=run_id,
+                             error=f"submission {result.status}: "
+                                   f"{result.error or 'no confirmation'}")
+                journal.flush()
+                logger.error(f"❌ Form filling failed ({result.status})")
+                return False
+
+            # Recorded before the email so a crash below never re-submits the form
+            journal.mark(job_id, SUBMITTED, run_id=run_id)
+            journal.flush()
+
+        logger.info("\n" + "=" * 70)
+        logger.info("STEP 2: Email Submission")
+        logger.info("=" * 70)
+
+        if already_spooled:
+            logger.info("↷ Email for this FORM_DATA is already in the outbox")
+        else:
+            # The sender waits for the screenshot writer, so no flush is needed here
+            screenshot = filler.result.screenshot if filler else None
+            spec = submission_message_spec(run_id, screenshot)
+            outbox.enqueue(dict(spec, job_id=job_id, form_url=GOOGLE_FORM_URL))
+    finally:
+        sender.stop(drain=True)
+        if filler is not None:
+            from screenshot_writer import screenshot_writer
+            screenshot_writer.flush()
+
+    if job_id in emailed:
+        logger.info("\n" + "=" * 70)
+        logger.info("✓ ✓ ✓  ASSIGNMENT COMPLETED!  ✓ ✓ ✓")
+        logger.info("=" * 70)
+        return True
+    logger.error("❌ Email failed (but form was submitted)")
+    return False
+
+
+def fill(args):
+    """`fill`: one submission for FORM_DATA, resumable through the job journal"""
+    if args.dry_run:
+        return dry_run(args.engine)
+    errors = config_errors()
+    if errors:
+        logger.error("❌ Please update configuration first!")
+        return 1
+
+    from job_journal import JobJournal
+    with JobJournal(GOOGLE_FORM_URL) as journal:
+        return 0 if run_job(journal, engine=args.engine,
+                            browser_profile=args.browser_profile) else 1
+
+
+# ==================== SEND ====================
+def send(args):
+    """`send`: email a submission's screenshot and resume, or drain the outbox"""
+    if args.outbox:
+        from email_outbox import OutboxSender
+        sender = OutboxSender().start()
+        sender.stop(drain=True)
+        return 0 if sender.failed == 0 else 1
+
+    from emaill import send_email_with_latest_screenshot
+    return 0 if send_email_with_latest_screenshot(args.run_id) else 1
+
+
+# ==================== BULK ====================
+def bulk(args):
+    """`bulk`: submit every row of a CSV/JSONL file with a pool of workers"""
+    from bulk import run_bulk
+
+    if args.metrics:
+        metrics.enable()
+    summary = run_bulk(args.input, args.results, form_url=args.form_url,
+                       workers=args.workers, engine=args.engine,
+                       journal_path=args.journal, max_attempts=args.max_attempts,
+                       email=args.email, validate=not args.no_validate,
+                       browser_profile=args.browser_profile)
+    ok = summary['failed'] == 0 and summary['worker_errors'] == 0 and summary['pending'] == 0
+    return 0 if ok else 1
+
+
+# ==================== VALIDATE ====================
+def validate(args):
+    """`validate`: normalize a CSV/JSONL file without submitting anything"""
+    from validation import validate_file
+
+    report = validate_file(args.input, args.output, args.rejects)
+    return 0 if report['rejected'] == 0 else 1
+
+
+# ==================== MAIN ====================
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Google Form filling automation")
+    parser.add_argument("--quiet", action="store_true", help="Only log warnings and errors")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fill_parser = commands.add_parser("fill", help="Fill the form for FORM_DATA and email it")
+    fill_parser.add_argument("--engine", choices=["http", "browser"], default=SUBMIT_ENGINE)
+    fill_parser.add_argument("--dry-run", action="store_true",
+                             help="Check configuration and FORM_DATA, submit nothing")
+    fill_parser.add_argument("--browser-profile", choices=["default", "lean"],
+                             help="Chrome profile (default: BROWSER_PROFILE)")
+    fill_parser.set_defaults(handler=fill)
+
+    send_parser = commands.add_parser("send", help="Send the submission email")
+    send_parser.add_argument("--run-id", help="Submission whose screenshot to attach "
+                                              "(default: the latest screenshot)")
+    send_parser.add_argument("--outbox", action="store_true",
+                             help="Send whatever is waiting in the outbox instead")
+    send_parser.set_defaults(handler=send)
+
+    bulk_parser = commands.add_parser("bulk", help="Submit every row of a file")
+    bulk_parser.add_argument("input", help="CSV or JSONL file with one FORM_DATA row per line")
+    bulk_parser.add_argument("--results", default="results.jsonl", help="Per-row results file")
+    bulk_parser.add_argument("--workers", type=int, default=4, help="Number of worker processes")
+    bulk_parser.add_argument("--engine", choices=["http", "browser"], default=SUBMIT_ENGINE)
+    bulk_parser.add_argument("--form-url", default=GOOGLE_FORM_URL)
+    bulk_parser.add_argument("--browser-profile", choices=["default", "lean"],
+                             help="Chrome profile for --engine browser "
+                                  "(default: BROWSER_PROFILE)")
+    bulk_parser.add_argument("--journal",
+                             help="Job journal database (default: JOB_JOURNAL['path'])")
+    bulk_parser.add_argument("--max-attempts", type=int, help="Attempts per row before giving up")
+    bulk_parser.add_argument("--email", action="store_true",
+                             help="Email every submitted row through the outbox")
+    bulk_parser.add_argument("--metrics", action="store_true",
+                             help="Record per-phase timings (see METRICS_CONFIG)")
+    bulk_parser.add_argument("--no-validate", action="store_true",
+                             help="Submit rows as-is, without validation and normalization")
+    bulk_parser.set_defaults(handler=bulk)
+
+    validate_parser = commands.add_parser("validate", help="Validate and normalize a file")
+    validate_parser.add_argument("input", help="CSV or JSONL file with one FORM_DATA row per line")
+    validate_parser.add_argument("--output", default="clean.jsonl",
+                                 help="Normalized valid rows")
+    validate_parser.add_argument("--rejects", default="rejects.jsonl",
+                                 help="Rejected rows with reasons")
+    validate_parser.set_defaults(handler=validate)
+    return parser
+
+
+def main(argv=None):
+    """
+    Run one command.
+
+    Args:
+        argv: Arguments without the program name (default: sys.argv[1:])
+
+    Returns:
+        int: Process exit code
+    """
+    args = build_parser().parse_args(argv)
+    setup_logging(logging.WARNING if args.quiet else logging.INFO)
+    try:
+        return args.handler(args)
+    except KeyboardInterrupt:
+        logger.info("\nInterrupted by user")
+        return 130
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        raise
+    finally:
+        metrics.export()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,13 +3,17 @@ import logging
 # -------------------------------------------------------------------
 # Logging Setup
 # -------------------------------------------------------------------
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
+# Importing configg configures nothing; entry points call setup_logging()
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
 logger = logging.getLogger(__name__)
 
 
+def setup_logging(level=logging.INFO):
+    """Start the queued, PII-safe log pipeline (log_pipeline.py); called by every entry point"""
+    from log_pipeline import start_logging
+    start_logging(level)
+
+
 # -------------------------------------------------------------------
 # Personal Information (Fill locally, keep secret on GitHub)
 # -------------------------------------------------------------------
@@ -33,6 +37,11 @@ EMAIL_CONFIG = {
     "recipient_email": "receiver@example.com",
     "cc_email": "receiver@example.com",
     "subject": f"Python (Selenium) Assignment - {FORM_DATA['full_name']}",
+    "smtp_server": "smtp.gmail.com",
+    "smtp_port": 587,
+    "use_tls": True,
+    # Messages sent over one SMTP connection before it is recycled (bulk sends)
+    "max_per_connection": 100,
 }
 
 
@@ -41,6 +50,11 @@ EMAIL_CONFIG = {
 # -------------------------------------------------------------------
 GOOGLE_FORM_URL = "https://forms.gle/YOUR_FORM_ID"
 
+# Submission engine: "browser" fills the form in Selenium and captures the
+# screenshot emailed as proof; "http" posts straight to formResponse (no
+# screenshot) and falls back to the browser if that fails
+SUBMIT_ENGINE = "browser"
+
 # GitHub Links
 GITHUB_REPO_URL = "https://github.com/YOUR_USERNAME/Project"
 GITHUB_PROJECTS_URL = [
@@ -49,4 +63,100 @@ GITHUB_PROJECTS_URL = [
 ]
 # Local paths
 SCREENSHOTS_FOLDER = "./screenshots"
+# Oldest screenshots are deleted once either limit is exceeded
+SCREENSHOT_RETENTION = {"max_files": 500, "max_age_days": 30}
+# element_only: capture just the confirmation message instead of the whole
+# window (smaller files, but the emailed proof no longer shows the page)
+# max_width: downscale wider screenshots (needs Pillow installed)
+SCREENSHOT_OPTIONS = {"element_only": False, "max_width": 1280, "workers": 2}
+# Screenshots of successful submissions: "always", "sample" (1 in
+# sample_every) or "on_failure"; failed submissions are always captured
+SCREENSHOT_POLICY = {"mode": "always", "sample_every": 20}
+# One JSON line per submission (status, timings, screenshot); None disables
+SUBMISSION_LOG = "./submissions.jsonl"
 RESUME_PATH = "./resume.pdf"
+SCHEMA_CACHE_DIR = "./.cache/fill_plans"
+
+# Chrome profile used for browser sessions: "default" is a regular Chrome
+# window; "lean" returns from page loads at DOMContentLoaded, runs headless
+# and never downloads images, fonts or anything matching BROWSER_BLOCKLIST
+# (opt in per run with `cli.py fill/bulk --browser-profile lean`)
+BROWSER_PROFILE = "default"
+LEAN_PROFILE = {
+    "headless": True,
+    "window_size": "1280,1024",
+    "block_images": True,
+    "block_fonts": True,
+}
+# URL patterns (DevTools wildcard syntax) the lean profile blocks
+BROWSER_BLOCKLIST = [
+    "*google-analytics.com/*",
+    "*googletagmanager.com/*",
+    "*/gtag/js*",
+    "*doubleclick.net/*",
+    "*play.google.com/log*",
+]
+# Resumable job journal: state changes are committed every batch_size
+# changes or flush_interval seconds; failed jobs are retried up to max_attempts
+JOB_JOURNAL = {
+    "path": "./.cache/jobs.sqlite3",
+    "batch_size": 100,
+    "flush_interval": 2.0,
+    "max_attempts": 3,
+}
+# Email outbox: spooled messages are sent by `senders` threads; producers
+# block once max_messages are spooled (for up to backpressure_timeout s)
+OUTBOX_CONFIG = {
+    "folder": "./.cache/outbox",
+    "max_messages": 500,
+    "backpressure_timeout": 60,
+    "senders": 2,
+    "max_attempts": 5,
+    "poll_interval": 0.2,
+    # Seconds to hold a message whose attachments are not on disk yet
+    "attachment_wait": 30,
+    # Seconds before a message claimed by a dead sender is sent again
+    "lease_seconds": 300,
+}
+# Token buckets (requests/second) shared by every thread and bulk worker.
+# The rate adapts between min_rate and max_rate: throttling multiplies it
+# by `decrease`, success adds `increase` per second. None disables a limiter.
+RATE_LIMITS = {
+    "form": {"rate": 2.0, "burst": 4, "min_rate": 0.1, "max_rate": 10.0,
+             "increase": 0.2, "decrease": 0.7},
+    "email": {"rate": 0.5, "burst": 3, "min_rate": 0.02, "max_rate": 2.0,
+              "increase": 0.05, "decrease": 0.5},
+}
+# Bulk rows are validated and normalized before submission (validation.py);
+# rows missing any of these fields or failing a format rule are rejected
+VALIDATION = {
+    "required": ["full_name", "contact_number", "email", "address", "pin_code", "dob", "gender"],
+}
+# Retries of throttled or transient failures: exponential backoff with
+# full jitter, base_delay * 2**attempt capped at max_delay seconds
+RETRY_POLICY = {"attempts": 4, "base_delay": 0.5, "max_delay": 30.0}
+
+
+# -------------------------------------------------------------------
+# Logging (queued, structured, PII-safe; see log_pipeline.py)
+# -------------------------------------------------------------------
+# format: "text" (LOG_FORMAT plus ` | key=value` fields) or "json" (one object per line)
+# redact: mask redact_fields values and email addresses / phone numbers in
+# the output; turn off only to debug locally
+LOGGING_CONFIG = {
+    "format": "text",
+    "redact": True,
+    "redact_fields": ["value"] + list(FORM_DATA),
+}
+
+
+# -------------------------------------------------------------------
+# Metrics (per-phase timing spans and counters, off by default)
+# -------------------------------------------------------------------
+# trace_path: one JSON line per finished span
+# prometheus_path: textfile for node_exporter's textfile collector
+METRICS_CONFIG = {
+    "enabled": False,
+    "trace_path": "./metrics/trace.jsonl",
+    "prometheus_path": "./metrics/google_form_filler.prom",
+}
@@ -0,0 +1,270 @@
+"""
+Warm, reusable Chrome WebDriver pool.
+
+Keeps browsers alive between submissions and resets their state
+(cookies, storage, a fresh tab) instead of relaunching Chrome for every
+form. Drivers are health-checked on checkout and recycled after a fixed
+number of uses or when they crash.
+
+Also builds the Chrome options for the "default" and "lean" profiles
+(see BROWSER_PROFILE in configg).
+"""
+
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import (WebDriverException, InvalidSessionIdException,
+                                        NoSuchWindowException)
+from configg import BROWSER_PROFILE, LEAN_PROFILE, BROWSER_BLOCKLIST, logger
+
+
+# Blocked over DevTools when LEAN_PROFILE blocks images/fonts; the image
+# content setting alone misses CSS backgrounds in some Chrome versions
+IMAGE_PATTERNS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico"]
+FONT_PATTERNS = ["*.woff2", "*.woff", "*.ttf", "*.otf", "*fonts.gstatic.com/*"]
+
+# Errors that mean the browser session itself is gone. Timeouts and missing
+# elements are WebDriverExceptions too, but leave the driver usable.
+SESSION_ERRORS = (InvalidSessionIdException, NoSuchWindowException, ConnectionError)
+SESSION_ERROR_MESSAGES = ("chrome not reachable", "disconnected", "session deleted",
+                          "max retries exceeded")
+
+
+def is_session_error(error):
+    """True if `error` means the driver has to be recycled rather than reused"""
+    if isinstance(error, SESSION_ERRORS):
+        return True
+    message = str(error).lower()
+    return any(text in message for text in SESSION_ERROR_MESSAGES)
+
+
+def blocked_url_patterns(profile=None):
+    """URL patterns blocked for a browser profile"""
+    if (profile or BROWSER_PROFILE) != "lean":
+        return []
+    patterns = list(BROWSER_BLOCKLIST)
+    if LEAN_PROFILE['block_images']:
+        patterns += IMAGE_PATTERNS
+    if LEAN_PROFILE['block_fonts']:
+        patterns += FONT_PATTERNS
+    return patterns
+
+
+def chrome_options(profile=None):
+    """Chrome options for the "default" or "lean" profile"""
+    profile = profile or BROWSER_PROFILE
+    chrome_options = Options()
+    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+
+    if profile != "lean":
+        chrome_options.add_argument('--start-maximized')
+        return chrome_options
+
+    # Return from driver.get() at DOMContentLoaded; readiness.py waits for the form itself
+    chrome_options.page_load_strategy = 'eager'
+    if LEAN_PROFILE['headless']:
+        chrome_options.add_argument('--headless=new')
+    chrome_options.add_argument(f"--window-size={LEAN_PROFILE['window_size']}")
+    chrome_options.add_argument('--disable-extensions')
+    chrome_options.add_argument('--disable-background-networking')
+    chrome_options.add_argument('--disable-component-update')
+    if LEAN_PROFILE['block_images']:
+        chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+        chrome_options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2})
+    return chrome_options
+
+
+def apply_network_blocking(driver):
+    """(Re)apply the driver's URL blocklist to its current tab"""
+    patterns = getattr(driver, 'blocked_urls', None)
+    if not patterns:
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except (AttributeError, WebDriverException) as e:
+        logger.warning(f"⚠️ Could not apply URL blocklist: {e}")
+
+
+def create_chrome_driver(profile=None):
+    """Launch a new Chrome WebDriver with the configured (or given) profile"""
+    driver = webdriver.Chrome(options=chrome_options(profile))
+    driver.blocked_urls = blocked_url_patterns(profile)
+    apply_network_blocking(driver)
+    return driver
+
+
+class _PooledDriver:
+    """A pooled driver and how many submissions it has served"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+
+
+class DriverPool:
+    """Thread-safe pool of warm WebDrivers shared by concurrent callers"""
+
+    def __init__(self, size=2, max_uses=50, factory=create_chrome_driver):
+        """
+        Args:
+            size: Maximum number of live drivers
+            max_uses: Submissions served before a driver is recycled
+            factory: Callable that launches a new driver
+        """
+        self.size = size
+        self.max_uses = max_uses
+        self.factory = factory
+        self._idle = queue.LifoQueue()  # LIFO hands out the most recently used driver
+        self._slots = threading.BoundedSemaphore(size)
+        self._checked_out = {}
+        self._lock = threading.Lock()
+        self.cold_start_times = []
+        self.warm_reuse_times = []
+        self.recycled = 0
+
+    def acquire(self, timeout=None):
+        """
+        Check out a driver, reusing a warm one when possible.
+
+        Raises:
+            TimeoutError: If no driver frees up within `timeout` seconds
+        """
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("No WebDriver available in pool")
+
+        try:
+            while True:
+                try:
+                    pooled = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+
+                started = time.perf_counter()
+                if pooled.uses >= self.max_uses or not self._is_healthy(pooled.driver):
+                    self._discard(pooled)
+                    continue
+                try:
+                    self._reset(pooled.driver)
+                except WebDriverException as e:
+                    logger.warning(f"Driver reset failed, recycling: {e}")
+                    self._discard(pooled)
+                    continue
+                self.warm_reuse_times.append(time.perf_counter() - started)
+                return self._check_out(pooled)
+
+            started = time.perf_counter()
+            pooled = _PooledDriver(self.factory())
+            self.cold_start_times.append(time.perf_counter() - started)
+            logger.info("✓ Chrome WebDriver initialized")
+            return self._check_out(pooled)
+
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, driver, healthy=True):
+        """Return a driver to the pool; unhealthy drivers are quit"""
+        with self._lock:
+            pooled = self._checked_out.pop(id(driver), None)
+        if pooled is None:
+            return
+
+        if healthy and pooled.uses < self.max_uses:
+            self._idle.put(pooled)
+        else:
+            self._discard(pooled)
+        self._slots.release()
+
+    @contextmanager
+    def driver(self, timeout=None):
+        """Context manager that checks a driver out and back in"""
+        driver = self.acquire(timeout)
+        healthy = True
+        try:
+            yield driver
+        except Exception as e:
+            healthy = not is_session_error(e)
+            raise
+        finally:
+            self.release(driver, healthy)
+
+    def _check_out(self, pooled):
+        pooled.uses += 1
+        with self._lock:
+            self._checked_out[id(pooled.driver)] = pooled
+        return pooled.driver
+
+    def _is_healthy(self, driver):
+        try:
+            return driver.execute_script("return 1") == 1
+        except WebDriverException:
+            return False
+
+    def _reset(self, driver):
+        """Clear cookies and storage and switch to a fresh blank tab"""
+        driver.execute_script(
+            "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}")
+        try:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except (AttributeError, WebDriverException):
+            driver.delete_all_cookies()
+
+        old_handles = driver.window_handles
+        driver.switch_to.new_window('tab')
+        fresh = driver.current_window_handle
+        for handle in old_handles:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(fresh)
+        # DevTools network settings are per tab
+        apply_network_blocking(driver)
+
+    def _discard(self, pooled):
+        self.recycled += 1
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.warning(f"Driver quit issue: {e}")
+
+    def report(self):
+        """
+        Summarize cold-start vs warm-reuse latency.
+
+        Returns:
+            dict: Counts and mean latencies in milliseconds
+        """
+        def mean_ms(samples):
+            return round(sum(samples) / len(samples) * 1000, 1) if samples else None
+
+        report = {
+            'cold_starts': len(self.cold_start_times),
+            'cold_start_ms': mean_ms(self.cold_start_times),
+            'warm_reuses': len(self.warm_reuse_times),
+            'warm_reuse_ms': mean_ms(self.warm_reuse_times),
+            'recycled': self.recycled,
+        }
+        logger.info(f"Driver pool: {report['cold_starts']} cold starts "
+                    f"({report['cold_start_ms']} ms avg), {report['warm_reuses']} warm reuses "
+                    f"({report['warm_reuse_ms']} ms avg), {report['recycled']} recycled")
+        return report
+
+    def close(self):
+        """Quit every idle driver"""
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                pooled.driver.quit()
+            except Exception as e:
+                logger.warning(f"Driver quit issue: {e}")
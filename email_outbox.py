@@ -0,0 +1,270 @@
+"""
+Durable on-disk email outbox.
+
+Form workers spool a message description (body plus attachment paths)
+instead of waiting on SMTP; an OutboxSender drains the spool on its own
+threads over pooled SMTP connections, so filling throughput no longer
+depends on SMTP latency.
+
+Each message is one JSON file. It is written to tmp/, renamed into new/
+and moved to cur/ by the sender that claims it, so exactly one sender
+sends it and a crash loses nothing. File names start with the time the
+message is due, which keeps new/ in send order and lets retries be
+scheduled by renaming.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from configg import OUTBOX_CONFIG, logger
+from emaill import BulkMailer, message_from_spec
+from metrics import metrics
+from rate_limit import backoff_delay
+
+
+class OutboxFull(Exception):
+    """The spool stayed over its size limit for the whole backpressure timeout"""
+
+
+class Outbox:
+    """Spool directory of messages waiting to be sent"""
+
+    def __init__(self, folder=None, max_messages=None):
+        self.folder = folder or OUTBOX_CONFIG['folder']
+        self.max_messages = max_messages or OUTBOX_CONFIG['max_messages']
+        for sub in ("tmp", "new", "cur", "failed"):
+            os.makedirs(self._dir(sub), exist_ok=True)
+
+    def _dir(self, sub):
+        return os.path.join(self.folder, sub)
+
+    def _count(self, sub):
+        with os.scandir(self._dir(sub)) as entries:
+            return sum(1 for _ in entries)
+
+    def size(self):
+        """Messages waiting or being sent"""
+        return self._count("new") + self._count("cur")
+
+    def waiting(self):
+        """Messages not yet claimed by a sender"""
+        return self._count("new")
+
+    def _write(self, record, sub, due):
+        name = f"{int(due * 1e9):020d}_{record['id']}.json"
+        tmp_path = os.path.join(self._dir("tmp"), name)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(record, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(self._dir(sub), name))
+
+    def enqueue(self, spec, timeout=None):
+        """
+        Spool a message built by emaill.submission_message_spec().
+
+        Blocks while the spool holds `max_messages` or more (backpressure),
+        so producers slow down to the sender's pace instead of filling the disk.
+
+        Returns:
+            str: Message ID
+
+        Raises:
+            OutboxFull: If the spool is still full after `timeout` seconds
+        """
+        timeout = OUTBOX_CONFIG['backpressure_timeout'] if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        delay = 0.05
+        if self.size() >= self.max_messages:
+            metrics.incr("outbox_backpressure")
+            while self.size() >= self.max_messages:
+                if time.monotonic() >= deadline:
+                    raise OutboxFull(f"Outbox still has {self.max_messages}+ messages "
+                                     f"after {timeout}s")
+                time.sleep(delay)
+                delay = min(delay * 2, 1.0)
+
+        record = dict(spec, id=uuid.uuid4().hex[:12], attempts=0, created=time.time())
+        self._write(record, "new", time.time())
+        return record['id']
+
+    def has_job(self, job_id):
+        """True if a message for `job_id` is still waiting or being sent"""
+        for sub in ("new", "cur"):
+            with os.scandir(self._dir(sub)) as entries:
+                for entry in entries:
+                    try:
+                        with open(entry.path, encoding='utf-8') as f:
+                            if json.load(f).get('job_id') == job_id:
+                                return True
+                    except (OSError, ValueError):
+                        continue
+        return False
+
+    def claim(self):
+        """
+        Move the oldest due message to cur/.
+
+        Returns:
+            tuple: (path, record), or None if nothing is due
+        """
+        now_ns = time.time_ns()
+        for name in sorted(os.listdir(self._dir("new"))):
+            if int(name.split("_", 1)[0]) > now_ns:
+                break  # names are sorted by due time
+            claimed = os.path.join(self._dir("cur"), name)
+            try:
+                # Atomic: when senders race for a message exactly one rename succeeds
+                os.replace(os.path.join(self._dir("new"), name), claimed)
+            except FileNotFoundError:
+                continue
+            os.utime(claimed)  # start of this sender's lease
+            try:
+                with open(claimed, encoding='utf-8') as f:
+                    return claimed, json.load(f)
+            except ValueError:
+                logger.error(f"❌ Unreadable outbox message {name}, moving to failed/")
+                os.replace(claimed, os.path.join(self._dir("failed"), name))
+        return None
+
+    def complete(self, path):
+        """Drop a message that was sent"""
+        os.remove(path)
+
+    def release(self, path, record, delay=0.0, failed=False):
+        """Return a claimed message to new/ after `delay` seconds, or park it in failed/"""
+        self._write(record, "failed" if failed else "new", time.time() + delay)
+        os.remove(path)
+
+    def recover(self, lease=None):
+        """
+        Return messages whose sender died mid-send to new/.
+
+        Only messages claimed more than `lease` seconds ago are touched, so
+        senders that are still running keep theirs.
+
+        Returns:
+            int: Number of messages recovered
+        """
+        lease = OUTBOX_CONFIG['lease_seconds'] if lease is None else lease
+        cutoff = time.time() - lease
+        recovered = 0
+        with os.scandir(self._dir("cur")) as entries:
+            for entry in entries:
+                if entry.stat().st_mtime < cutoff:
+                    try:
+                        os.replace(entry.path, os.path.join(self._dir("new"), entry.name))
+                        recovered += 1
+                    except FileNotFoundError:
+                        pass
+        if recovered:
+            logger.warning(f"⚠️ Recovered {recovered} interrupted outbox message(s)")
+        return recovered
+
+
+class OutboxSender:
+    """
+    Threads that drain an Outbox over pooled SMTP connections.
+
+    Usage:
+        sender = OutboxSender(outbox, on_sent=lambda record: ...).start()
+        ...  # producers call outbox.enqueue()
+        sender.stop()  # sends whatever is already spooled, then stops
+    """
+
+    def __init__(self, outbox=None, workers=None, on_sent=None, max_attempts=None):
+        self.outbox = outbox or Outbox()
+        self.workers = workers or OUTBOX_CONFIG['senders']
+        self.on_sent = on_sent
+        self.max_attempts = max_attempts or OUTBOX_CONFIG['max_attempts']
+        self.sent = 0
+        self.failed = 0
+        self._threads = []
+        self._stop = threading.Event()
+        self._draining = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        self.outbox.recover()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"outbox-sender-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def _run(self):
+        with BulkMailer() as mailer:
+            while not self._stop.is_set():
+                if self.send_one(mailer):
+                    continue
+                if self._draining.is_set() and self.outbox.waiting() == 0:
+                    break
+                self._stop.wait(OUTBOX_CONFIG['poll_interval'])
+
+    def send_one(self, mailer):
+        """
+        Claim and send one due message.
+
+        Returns:
+            bool: False if nothing was due
+        """
+        claimed = self.outbox.claim()
+        if claimed is None:
+            return False
+        path, record = claimed
+
+        # Screenshots are written in the background; give them a moment
+        missing = [p for p in record['attachments'] if not os.path.exists(p)]
+        if missing and time.time() - record['created'] < OUTBOX_CONFIG['attachment_wait']:
+            self.outbox.release(path, record, delay=0.5)
+            return True
+
+        try:
+            with metrics.span("email_send", job_id=record.get('job_id')):
+                mailer.send(message_from_spec(record))
+        except Exception as e:
+            record['attempts'] += 1
+            record['error'] = str(e)
+            give_up = record['attempts'] >= self.max_attempts
+            # Jittered, so messages throttled together are not retried together
+            self.outbox.release(path, record, delay=backoff_delay(record['attempts'], base=2.0, cap=60),
+                                failed=give_up)
+            if give_up:
+                with self._lock:
+                    self.failed += 1
+                metrics.incr("emails", result="failed")
+                logger.error(f"❌ Giving up on email {record['id']} after "
+                             f"{record['attempts']} attempts: {e}")
+            else:
+                metrics.incr("retries", step="outbox_send")
+                logger.warning("⚠️ Email %s failed, retrying: %s", record['id'], e)
+            return True
+
+        self.outbox.complete(path)
+        with self._lock:
+            self.sent += 1
+        metrics.incr("emails", result="ok")
+        logger.info("✅ Email %s sent", record['id'])
+        if self.on_sent:
+            self.on_sent(record)
+        return True
+
+    def stop(self, drain=True, timeout=None):
+        """
+        Stop the sender threads.
+
+        With `drain`, threads first send every message already spooled
+        (waiting up to OUTBOX_CONFIG['attachment_wait'] for attachments).
+        """
+        if drain:
+            self._draining.set()
+        else:
+            self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._stop.set()
+        self._threads = []
+        logger.info(f"✓ Outbox: {self.sent} sent, {self.failed} failed, "
+                    f"{self.outbox.waiting()} waiting")
@@ -1,22 +1,69 @@
 import time
 import os
 import glob
+import smtplib
+import base64
+import threading
 from datetime import datetime
-from flask import Flask
-from flask_mail import Mail, Message
+from screenshot_manifest import screenshot_manifest
+from metrics import metrics, timed
+from rate_limit import call_with_retry, get_limiter, is_throttle_error
 from configg import EMAIL_CONFIG, FORM_DATA, GITHUB_REPO_URL,SCREENSHOTS_FOLDER,RESUME_PATH,GITHUB_PROJECTS_URL, logger
 
 
 # ==================== FLASK APP SETUP ====================
-app = Flask(__name__)
-app.config.update(
-    MAIL_SERVER='smtp.gmail.com',
-    MAIL_PORT=587,
-    MAIL_USE_TLS=True,
-    MAIL_USERNAME=EMAIL_CONFIG['sender_email'],
-    MAIL_PASSWORD=EMAIL_CONFIG['sender_password']
-)
-mail = Mail(app)
+# Flask and Flask-Mail are imported when the first message is built, not
+# when this module is, so filling, validation and dry runs never load them
+_mail_app = None
+_mail_app_lock = threading.Lock()
+
+
+def create_mail_app(**overrides):
+    """
+    Build the Flask app and Flask-Mail extension used to send email.
+    
+    Args:
+        **overrides: Flask-Mail settings to use instead of EMAIL_CONFIG's
+            (e.g. MAIL_SERVER/MAIL_PORT of a local SMTP sink)
+    
+    Returns:
+        tuple: (app, mail)
+    """
+    from flask import Flask
+    from flask_mail import Mail
+    
+    app = Flask(__name__)
+    app.config.update(
+        MAIL_SERVER=EMAIL_CONFIG['smtp_server'],
+        MAIL_PORT=EMAIL_CONFIG['smtp_port'],
+        MAIL_USE_TLS=EMAIL_CONFIG['use_tls'],
+        MAIL_USERNAME=EMAIL_CONFIG['sender_email'],
+        MAIL_PASSWORD=EMAIL_CONFIG['sender_password']
+    )
+    app.config.update(overrides)
+    return app, Mail(app)
+
+
+def get_mail_app():
+    """The process-wide (app, mail) pair, created on first use"""
+    global _mail_app
+    with _mail_app_lock:
+        if _mail_app is None:
+            _mail_app = create_mail_app()
+        return _mail_app
+
+
+def configure_mail(**overrides):
+    """
+    Replace the process-wide (app, mail) pair with one using other settings.
+    
+    Returns:
+        tuple: (app, mail)
+    """
+    global _mail_app
+    with _mail_app_lock:
+        _mail_app = create_mail_app(**overrides)
+        return _mail_app
 
 
 def get_latest_screenshot(folder_path):
@@ -50,12 +97,44 @@ def get_latest_screenshot(folder_path):
         return None
 
 
-def create_email_body():
-    """Create formatted email body"""
+@timed("email_find_screenshot")
+def find_screenshot(run_id=None):
+    """
+    Find the screenshot to attach through the screenshot manifest.
+    
+    Args:
+        run_id: Submission run ID; when given, only that run's screenshot is used
+        
+    Returns:
+        str: Path to the screenshot or None if not found
+    """
+    if run_id is not None:
+        entry = (screenshot_manifest.for_run(run_id, "after_submission")
+                 or screenshot_manifest.for_run(run_id))
+        return entry['path'] if entry else None
+    
+    entry = screenshot_manifest.latest()
+    if entry and os.path.exists(entry['path']):
+        return entry['path']
+    # Folders written before the manifest existed
+    return get_latest_screenshot(SCREENSHOTS_FOLDER)
+
+
+def create_email_body(form_data=None, screenshot_attached=True):
+    """
+    Create formatted email body (signed with `form_data`, FORM_DATA by default).
+
+    With `screenshot_attached` False (e.g. an HTTP-engine submission, which
+    has no browser to capture one) the body says the screenshot is missing
+    instead of claiming it is attached.
+    """
+    form_data = form_data or FORM_DATA
+    screenshot_note = ("(attached)" if screenshot_attached
+                       else "(not attached - none was captured for this submission)")
     return f"""Dear Hiring Team,
 
 I hope you’re doing well. Please find my assignment submission below as requested.
-1. Screenshot of the form filled via code(attached)
+1. Screenshot of the form filled via code{screenshot_note}
 2. Source code (GitHub repository link)
     {GITHUB_REPO_URL}
 3. My updated resume(attached)
@@ -102,18 +181,22 @@ I confirm that I’m available to work full-time (10 am – 7 pm) for the next 3
 Please let me know if you need any additional information or clarification.
 
 Best regards,
-{FORM_DATA['full_name']}
-{FORM_DATA['email']}
-{FORM_DATA['contact_number']}
+{form_data['full_name']}
+{form_data['email']}
+{form_data['contact_number']}
 
 ---
 Submitted: {datetime.now().strftime("%d %B %Y, %I:%M %p")}
 """
 
+@timed("email_attach")
 def attach_file_to_message(msg, file_path):
     """
     Attach a file to email message.
     
+    The file is read and base64-encoded once through the shared attachment
+    cache; CachedMessage objects reuse the encoded payload as-is.
+    
     Args:
         msg: Flask-Mail Message object
         file_path: Path to file to attach
@@ -121,6 +204,8 @@ def attach_file_to_message(msg, file_path):
     Returns:
         bool: True if attachment successful, False otherwise
     """
+    from attachment_cache import CachedMessage, attachment_cache
+    
     try:
         abs_path = os.path.abspath(file_path)
         
@@ -128,28 +213,17 @@ def attach_file_to_message(msg, file_path):
             logger.warning(f"⚠️ File not found: {abs_path}")
             return False
         
-        # Determine content type based on extension
-        ext = os.path.splitext(abs_path)[1].lower()
-        content_types = {
-            '.png': 'image/png',
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.gif': 'image/gif',
-            '.pdf': 'application/pdf',
-            '.doc': 'application/msword',
-            '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            '.txt': 'text/plain'
-        }
-        content_type = content_types.get(ext, 'application/octet-stream')
-        
-        with open(abs_path, 'rb') as f:
+        entry = attachment_cache.get(abs_path)
+        if isinstance(msg, CachedMessage):
+            msg.attach_cached(entry)
+        else:
             msg.attach(
-                filename=os.path.basename(abs_path),
-                content_type=content_type,
-                data=f.read()
+                filename=entry.filename,
+                content_type=entry.content_type,
+                data=base64.b64decode(entry.encoded)
             )
         
-        logger.info(f"✓ Attached file: {os.path.basename(abs_path)}")
+        logger.info(f"✓ Attached file: {entry.filename}")
         return True
         
     except Exception as e:
@@ -157,43 +231,261 @@ def attach_file_to_message(msg, file_path):
         return False
 
 
-def send_email_with_latest_screenshot():
+def submission_message_spec(run_id=None, screenshot=None, form_data=None):
     """
-    Send submission email with the latest screenshot and resume attached.
+    Describe the submission email without building it.
+    
+    The result is plain JSON (attachments are file paths), so it can be
+    spooled to the email outbox and turned into a message later.
+    
+    Args:
+        run_id: Submission run ID; the latest screenshot is used if omitted
+        screenshot: Screenshot path, when the caller already knows it
+        form_data: Answers to sign the body with (FORM_DATA by default)
+    
+    Returns:
+        dict: subject, sender, recipients, cc, body and attachment paths
+    """
+    attachments = []
+    
+    # Get the submission's screenshot
+    screenshot = screenshot or find_screenshot(run_id)
+    
+    if screenshot:
+        attachments.append(screenshot)
+    else:
+        logger.warning("⚠️ No screenshot attached - none found for this submission")
+    
+    # Attach resume
+    if os.path.exists(RESUME_PATH):
+        attachments.append(RESUME_PATH)
+    else:
+        logger.warning(f"⚠️ Resume not found at: {RESUME_PATH}")
+    
+    return {
+        'subject': EMAIL_CONFIG['subject'],
+        'sender': EMAIL_CONFIG['sender_email'],
+        'recipients': [EMAIL_CONFIG['recipient_email']],
+        'cc': [EMAIL_CONFIG['cc_email']],
+        'body': create_email_body(form_data, screenshot_attached=bool(screenshot)),
+        'attachments': attachments,
+    }
+
+
+def message_from_spec(spec):
+    """
+    Build a Flask-Mail message from a submission_message_spec() dict.
+    Must be called inside an app context.
+    
+    Returns:
+        Message: Flask-Mail message ready to send
+    """
+    from attachment_cache import CachedMessage
+    
+    msg = CachedMessage(
+        subject=spec['subject'],
+        sender=spec['sender'],
+        recipients=spec['recipients'],
+        cc=spec['cc'],
+        body=spec['body']
+    )
+    for path in spec['attachments']:
+        attach_file_to_message(msg, path)
+    return msg
+
+
+@timed("email_build")
+def build_submission_message(run_id=None):
+    """
+    Build the submission email with the run's screenshot and resume attached.
+    Must be called inside an app context.
+    
+    Args:
+        run_id: Submission run ID; the latest screenshot is used if omitted
+    
+    Returns:
+        Message: Flask-Mail message ready to send
+    """
+    return message_from_spec(submission_message_spec(run_id))
+
+
+def send_email_with_latest_screenshot(run_id=None):
+    """
+    Send submission email with the run's (or latest) screenshot and resume attached.
+    
+    Sends are paced by the shared "email" rate limiter; throttling replies
+    and dropped connections are retried with jittered backoff.
+    
+    Args:
+        run_id: Submission run ID whose screenshot should be attached
     
     Returns:
         bool: True if email sent successfully, False otherwise
     """
     try:
+        app, mail = get_mail_app()
         with app.app_context():
-            # Create message
-            msg = Message(
-                subject=EMAIL_CONFIG['subject'],
-                sender=EMAIL_CONFIG['sender_email'],
-                recipients=[EMAIL_CONFIG['recipient_email']],
-                cc=[EMAIL_CONFIG['cc_email']],
-                body=create_email_body()
-            )
-            
-            # Get and attach latest screenshot
-            latest_screenshot = get_latest_screenshot(SCREENSHOTS_FOLDER)
-            
-            if latest_screenshot:
-                attach_file_to_message(msg, latest_screenshot)
-            else:
-                logger.warning("⚠️ No screenshot attached - none found in folder")
-            
-            # Attach resume
-            if os.path.exists(RESUME_PATH):
-                attach_file_to_message(msg, RESUME_PATH)
-            else:
-                logger.warning(f"⚠️ Resume not found at: {RESUME_PATH}")
+            msg = build_submission_message(run_id)
             
             # Send email
-            mail.send(msg)
+            with metrics.span("email_send"):
+                call_with_retry(lambda: mail.send(msg), limiter=get_limiter("email"),
+                                step="email_send")
             logger.info("✅ Email sent successfully!")
+            metrics.incr("emails", result="ok")
             return True
             
     except Exception as e:
         logger.error(f"❌ Email sending failed: {e}", exc_info=True)
+        metrics.incr("emails", result="failed")
         return False
+
+
+# ==================== BULK SENDING ====================
+class BulkMailer:
+    """
+    Send many messages over one authenticated SMTP connection.
+    
+    The connection is opened once (TCP + TLS + AUTH), recycled after
+    `max_per_connection` messages and re-opened if the server drops it.
+    Every send takes a token from the shared "email" rate limiter and
+    reports throttling replies to it.
+    
+    Args:
+        mail_app: (app, mail) pair to send with (default: get_mail_app())
+    
+    Usage:
+        with BulkMailer() as mailer:
+            for msg in messages:
+                mailer.send(msg)
+    """
+    
+    def __init__(self, max_per_connection=None, max_reconnects=3, limiter=None, mail_app=None):
+        self.mail_app = mail_app
+        self.max_per_connection = max_per_connection or EMAIL_CONFIG['max_per_connection']
+        self.max_reconnects = max_reconnects
+        self.limiter = limiter or get_limiter("email")
+        self.connection = None
+        self.sent_on_connection = 0
+        self.connections_opened = 0
+        self.latencies = []
+        self.mail = None
+        self._app_context = None
+    
+    def __enter__(self):
+        app, self.mail = self.mail_app or get_mail_app()
+        self._app_context = app.app_context()
+        self._app_context.push()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        self._app_context.pop()
+        self._app_context = None
+        return False
+    
+    def _connect(self):
+        self.connection = self.mail.connect()
+        self.connection.__enter__()
+        self.connections_opened += 1
+        self.sent_on_connection = 0
+    
+    def _disconnect(self):
+        if self.connection is None:
+            return
+        try:
+            self.connection.__exit__(None, None, None)
+        except (smtplib.SMTPException, OSError):
+            # The server may already have closed the socket
+            pass
+        self.connection = None
+    
+    def send(self, msg):
+        """
+        Send one message, reconnecting if the connection dropped.
+        
+        Returns:
+            float: Send latency in seconds
+        
+        Raises:
+            smtplib.SMTPException: If the message still fails after reconnecting
+        """
+        if self.connection is not None and self.sent_on_connection >= self.max_per_connection:
+            self._disconnect()
+        if self.limiter is not None:
+            self.limiter.acquire()
+        
+        for attempt in range(self.max_reconnects + 1):
+            if self.connection is None:
+                self._connect()
+            started = time.perf_counter()
+            try:
+                self.connection.send(msg)
+                break
+            except smtplib.SMTPResponseException as e:
+                if self.limiter is not None and is_throttle_error(e):
+                    self.limiter.throttled()
+                raise
+            except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
+                logger.warning(f"⚠️ SMTP connection dropped, reconnecting: {e}")
+                metrics.incr("retries", step="smtp_send")
+                self._disconnect()
+                if attempt == self.max_reconnects:
+                    raise
+        
+        latency = time.perf_counter() - started
+        if self.limiter is not None:
+            self.limiter.succeeded()
+        self.sent_on_connection += 1
+        self.latencies.append(latency)
+        return latency
+    
+    def close(self):
+        """Close the SMTP connection"""
+        self._disconnect()
+    
+    def report(self):
+        """
+        Summarize per-message send latency.
+        
+        Returns:
+            dict: Message and connection counts with mean/p95 latency in ms
+        """
+        ordered = sorted(self.latencies)
+        report = {
+            'messages': len(ordered),
+            'connections': self.connections_opened,
+            'mean_ms': round(sum(ordered) / len(ordered) * 1000, 2) if ordered else None,
+            'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 2)
+            if ordered else None,
+        }
+        logger.info(f"✓ Sent {report['messages']} emails over {report['connections']} "
+                    f"connection(s), mean {report['mean_ms']} ms, p95 {report['p95_ms']} ms")
+        return report
+
+
+def send_bulk_emails(messages, max_per_connection=None):
+    """
+    Send many messages over a pooled SMTP connection.
+    
+    Args:
+        messages: Iterable of Flask-Mail Message objects, or of callables
+            that build one inside the app context
+        max_per_connection: Messages per connection before it is recycled
+    
+    Returns:
+        dict: Send report including the number of failures
+    """
+    failures = 0
+    with BulkMailer(max_per_connection) as mailer:
+        for msg in messages:
+            try:
+                # The mailer paces sends; this adds backoff when the server pushes back
+                message = msg() if callable(msg) else msg
+                call_with_retry(lambda: mailer.send(message), step="smtp_send")
+            except Exception as e:
+                failures += 1
+                logger.error(f"❌ Email sending failed: {e}")
+        report = mailer.report()
+    report['failed'] = failures
+    return report
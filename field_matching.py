@@ -0,0 +1,46 @@
+"""
+Keyword rules that map form questions onto FORM_DATA keys.
+
+Shared by the Selenium filler and the browserless HTTP engine so both
+engines agree on which answer goes into which question.
+"""
+
+# ==================== FIELD RULES ====================
+# Order matters: the first rule whose keyword appears in the question wins.
+FIELD_RULES = [
+    ("full_name", "Full Name", ['name', 'full name']),
+    ("contact_number", "Contact Number", ['contact', 'phone', 'mobile', 'number']),
+    ("email", "Email", ['email', 'e-mail']),
+    ("address", "Address", ['address', 'full address']),
+    ("pin_code", "Pin Code", ['pin', 'pincode', 'pin code', 'postal', 'zip']),
+    ("dob", "Date of Birth", ['dob', 'date of birth', 'birth', 'birthday']),
+    ("gender", "Gender", ['gender', 'sex']),
+    ("verification_code", "Verification Code", ['code', 'captcha', 'verify', 'verification']),
+]
+
+# Patterns for the verification code printed in the form description, in
+# priority order (page_snapshot precompiles them and tries them in turn).
+VERIFICATION_CODE_PATTERNS = [
+    r"Type this code:\s*<b>(.*?)</b>",
+    r"Type this code:\s*(\w+)",
+    r"code:\s*<b>(.*?)</b>",
+    r"code:\s*(\w+)",
+    r"CAPTCHA:\s*(\w+)"
+]
+
+
+def match_field(question_text):
+    """
+    Match a question to a FORM_DATA key.
+
+    Args:
+        question_text: Question text as shown on the form
+
+    Returns:
+        tuple: (form_data_key, display_name) or None if nothing matches
+    """
+    text = question_text.lower()
+    for key, label, keywords in FIELD_RULES:
+        if any(keyword in text for keyword in keywords):
+            return key, label
+    return None
@@ -0,0 +1,148 @@
+"""
+Parser for the form definition Google embeds in every viewform page.
+
+The `FB_PUBLIC_LOAD_DATA_` blob carries every question, its `entry.NNN`
+field ID, choice options and required flag, so a form can be understood
+without rendering it in a browser.
+"""
+
+import hashlib
+import json
+import re
+
+FB_DATA_PATTERN = re.compile(
+    r"FB_PUBLIC_LOAD_DATA_\s*=\s*(\[.*?\])\s*;\s*</script>", re.DOTALL)
+FBZX_PATTERN = re.compile(r'name="fbzx"\s+value="([^"]*)"')
+
+# Google Forms item type codes
+ITEM_SHORT_ANSWER = 0
+ITEM_PARAGRAPH = 1
+ITEM_MULTIPLE_CHOICE = 2
+ITEM_DROPDOWN = 3
+ITEM_CHECKBOXES = 4
+ITEM_LINEAR_SCALE = 5
+ITEM_TITLE = 6
+ITEM_GRID = 7
+ITEM_PAGE_BREAK = 8
+ITEM_DATE = 9
+ITEM_TIME = 10
+
+
+class FormField:
+    """A single answerable field of the form"""
+
+    def __init__(self, entry_id, title, item_type, required=False, options=None,
+                 section=0, description=""):
+        self.entry_id = entry_id
+        self.title = title
+        self.item_type = item_type
+        self.required = required
+        self.options = options or []
+        self.section = section
+        self.description = description
+
+    @property
+    def name(self):
+        """Name of the field in the formResponse POST body"""
+        return f"entry.{self.entry_id}"
+
+
+class FormDefinition:
+    """Parsed form definition with its fields and submission endpoint"""
+
+    def __init__(self, title, fields, section_count, response_url, fbzx="", descriptions=None):
+        self.title = title
+        self.fields = fields
+        self.section_count = section_count
+        self.response_url = response_url
+        self.fbzx = fbzx
+        # Form, section and item description text (never titles), in page order
+        self.descriptions = descriptions or []
+
+    def sections(self):
+        """
+        Returns:
+            list: The fields of each section (page), in page order
+        """
+        grouped = [[] for _ in range(self.section_count)]
+        for field in self.fields:
+            grouped[field.section].append(field)
+        return grouped
+
+
+def response_url_for(view_url):
+    """Turn a .../viewform URL into the matching .../formResponse URL"""
+    base = view_url.split('?', 1)[0].split('#', 1)[0]
+    return re.sub(r"/viewform$", "/formResponse", base.rstrip('/'))
+
+
+def definition_hash(page_source):
+    """Content hash of the embedded form definition, or None if absent"""
+    match = FB_DATA_PATTERN.search(page_source)
+    if not match:
+        return None
+    return hashlib.sha1(match.group(1).encode("utf-8")).hexdigest()
+
+
+def parse_form_definition(page_source, view_url):
+    """
+    Parse the embedded form definition from a viewform page.
+
+    Args:
+        page_source: HTML of the viewform page
+        view_url: Final (post-redirect) URL of the viewform page
+
+    Returns:
+        FormDefinition: Parsed definition
+
+    Raises:
+        ValueError: If the page has no usable FB_PUBLIC_LOAD_DATA_ blob
+    """
+    match = FB_DATA_PATTERN.search(page_source)
+    if not match:
+        raise ValueError("FB_PUBLIC_LOAD_DATA_ not found in page")
+
+    try:
+        data = json.loads(match.group(1))
+        items = data[1][1] or []
+    except (ValueError, IndexError, TypeError) as e:
+        raise ValueError(f"Malformed FB_PUBLIC_LOAD_DATA_: {e}")
+
+    title = data[3] if len(data) > 3 and isinstance(data[3], str) else ""
+    fields = []
+    section = 0
+    form_description = data[1][0] if isinstance(data[1][0], str) else ""
+    descriptions = [form_description] if form_description else []
+
+    for item in items:
+        item_type = item[3] if len(item) > 3 else None
+        if len(item) > 2 and isinstance(item[2], str) and item[2]:
+            descriptions.append(item[2])
+        if item_type == ITEM_PAGE_BREAK:
+            section += 1
+            continue
+
+        answers = item[4] if len(item) > 4 and item[4] else []
+        for answer in answers:
+            if not answer or answer[0] is None:
+                continue
+            options = [opt[0] for opt in (answer[1] or []) if opt and opt[0]]
+            fields.append(FormField(
+                entry_id=answer[0],
+                title=(item[1] or "").strip(),
+                item_type=item_type,
+                required=bool(answer[2]) if len(answer) > 2 else False,
+                options=options,
+                section=section,
+                description=item[2] or "",
+            ))
+
+    fbzx_match = FBZX_PATTERN.search(page_source)
+    return FormDefinition(
+        title=title,
+        fields=fields,
+        section_count=section + 1,
+        response_url=response_url_for(view_url),
+        fbzx=fbzx_match.group(1) if fbzx_match else "",
+        descriptions=descriptions,
+    )
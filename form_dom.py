@@ -0,0 +1,227 @@
+"""
+Single round-trip DOM extraction for the Selenium filler.
+
+One `execute_script` call walks every question on the page and returns
+its text, required flag, input type and a stable locator as JSON, so a
+form costs one WebDriver round-trip to analyze instead of several per
+question. Sections of a multi-section form are filled by entry ID from
+the prefetched form definition, one round-trip each.
+"""
+
+import json
+
+QUESTION_SELECTOR = "div[jsmodel='CP1oW'], div[role='listitem']"
+TEXT_INPUT_TYPES = ('text', 'email', 'tel', 'textarea')
+# Questions answered by picking an option; their only <input> is Google's
+# hidden entry field, which never becomes interactable
+CHOICE_INPUT_TYPES = ('radio', 'checkbox', 'dropdown')
+
+# Tags each question (and its text input) with a data attribute so it can
+# be located again later without holding on to live WebElements. With
+# arguments[1] set, only tags and returns a hash of the page content.
+EXTRACT_QUESTIONS_JS = """
+const selector = arguments[0];
+const hashOnly = arguments[1];
+const out = [];
+document.querySelectorAll(selector).forEach((div, idx) => {
+    // Question containers can nest (listitem > jsmodel div); keep the outermost
+    if (div.parentElement && div.parentElement.closest(selector)) return;
+    const heading = div.querySelector("div[role='heading'], .M4DNQ");
+    if (!heading) return;
+    div.setAttribute('data-gff-q', idx);
+    const input = div.querySelector(
+        "input[type='text'], input[type='email'], input[type='tel'], textarea");
+    let inputType = null;
+    if (input) {
+        input.setAttribute('data-gff-input', idx);
+        inputType = input.tagName === 'TEXTAREA' ? 'textarea' : input.type;
+    } else if (div.querySelector("[role='radio']")) {
+        inputType = 'radio';
+    } else if (div.querySelector("[role='checkbox']")) {
+        inputType = 'checkbox';
+    } else if (div.querySelector("[role='listbox']")) {
+        inputType = 'dropdown';
+    }
+    out.push([idx, heading.innerText.trim(), inputType]);
+});
+if (!hashOnly) return JSON.stringify(out);
+// FNV-1a over the layout, the rendered text (form and question descriptions,
+// where the verification code is printed) and the embedded definition (every
+// section's descriptions): a new code changes the hash like a new question does
+const layout = JSON.stringify([out, document.body ? document.body.innerText : '',
+                               window.FB_PUBLIC_LOAD_DATA_ || null]);
+let hash = 0x811c9dc5;
+for (let i = 0; i < layout.length; i++) {
+    hash ^= layout.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193) >>> 0;
+}
+return hash.toString(16) + ':' + out.length;
+"""
+
+# Sets a field through the native value setter and fires the events
+# Google Forms listens for
+SET_VALUE_JS = """
+function setValue(el, value) {
+    const setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value').set;
+    el.focus();
+    setter.call(el, value);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    el.blur();
+}
+"""
+
+# Sets every field, then reads all values back in the same call.
+BATCH_FILL_JS = SET_VALUE_JS + """
+const assignments = arguments[0];
+const rejected = [];
+for (const [locator, value] of assignments) {
+    const el = document.querySelector(locator);
+    if (!el || el.disabled || el.readOnly) { rejected.push(locator); continue; }
+    setValue(el, value);
+}
+for (const [locator, value] of assignments) {
+    const el = document.querySelector(locator);
+    if (el && el.value !== value && !rejected.includes(locator)) rejected.push(locator);
+}
+return rejected;
+"""
+
+# Fills one section of a multi-section form by entry ID. Returns null while
+# the section has not rendered yet (none of its entries are on the page, or
+# for a section without questions, the previous page is still showing), so
+# it doubles as the wait condition. Filled inputs are tagged data-gff-entry.
+SECTION_FILL_JS = SET_VALUE_JS + """
+const [entryIds, assignments] = arguments;
+const anchor = (id) => document.querySelector(`[name="entry.${id}"]`)
+    || document.querySelector(`[data-params*="[[${id},"]`);
+if (entryIds.length ? !entryIds.some(anchor)
+        : document.documentElement.hasAttribute('data-gff-left')) return null;
+const missing = [], rejected = [];
+for (const [id, value] of assignments) {
+    const found = anchor(id);
+    const box = found && (found.closest("div[role='listitem']") || found);
+    let el = box && box.querySelector(
+        "input[type='text'], input[type='email'], input[type='tel'], textarea");
+    if (!el && found && found.matches("textarea, input:not([type='hidden'])")) el = found;
+    if (!el) { missing.push(id); continue; }
+    el.setAttribute('data-gff-entry', id);
+    if (el.disabled || el.readOnly) { rejected.push(id); continue; }
+    setValue(el, value);
+    if (el.value !== value) rejected.push(id);
+}
+return [missing, rejected];
+"""
+
+# Clicks the "Next" button and marks the page as left
+NEXT_SECTION_JS = """
+for (const button of document.querySelectorAll("div[role='button'], span[role='button']")) {
+    if (button.textContent.trim().toLowerCase() === 'next') {
+        document.documentElement.setAttribute('data-gff-left', '');
+        button.click();
+        return true;
+    }
+}
+return false;
+"""
+
+
+class Question:
+    """Compact record of one form question"""
+
+    __slots__ = ('index', 'text', 'required', 'input_type', 'locator', 'input_locator')
+
+    def __init__(self, index, text, required, input_type, locator, input_locator=None):
+        self.index = index
+        self.text = text
+        self.required = required
+        self.input_type = input_type
+        self.locator = locator
+        self.input_locator = input_locator
+
+    def __repr__(self):
+        return f"Question({self.index}, {self.text!r}, required={self.required})"
+
+
+def parse_questions(payload):
+    """
+    Build Question records from the JSON returned by EXTRACT_QUESTIONS_JS.
+
+    Args:
+        payload: JSON string of [index, text, input_type] triples
+
+    Returns:
+        list: Question records in page order
+    """
+    questions = []
+    for idx, text, input_type in json.loads(payload or "[]"):
+        questions.append(Question(
+            index=idx,
+            text=text.replace('*', '').strip(),
+            required="*" in text,
+            input_type=input_type,
+            locator=f"[data-gff-q='{idx}']",
+            input_locator=f"[data-gff-input='{idx}']" if input_type in TEXT_INPUT_TYPES else None,
+        ))
+    return questions
+
+
+def extract_questions(driver):
+    """Extract every question on the current page in one round-trip"""
+    return parse_questions(driver.execute_script(EXTRACT_QUESTIONS_JS, QUESTION_SELECTOR, False))
+
+
+def tag_questions(driver):
+    """
+    Tag the questions on the current page without transferring them.
+
+    Returns:
+        str: Hash of the question layout and page text (including the
+        verification code), used to validate cached fill plans
+    """
+    return driver.execute_script(EXTRACT_QUESTIONS_JS, QUESTION_SELECTOR, True)
+
+
+def batch_fill(driver, assignments):
+    """
+    Fill many text fields with one execute_script call.
+
+    Args:
+        driver: WebDriver on the form page
+        assignments: (input_locator, value) pairs
+
+    Returns:
+        set: Locators whose value did not stick and need the per-field path
+    """
+    if not assignments:
+        return set()
+    rejected = driver.execute_script(
+        BATCH_FILL_JS, [[locator, str(value)] for locator, value in assignments])
+    return set(rejected or [])
+
+
+def fill_section(driver, entry_ids, assignments):
+    """
+    Fill the current section of a multi-section form in one round-trip.
+
+    Args:
+        driver: WebDriver on the form page
+        entry_ids: Every entry ID of the section, used to tell it has rendered
+        assignments: (entry_id, value) pairs
+
+    Returns:
+        tuple: (missing, rejected) entry IDs, or None if the section has not
+        rendered yet
+    """
+    outcome = driver.execute_script(
+        SECTION_FILL_JS, list(entry_ids),
+        [[entry_id, str(value)] for entry_id, value in assignments])
+    if outcome is None:
+        return None
+    missing, rejected = outcome
+    return set(missing), set(rejected)
+
+
+def click_next_section(driver):
+    """Advance to the next section; False if the page has no Next button"""
+    return bool(driver.execute_script(NEXT_SECTION_JS))
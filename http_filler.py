@@ -0,0 +1,345 @@
+"""
+Browserless Google Form submission engine.
+
+Reads the form definition once, maps FORM_DATA onto the `entry.NNN`
+field IDs using the same keyword rules as the Selenium filler and posts
+the answers straight to `formResponse` over keep-alive connections.
+"""
+
+import re
+import select
+import socket
+import uuid
+import http.client
+from urllib.parse import urlsplit, urljoin, urlencode
+from configg import logger
+from field_matching import match_field
+from form_definition import (parse_form_definition, definition_hash, FBZX_PATTERN,
+                             ITEM_DATE, ITEM_CHECKBOXES)
+from schema_cache import fill_plan_cache
+from page_snapshot import find_verification_code
+from metrics import metrics
+from rate_limit import Throttled, THROTTLE_STATUSES, call_with_retry, get_limiter
+from submission_result import (SubmissionResult, outcome_from_html, record_result,
+                               CONFIRMED, REJECTED, UNCONFIRMED, ERROR)
+
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/119.0 Safari/537.36")
+MAX_REDIRECTS = 5
+
+
+# ==================== HTTP SESSION ====================
+def _connection_dropped(conn):
+    """True if an idle keep-alive connection was closed by the server"""
+    if conn.sock is None:
+        return True
+    try:
+        # An idle connection has nothing to read unless the server hung up
+        readable, _, _ = select.select([conn.sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+class HttpSession:
+    """Minimal keep-alive HTTP client with one pooled connection per host"""
+
+    def __init__(self, timeout=20):
+        self.timeout = timeout
+        self.connections = {}
+        self.cookies = {}
+        # Seconds from the last response's Retry-After header, if any
+        self.retry_after = None
+        # Whether the last request() got as far as writing a request out, so
+        # a POST that failed afterwards may have reached the server
+        self.request_written = False
+
+    def _connection(self, scheme, netloc):
+        key = (scheme, netloc)
+        conn = self.connections.get(key)
+        if conn is not None and _connection_dropped(conn):
+            # Closed by the server while idle; catching it here keeps a POST
+            # from being written into a dead socket
+            conn.close()
+            del self.connections[key]
+            conn = None
+        if conn is None:
+            conn_class = (http.client.HTTPSConnection if scheme == "https"
+                          else http.client.HTTPConnection)
+            conn = conn_class(netloc, timeout=self.timeout)
+            conn.connect()
+            # Headers and body go out in separate writes; without NODELAY
+            # the body waits on a delayed ACK for every request.
+            conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.connections[key] = conn
+        return conn
+
+    def _send(self, method, url, body, headers):
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        request_headers = {
+            "User-Agent": USER_AGENT,
+            "Connection": "keep-alive",
+        }
+        cookies = self.cookies.get(parts.netloc)
+        if cookies:
+            request_headers["Cookie"] = "; ".join(
+                f"{name}={value}" for name, value in cookies.items())
+        request_headers.update(headers or {})
+
+        # A pooled connection may have been closed by the server while idle;
+        # retry once on a fresh connection. Only a GET, or a request that was
+        # never written out, is safe to replay: a POST that failed while the
+        # reply was awaited may already have been recorded.
+        for attempt in range(2):
+            reused = (parts.scheme, parts.netloc) in self.connections
+            conn = self._connection(parts.scheme, parts.netloc)
+            written = False
+            try:
+                conn.request(method, path, body=body, headers=request_headers)
+                written = self.request_written = True
+                response = conn.getresponse()
+                data = response.read()
+                break
+            except (http.client.RemoteDisconnected, ConnectionError,
+                    http.client.CannotSendRequest, http.client.BadStatusLine) as e:
+                conn.close()
+                self.connections.pop((parts.scheme, parts.netloc), None)
+                unsent = (isinstance(e, http.client.CannotSendRequest)
+                          or (reused and not written))
+                if attempt or not (method == "GET" or unsent):
+                    raise
+
+        for header, value in response.getheaders():
+            if header.lower() == "set-cookie":
+                name, _, rest = value.partition("=")
+                self.cookies.setdefault(parts.netloc, {})[name.strip()] = rest.split(";", 1)[0]
+
+        return response.status, response, data
+
+    def request(self, method, url, body=None, headers=None):
+        """
+        Send a request, following redirects.
+
+        Returns:
+            tuple: (status, body_text, final_url)
+        """
+        self.request_written = False
+        for _ in range(MAX_REDIRECTS + 1):
+            status, response, data = self._send(method, url, body, headers)
+            location = response.getheader("Location")
+            if status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                if status in (301, 302, 303):
+                    method, body, headers = "GET", None, None
+                continue
+            retry_after = response.getheader("Retry-After") or ""
+            self.retry_after = float(retry_after) if retry_after.isdigit() else None
+            charset = response.headers.get_content_charset() or "utf-8"
+            return status, data.decode(charset, errors="replace"), url
+        raise http.client.HTTPException(f"Too many redirects for {url}")
+
+    def close(self):
+        """Close all pooled connections"""
+        for conn in self.connections.values():
+            conn.close()
+        self.connections.clear()
+
+
+# ==================== HTTP FORM FILLER ====================
+class HttpGoogleFormFiller:
+    """Form filler that submits without a browser"""
+
+    def __init__(self, form_url, form_data, session=None, plan_cache=None):
+        self.form_url = form_url
+        self.form_data = form_data
+        self.session = session or HttpSession()
+        self.plan_cache = plan_cache or fill_plan_cache
+        self.plan = None
+        self.fbzx = ""
+        self.page_source = ""
+        self.result = None
+
+    def load_plan(self):
+        """
+        Fetch the viewform page once and load its fill plan.
+
+        The plan comes from the schema cache when the form's definition is
+        unchanged; otherwise the definition is parsed, matched against the
+        keyword rules and cached.
+        """
+        if self.plan is None:
+            with metrics.span("http_load_plan"):
+                status, self.page_source, final_url = call_with_retry(
+                    lambda: self._request("GET", self.form_url), step="http_load_plan")
+                if status != 200:
+                    raise http.client.HTTPException(f"Form page returned HTTP {status}")
+
+                content_hash = definition_hash(self.page_source)
+                self.plan = self.plan_cache.get("http", self.form_url, content_hash)
+                if self.plan is None:
+                    metrics.incr("plan_cache", result="miss")
+                    definition = parse_form_definition(self.page_source, final_url)
+                    self.plan = self.compile_plan(definition)
+                    self.plan_cache.put("http", self.form_url, content_hash, self.plan)
+                    logger.info(f"✓ Loaded form definition: {len(definition.fields)} fields")
+                else:
+                    metrics.incr("plan_cache", result="hit")
+
+                fbzx_match = FBZX_PATTERN.search(self.page_source)
+                self.fbzx = fbzx_match.group(1) if fbzx_match else ""
+        return self.plan
+
+    def _request(self, method, url, **kwargs):
+        """One request; throttling responses raise Throttled so they are retried"""
+        status, body, final_url = self.session.request(method, url, **kwargs)
+        if status in THROTTLE_STATUSES:
+            raise Throttled(f"HTTP {status}", self.session.retry_after)
+        return status, body, final_url
+
+    def compile_plan(self, definition):
+        """
+        Match the form definition against FORM_DATA keys.
+
+        Returns:
+            dict: Cacheable plan with the response URL, section count,
+            verification code and [key, label, entry_id, item_type, options]
+            for every matched field
+        """
+        fields = []
+        unmatched = 0
+        for field in definition.fields:
+            match = match_field(field.title)
+            if match:
+                key, label = match
+                fields.append([key, label, field.entry_id, field.item_type, field.options])
+                logger.info(f"✓ Mapped {label} -> {field.name}")
+            else:
+                unmatched += 1
+
+        return {
+            'response_url': definition.response_url,
+            'section_count': definition.section_count,
+            'verification_code': find_verification_code(self.page_source),
+            'fields': fields,
+            'unmatched': unmatched,
+        }
+
+    def extract_verification_code(self):
+        """Extract the verification code from the form page"""
+        code = self.load_plan().get('verification_code')
+        if code:
+            logger.info("✓ Extracted verification code: %s", code)
+            return code
+        return self.form_data.get("verification_code", "")
+
+    def build_payload(self):
+        """
+        Map FORM_DATA onto the form's entry IDs.
+
+        Returns:
+            list: (name, value) pairs for the formResponse POST body
+        """
+        plan = self.load_plan()
+        payload = []
+
+        for key, label, entry_id, item_type, options in plan['fields']:
+            value = self.form_data.get(key)
+            if value is None:
+                logger.warning("No value for %s", label)
+                continue
+            payload.extend(self._encode_field(f"entry.{entry_id}", item_type, options, str(value)))
+
+        payload.append(("fvv", "1"))
+        payload.append(("pageHistory", ",".join(str(i) for i in range(plan['section_count']))))
+        if self.fbzx:
+            payload.append(("fbzx", self.fbzx))
+        return payload
+
+    def _encode_field(self, name, item_type, options, value):
+        """Encode one answer the way the form expects it"""
+        if item_type == ITEM_DATE:
+            parts = re.split(r"[/\-.]", value)
+            if len(parts) == 3:
+                day, month, year = parts
+                return [(f"{name}_year", year),
+                        (f"{name}_month", month.lstrip("0") or "0"),
+                        (f"{name}_day", day.lstrip("0") or "0")]
+
+        if options:
+            # Choice questions only accept one of the listed options
+            for option in options:
+                if option.lower() == value.lower():
+                    value = option
+                    break
+            if item_type == ITEM_CHECKBOXES:
+                return [(name, v.strip()) for v in value.split(",")]
+
+        return [(name, value)]
+
+    def fill_form(self, run_id=None):
+        """
+        Submit the form over HTTP.
+
+        The outcome is kept in `self.result` (a SubmissionResult) and
+        appended to the submission log.
+
+        Returns:
+            bool: True only if Google's confirmation page came back
+        """
+        result = self.result = SubmissionResult(run_id or uuid.uuid4().hex[:12], "http",
+                                                self.form_url)
+        with metrics.context(run_id=result.run_id, engine="http"):
+            self._fill_form(result)
+        metrics.incr("submissions", engine="http", result=result.status)
+        record_result(result)
+        return result.ok
+
+    def _fill_form(self, result):
+        try:
+            plan = self.load_plan()
+            metrics.incr("fields_matched", len(plan['fields']), engine="http")
+            metrics.incr("fields_unmatched", plan.get('unmatched', 0), engine="http")
+            verification_code = self.extract_verification_code()
+            if verification_code:
+                self.form_data["verification_code"] = verification_code
+
+            body = urlencode(self.build_payload())
+            try:
+                with metrics.span("http_submit"):
+                    # Not idempotent: only retried when Google refused it outright
+                    status, reply, final_url = call_with_retry(
+                        lambda: self._request(
+                            "POST", plan['response_url'], body=body,
+                            headers={"Content-Type": "application/x-www-form-urlencoded"}),
+                        limiter=get_limiter("form"), step="http_submit", idempotent=False)
+            finally:
+                # Set even when the reply was lost, so nobody submits these answers again
+                result.posted = self.session.request_written
+
+            if status != 200:
+                logger.error("Form submission returned HTTP %s", status)
+                # Google answers 400 when it refuses the answers themselves; after
+                # a server error the answers may or may not have been recorded
+                outcome = REJECTED if status == 400 else UNCONFIRMED if status >= 500 else ERROR
+                result.finish(outcome, error=f"HTTP {status}", final_url=final_url)
+            else:
+                # A 200 is not proof: rejected answers come back as the form again
+                result.finish(outcome_from_html(reply), final_url=final_url)
+                if result.status != CONFIRMED:
+                    logger.error("Form submission %s: no confirmation page", result.status)
+
+            if result.ok:
+                logger.info("✓ Form submitted over HTTP")
+            else:
+                # The form may have changed under us; re-analyze next time
+                self.plan_cache.invalidate("http", self.form_url)
+                self.plan = None
+
+        except Exception as e:
+            logger.error("HTTP submission failed: %s", e)
+            # A POST that went out before the error may have been recorded
+            result.finish(UNCONFIRMED if result.posted else ERROR, error=str(e))
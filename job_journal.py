@@ -0,0 +1,174 @@
+"""
+SQLite-backed journal of submission jobs.
+
+Each job (a bulk row, or one `main()` run) moves through
+pending -> filled -> submitted -> emailed, or ends up failed. "pending"
+means queued for a worker and "filled" means handed to a filler; a job
+left in either state by a crash may or may not have reached Google.
+`attempts` counts how many times a job was dispatched.
+
+A restarted run skips submitted/emailed jobs and retries failed (and
+interrupted) ones until they reach `max_attempts`. State changes are
+buffered and committed in batches from a single writer, so many workers
+reporting at once do not fight over the database lock.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from configg import JOB_JOURNAL, logger
+
+PENDING = "pending"
+FILLED = "filled"
+SUBMITTED = "submitted"
+EMAILED = "emailed"
+FAILED = "failed"
+DONE_STATES = (SUBMITTED, EMAILED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    form_url TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    run_id TEXT,
+    error TEXT,
+    updated REAL NOT NULL,
+    PRIMARY KEY (form_url, job_id)
+) WITHOUT ROWID
+"""
+
+# Adds excluded.attempts (1 on dispatch, else 0) to the stored count
+UPSERT = """
+INSERT INTO jobs (form_url, job_id, state, attempts, run_id, error, updated)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (form_url, job_id) DO UPDATE SET
+    state = excluded.state,
+    attempts = jobs.attempts + excluded.attempts,
+    run_id = COALESCE(excluded.run_id, jobs.run_id),
+    error = excluded.error,
+    updated = excluded.updated
+"""
+
+
+def job_id_for(form_data):
+    """Stable job ID for a FORM_DATA dict, so the same answers map to the same job"""
+    canonical = json.dumps(form_data, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+class JobJournal:
+    """Batched, resumable record of job states for one form"""
+
+    def __init__(self, form_url, path=None, batch_size=None, max_attempts=None,
+                 flush_interval=None):
+        self.form_url = form_url
+        self.path = path or JOB_JOURNAL['path']
+        self.batch_size = batch_size or JOB_JOURNAL['batch_size']
+        self.max_attempts = max_attempts or JOB_JOURNAL['max_attempts']
+        self.flush_interval = flush_interval or JOB_JOURNAL['flush_interval']
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        # WAL lets readers run while the writer commits; NORMAL sync is
+        # durable across application crashes, which is what resuming needs
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(SCHEMA)
+        self._db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    # ---------- reads ----------
+    def _query(self, sql, params):
+        """Run a read after committing buffered changes, so it sees them"""
+        self.flush()
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def state(self, job_id):
+        """
+        Current state of a job.
+
+        Returns:
+            tuple: (state, attempts, run_id), or (None, 0, None) for an unknown job
+        """
+        rows = self._query(
+            "SELECT state, attempts, run_id FROM jobs WHERE form_url = ? AND job_id = ?",
+            (self.form_url, job_id))
+        return rows[0] if rows else (None, 0, None)
+
+    def load_resume_state(self):
+        """
+        Load what a restarted run needs in one query.
+
+        Returns:
+            tuple: (set of finished job IDs, {job_id: attempts} for jobs
+            that have used up their attempts)
+        """
+        done, exhausted = set(), {}
+        rows = self._query("SELECT job_id, state, attempts FROM jobs WHERE form_url = ?",
+                           (self.form_url,))
+        interrupted = 0
+        for job_id, state, attempts in rows:
+            if state in DONE_STATES:
+                done.add(job_id)
+            elif attempts >= self.max_attempts:
+                exhausted[job_id] = attempts
+            elif state in (PENDING, FILLED):
+                interrupted += 1
+        if interrupted:
+            logger.warning(f"⚠️ {interrupted} job(s) were interrupted mid-submission "
+                           f"and will be retried")
+        return done, exhausted
+
+    def should_run(self, job_id):
+        """True unless the job is finished or out of attempts"""
+        state, attempts, _ = self.state(job_id)
+        return state not in DONE_STATES and attempts < self.max_attempts
+
+    def counts(self):
+        """
+        Returns:
+            dict: Number of jobs in each state
+        """
+        return dict(self._query(
+            "SELECT state, COUNT(*) FROM jobs WHERE form_url = ? GROUP BY state",
+            (self.form_url,)))
+
+    # ---------- writes ----------
+    def mark(self, job_id, state, run_id=None, error=None):
+        """Record a state change; committed with the next batch"""
+        attempt = 1 if state in (PENDING, FILLED) else 0
+        record = (self.form_url, job_id, state, attempt, run_id, error, time.time())
+        with self._lock:
+            self._pending.append(record)
+            due = (len(self._pending) >= self.batch_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Commit buffered state changes in one transaction"""
+        with self._lock:
+            records, self._pending = self._pending, []
+            self._last_flush = time.monotonic()
+            if not records:
+                return
+            with self._db:
+                self._db.executemany(UPSERT, records)
+
+    def close(self):
+        self.flush()
+        self._db.close()
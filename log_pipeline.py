@@ -0,0 +1,227 @@
+"""
+Queued, structured and PII-safe logging.
+
+setup_logging() (configg) installs this pipeline on the root logger.
+- The thread that logs only stamps the record with its metrics.context()
+  (run_id, row_id, worker, engine) and appends it to a queue.
+- A QueueListener thread formats the record, redacts it and writes it
+  out. Console I/O never blocks a filler thread.
+- Messages are %-style and are merged with their arguments only on the
+  listener.
+
+Bulk workers log into a multiprocessing queue that the coordinator's
+listener drains, so all output still goes through one writer.
+
+Redaction:
+- `extra` fields named in LOGGING_CONFIG['redact_fields'] (FORM_DATA
+  keys and `value`) are masked.
+- Email addresses and phone numbers are masked anywhere in the text.
+- Set LOGGING_CONFIG['redact'] to False to see values while debugging
+  locally.
+
+    logger.info("✓ Filled %s", label, extra={'value': value})
+"""
+
+import atexit
+import copy
+import json
+import logging
+import queue
+import re
+from logging.handlers import QueueHandler, QueueListener
+from configg import LOG_FORMAT, LOGGING_CONFIG
+from metrics import metrics
+
+REDACTED = "***"
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+# Indian mobile numbers with an optional +91/0 prefix and the usual separators
+PHONE_PATTERN = re.compile(r"(?<![\w+])(?:\+?91[\s-]?|0)?[6-9]\d{4}[\s-]?\d{5}(?!\w)")
+# Attributes every LogRecord has; anything else on a record came from `extra`
+_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime", "context",
+                                                              "taskName"}
+
+_listener = None
+_worker_listener = None
+_worker_queue = None
+
+
+def redact_text(text):
+    """Mask email addresses and phone numbers"""
+    return PHONE_PATTERN.sub("<phone>", EMAIL_PATTERN.sub("<email>", text))
+
+
+def record_fields(record, redact=True):
+    """
+    Structured fields of a record: the logging thread's context, then `extra`.
+
+    Returns:
+        dict: Field name to value, sensitive values masked when `redact`
+    """
+    fields = dict(getattr(record, 'context', None) or {})
+    for key, value in vars(record).items():
+        if key not in _RECORD_ATTRS:
+            fields[key] = value
+    if redact:
+        sensitive = LOGGING_CONFIG['redact_fields']
+        for key in fields:
+            if key in sensitive:
+                fields[key] = REDACTED
+    return fields
+
+
+class TextFormatter(logging.Formatter):
+    """LOG_FORMAT followed by ` | key=value` for the record's fields"""
+
+    def __init__(self, redact=True):
+        super().__init__(LOG_FORMAT)
+        self.redact = redact
+
+    def format(self, record):
+        text = super().format(record)
+        fields = record_fields(record, self.redact)
+        if fields:
+            text += " | " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return redact_text(text) if self.redact else text
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def __init__(self, redact=True):
+        super().__init__()
+        self.redact = redact
+
+    def format(self, record):
+        entry = {'ts': round(record.created, 6), 'level': record.levelname,
+                 'logger': record.name, 'msg': record.getMessage()}
+        entry.update(record_fields(record, self.redact))
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        if self.redact:
+            entry['msg'] = redact_text(entry['msg'])
+            if 'exc' in entry:
+                entry['exc'] = redact_text(entry['exc'])
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class ContextQueueHandler(QueueHandler):
+    """
+    QueueHandler that does as little as possible on the logging thread.
+
+    The record is stamped with the thread's metrics.context() and queued
+    as it is; formatting happens on the listener. Records bound for
+    another process (`pickled`) have their message merged first, since
+    arbitrary args and tracebacks cannot be pickled.
+    """
+
+    def __init__(self, log_queue, pickled=False):
+        super().__init__(log_queue)
+        self.pickled = pickled
+
+    def prepare(self, record):
+        # Thread-local, so it has to be read here rather than on the listener
+        record.context = metrics.current_context()
+        if not self.pickled:
+            return record
+        record = copy.copy(record)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+def _output_handler(stream):
+    handler = logging.StreamHandler(stream)
+    redact = LOGGING_CONFIG['redact']
+    if LOGGING_CONFIG['format'] == "json":
+        handler.setFormatter(JsonFormatter(redact))
+    else:
+        handler.setFormatter(TextFormatter(redact))
+    return handler
+
+
+def start_logging(level=logging.INFO, stream=None):
+    """
+    Route the root logger through the queue pipeline.
+
+    Like logging.basicConfig(), does nothing (beyond setting the level)
+    if the root logger already has handlers.
+
+    Args:
+        level: Root logger level
+        stream: Where the listener writes (default: stderr)
+    """
+    global _listener
+    root = logging.getLogger()
+    root.setLevel(level)
+    if root.handlers:
+        return
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, _output_handler(stream), respect_handler_level=True)
+    _listener.start()
+    root.addHandler(ContextQueueHandler(log_queue))
+
+
+def stop_logging():
+    """Write out everything still queued and stop the listener threads"""
+    global _listener, _worker_listener, _worker_queue
+    for listener in (_worker_listener, _listener):
+        if listener is not None:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.flush()
+    _listener = _worker_listener = _worker_queue = None
+    # Later records (e.g. from other atexit hooks) fall back to logging.lastResort
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, ContextQueueHandler):
+            root.removeHandler(handler)
+
+
+def worker_log_queue():
+    """
+    Queue for bulk worker processes to log into, drained by this
+    process's listener.
+
+    Returns:
+        multiprocessing.Queue, or None if the pipeline is not running here
+    """
+    global _worker_listener, _worker_queue
+    if _listener is None:
+        return None
+    if _worker_queue is None:
+        import multiprocessing
+        _worker_queue = multiprocessing.Queue()
+        _worker_listener = QueueListener(_worker_queue, *_listener.handlers,
+                                         respect_handler_level=True)
+        _worker_listener.start()
+    return _worker_queue
+
+
+def setup_worker_logging(log_queue, level=logging.INFO):
+    """
+    Send a worker process's records to its coordinator.
+
+    Args:
+        log_queue: The coordinator's worker_log_queue(); with None the
+            worker runs a pipeline of its own
+        level: Root logger level
+    """
+    global _listener, _worker_listener, _worker_queue
+    # A forked worker inherits the coordinator's handlers but not its listener threads
+    _listener = _worker_listener = _worker_queue = None
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    if log_queue is None:
+        start_logging(level)
+        return
+    root.setLevel(level)
+    root.addHandler(ContextQueueHandler(log_queue, pickled=True))
+
+
+atexit.register(stop_logging)
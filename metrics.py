@@ -0,0 +1,226 @@
+"""
+Per-phase timing spans and counters.
+
+Disabled by default: `metrics.span()` then hands back a shared no-op
+context manager and `metrics.incr()` returns immediately. When enabled
+(METRICS_CONFIG['enabled'] or `metrics.enable()`), finished spans are
+buffered and appended to a JSON-lines trace, and span totals plus
+counters are written to a Prometheus textfile on `export()`.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from configg import METRICS_CONFIG, logger
+
+# Buffered trace records written per append
+FLUSH_EVERY = 256
+METRIC_PREFIX = "google_form_filler"
+
+
+class _NoopSpan:
+    """Span used while metrics are disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ('metrics', 'name', 'attrs', 'started', 'wall')
+
+    def __init__(self, metrics, name, attrs):
+        self.metrics = metrics
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.wall = time.time()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics._finish(self, time.perf_counter() - self.started, exc_type is None)
+        return False
+
+    def set(self, **attrs):
+        """Attach attributes discovered while the span is open"""
+        self.attrs.update(attrs)
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in sorted(labels)) + "}"
+
+
+class Metrics:
+    """Collects spans and counters for one process"""
+
+    def __init__(self, enabled=False, trace_path=None, prometheus_path=None):
+        self.enabled = False
+        self.trace_path = trace_path
+        self.prometheus_path = prometheus_path
+        self._buffer = []
+        self._phases = {}
+        self._counters = {}
+        self._context = threading.local()
+        self._lock = threading.Lock()
+        if enabled:
+            self.enable()
+
+    def enable(self, trace_path=None, prometheus_path=None):
+        """Start recording; paths default to METRICS_CONFIG"""
+        self.trace_path = trace_path or self.trace_path or METRICS_CONFIG['trace_path']
+        self.prometheus_path = (prometheus_path or self.prometheus_path
+                                or METRICS_CONFIG['prometheus_path'])
+        self.enabled = True
+
+    def disable(self):
+        self.flush()
+        self.enabled = False
+
+    # ---------- recording ----------
+    def span(self, name, **attrs):
+        """Time a block: `with metrics.span("submit"):`"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _Span(self, name, attrs)
+
+    def incr(self, name, value=1, **labels):
+        """Add to a counter, e.g. `metrics.incr("fields_matched", 7)`"""
+        if not self.enabled:
+            return
+        key = (name, tuple(labels.items()))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    @contextmanager
+    def context(self, **attrs):
+        """
+        Add attributes (e.g. run_id) to every span opened, and every record
+        logged, on this thread inside the block
+        """
+        previous = getattr(self._context, 'attrs', None)
+        self._context.attrs = dict(previous or {}, **attrs)
+        try:
+            yield
+        finally:
+            self._context.attrs = previous
+
+    def current_context(self):
+        """Attributes of the enclosing context() blocks on this thread, or None"""
+        return getattr(self._context, 'attrs', None)
+
+    def _finish(self, span, duration, ok):
+        record = {'span': span.name, 'ts': round(span.wall, 6),
+                  'duration_ms': round(duration * 1000, 3), 'ok': ok}
+        ctx = getattr(self._context, 'attrs', None)
+        if ctx:
+            record.update(ctx)
+        if span.attrs:
+            record.update(span.attrs)
+
+        with self._lock:
+            stats = self._phases.get(span.name)
+            if stats is None:
+                stats = self._phases[span.name] = [0, 0.0, 0.0]
+            stats[0] += 1
+            stats[1] += duration
+            stats[2] = max(stats[2], duration)
+            if not ok:
+                key = ("failures", (("phase", span.name),))
+                self._counters[key] = self._counters.get(key, 0) + 1
+            self._buffer.append(record)
+            flush = len(self._buffer) >= FLUSH_EVERY
+        if flush:
+            self.flush()
+
+    # ---------- export ----------
+    def flush(self):
+        """Append buffered spans to the JSON-lines trace"""
+        with self._lock:
+            records, self._buffer = self._buffer, []
+        if not records or not self.trace_path:
+            return
+        data = "".join(json.dumps(r) + "\n" for r in records)
+        try:
+            os.makedirs(os.path.dirname(self.trace_path) or ".", exist_ok=True)
+            # One append per flush keeps lines from concurrent processes whole
+            with open(self.trace_path, 'a', encoding='utf-8') as f:
+                f.write(data)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write metrics trace: {e}")
+
+    def prometheus_text(self):
+        """Render span totals and counters in the Prometheus text format"""
+        with self._lock:
+            phases = {name: list(stats) for name, stats in self._phases.items()}
+            counters = dict(self._counters)
+
+        lines = []
+        if phases:
+            metric = f"{METRIC_PREFIX}_phase_seconds"
+            lines.append(f"# HELP {metric} Time spent per phase")
+            lines.append(f"# TYPE {metric} summary")
+            for name, (count, total, _) in sorted(phases.items()):
+                lines.append(f'{metric}_sum{{phase="{name}"}} {total:.6f}')
+                lines.append(f'{metric}_count{{phase="{name}"}} {count}')
+            lines.append(f"# HELP {metric}_max Slowest run of each phase")
+            lines.append(f"# TYPE {metric}_max gauge")
+            for name, (_, _, slowest) in sorted(phases.items()):
+                lines.append(f'{metric}_max{{phase="{name}"}} {slowest:.6f}')
+
+        by_name = {}
+        for (name, labels), value in counters.items():
+            by_name.setdefault(name, []).append((labels, value))
+        for name, series in sorted(by_name.items()):
+            metric = f"{METRIC_PREFIX}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for labels, value in sorted(series):
+                lines.append(f"{metric}{_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def export(self):
+        """Flush the trace and rewrite the Prometheus textfile atomically"""
+        if not self.enabled:
+            return
+        self.flush()
+        if not self.prometheus_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.prometheus_path) or ".", exist_ok=True)
+            tmp_path = f"{self.prometheus_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self.prometheus_text())
+            os.replace(tmp_path, self.prometheus_path)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write Prometheus textfile: {e}")
+
+
+def timed(name):
+    """Decorator that wraps every call in `metrics.span(name)`"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return func(*args, **kwargs)
+            with metrics.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Shared per-process metrics
+metrics = Metrics(enabled=METRICS_CONFIG['enabled'])
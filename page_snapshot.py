@@ -0,0 +1,81 @@
+"""
+Single-snapshot page parsing.
+
+The page is fetched once (HTML and tagged questions in one script) and
+everything else is parsed locally: the verification code comes from the
+precompiled VERIFICATION_CODE_PATTERNS over that HTML instead of a page
+source fetch, XPath lookups and per-element parent round-trips.
+"""
+
+import re
+from field_matching import VERIFICATION_CODE_PATTERNS
+from form_dom import EXTRACT_QUESTIONS_JS, QUESTION_SELECTOR, parse_questions
+
+# Searched one after another in priority order: a single combined pattern
+# cannot keep that order, since its matches would not overlap
+CODE_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in VERIFICATION_CODE_PATTERNS]
+
+# Last resort: a 6-character bold token in the same text run as "code"
+BOLD_CODE_PATTERN = re.compile(r"<b>\s*(\w{6})\s*</b>", re.IGNORECASE)
+BOLD_CONTEXT_CHARS = 120
+
+SNAPSHOT_JS = ("return [document.documentElement.outerHTML, (function() {"
+               + EXTRACT_QUESTIONS_JS + "}).apply(null, arguments)];")
+
+
+def code_from_patterns(page_source):
+    """
+    The code the first matching VERIFICATION_CODE_PATTERNS entry finds.
+
+    Returns:
+        str: The stripped code (possibly empty), or None if no pattern matches
+    """
+    for pattern in CODE_PATTERNS:
+        match = pattern.search(page_source)
+        if match:
+            return match.group(1).strip()
+    return None
+
+
+def find_verification_code(page_source):
+    """
+    Find the verification code in a page's HTML.
+
+    Returns:
+        str: The code, or None if the page has none
+    """
+    code = code_from_patterns(page_source)
+    if code:
+        return code
+
+    for match in BOLD_CODE_PATTERN.finditer(page_source):
+        context = page_source[max(0, match.start() - BOLD_CONTEXT_CHARS):match.start()]
+        if "code" in context[context.rfind(">") + 1:].lower():
+            return match.group(1)
+    return None
+
+
+class PageSnapshot:
+    """One fetch of the page's HTML and question layout, parsed locally"""
+
+    def __init__(self, html, questions_payload=None):
+        self.html = html
+        self._questions_payload = questions_payload
+        self._questions = None
+
+    @classmethod
+    def capture(cls, driver):
+        """Fetch the page HTML and tag/extract its questions in one round-trip"""
+        html, questions_payload = driver.execute_script(SNAPSHOT_JS, QUESTION_SELECTOR, False)
+        return cls(html, questions_payload)
+
+    @property
+    def questions(self):
+        """Question records parsed from the snapshot"""
+        if self._questions is None:
+            self._questions = parse_questions(self._questions_payload)
+        return self._questions
+
+    def verification_code(self):
+        """Verification code printed on the page, or None"""
+        return find_verification_code(self.html)
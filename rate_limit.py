@@ -0,0 +1,229 @@
+"""
+Shared token-bucket rate limiting with adaptive backoff.
+
+A RateLimiter keeps its bucket in shared memory, so every thread of a
+process and every worker process it is handed to draw from one budget.
+When the remote side throttles (HTTP 429/503, SMTP 421/45x) the rate is
+cut and everyone pauses; sustained success raises it again additively,
+and only slowly once it nears the rate that last triggered throttling.
+Throughput therefore settles just under the limit instead of bursting
+into it and backing off over and over.
+
+Retries wait with exponential backoff and full jitter so that workers
+throttled together do not come back together.
+"""
+
+import multiprocessing
+import random
+import sys
+import time
+from configg import RATE_LIMITS, RETRY_POLICY, logger
+from metrics import metrics
+
+# HTTP statuses that mean "slow down" rather than "no"
+THROTTLE_STATUSES = (429, 503)
+# SMTP replies that mean "try again later" (e.g. Gmail's 421/454 4.7.0)
+THROTTLE_SMTP_CODES = (421, 450, 451, 452, 454)
+
+# Slots of the shared state array
+_TOKENS, _UPDATED, _RATE, _CEILING, _PAUSED_UNTIL, _LAST_CUT = range(6)
+
+
+class Throttled(Exception):
+    """The remote side asked us to slow down"""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    """
+    Token bucket shared by threads and processes, with an adaptive rate.
+
+    Usage:
+        limiter = RateLimiter("form")
+        limiter.acquire()      # blocks until a token is free
+        ...                    # do the request
+        limiter.succeeded()    # or limiter.throttled(retry_after)
+    """
+
+    def __init__(self, name, rate=None, burst=None, min_rate=None, max_rate=None,
+                 increase=None, decrease=None, cooldown=None):
+        config = RATE_LIMITS[name] or {}
+        self.name = name
+        self.burst = burst or config.get('burst', 1)
+        self.min_rate = min_rate or config.get('min_rate', 0.1)
+        self.max_rate = max_rate or config.get('max_rate', 10.0)
+        # Requests/second added per second of successful traffic
+        self.increase = increase or config.get('increase', 0.5)
+        self.decrease = decrease or config.get('decrease', 0.7)
+        # Throttling reported by several workers at once counts as one event
+        self.cooldown = cooldown or config.get('cooldown', 1.0)
+        rate = rate or config.get('rate', 1.0)
+        now = time.monotonic()
+        # Synchronized, so it can be passed to worker processes at start-up
+        self._state = multiprocessing.Array('d', [self.burst, now, rate, self.max_rate, 0.0, 0.0])
+
+    @property
+    def rate(self):
+        """Current requests per second"""
+        return self._state[_RATE]
+
+    def acquire(self, tokens=1):
+        """
+        Block until `tokens` are available and take them.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._state.get_lock():
+                state = self._state
+                now = time.monotonic()
+                state[_TOKENS] = min(self.burst,
+                                     state[_TOKENS] + (now - state[_UPDATED]) * state[_RATE])
+                state[_UPDATED] = now
+                wait = state[_PAUSED_UNTIL] - now
+                if wait <= 0:
+                    if state[_TOKENS] >= tokens:
+                        state[_TOKENS] -= tokens
+                        break
+                    wait = (tokens - state[_TOKENS]) / state[_RATE]
+            time.sleep(wait)
+            waited += wait
+        if waited:
+            metrics.incr("rate_limit_wait_ms", int(waited * 1000), limiter=self.name)
+        return waited
+
+    def succeeded(self):
+        """Record a request that went through; nudges the rate up"""
+        with self._state.get_lock():
+            state = self._state
+            rate = state[_RATE]
+            step = self.increase / rate
+            if rate >= state[_CEILING] * 0.9:
+                step *= 0.1  # probe gently around the last known limit
+            state[_RATE] = min(self.max_rate, rate + step)
+
+    def throttled(self, retry_after=None):
+        """Record a throttling response: cut the rate and pause every user"""
+        with self._state.get_lock():
+            state = self._state
+            now = time.monotonic()
+            if retry_after:
+                state[_PAUSED_UNTIL] = max(state[_PAUSED_UNTIL], now + retry_after)
+            if now - state[_LAST_CUT] < self.cooldown:
+                return
+            state[_LAST_CUT] = now
+            state[_CEILING] = state[_RATE]
+            state[_RATE] = max(self.min_rate, state[_RATE] * self.decrease)
+            state[_TOKENS] = 0.0
+            rate = state[_RATE]
+        metrics.incr("throttled", limiter=self.name)
+        logger.warning(f"⚠️ {self.name} throttled, slowing to {rate:.2f}/s")
+
+
+# ==================== SHARED LIMITERS ====================
+_limiters = {}
+
+
+def get_limiter(name):
+    """
+    The process-wide limiter for `name`, or None if RATE_LIMITS disables it.
+
+    Worker processes use the limiters their parent handed them through
+    install_limiters(), so the whole run shares one budget.
+    """
+    if RATE_LIMITS.get(name) is None:
+        return None
+    if name not in _limiters:
+        _limiters[name] = RateLimiter(name)
+    return _limiters[name]
+
+
+def shared_limiters():
+    """All configured limiters, to pass to worker processes"""
+    return {name: get_limiter(name) for name in RATE_LIMITS if RATE_LIMITS[name] is not None}
+
+
+def install_limiters(limiters):
+    """Use limiters created by the parent process (call in the worker)"""
+    _limiters.update(limiters or {})
+
+
+# ==================== RETRIES ====================
+def backoff_delay(attempt, base=None, cap=None):
+    """
+    Exponential backoff with full jitter.
+
+    Returns:
+        float: Seconds to wait before retry number `attempt` (0-based)
+    """
+    base = RETRY_POLICY['base_delay'] if base is None else base
+    cap = RETRY_POLICY['max_delay'] if cap is None else cap
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def is_throttle_error(error):
+    """True if `error` means the remote side wants us to slow down"""
+    if isinstance(error, Throttled):
+        return True
+    # smtplib is only loaded here if something in the process sent mail
+    smtplib = sys.modules.get("smtplib")
+    return (smtplib is not None and isinstance(error, smtplib.SMTPResponseException)
+            and error.smtp_code in THROTTLE_SMTP_CODES)
+
+
+def is_transient_error(error):
+    """True if `error` is a network hiccup worth retrying"""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    smtplib = sys.modules.get("smtplib")
+    return smtplib is not None and isinstance(error, smtplib.SMTPServerDisconnected)
+
+
+def call_with_retry(operation, limiter=None, attempts=None, step="request", idempotent=True):
+    """
+    Run `operation` under `limiter`, retrying throttling and transient errors.
+
+    Args:
+        operation: Callable doing one request; raise Throttled to report throttling
+        limiter: RateLimiter to take a token from before every attempt
+        attempts: Maximum attempts (default RETRY_POLICY['attempts'])
+        step: Name used in logs and the retries counter
+        idempotent: False for requests that must not be repeated once they may
+            have reached the server; then only throttling and refused
+            connections are retried
+
+    Returns:
+        The operation's return value
+
+    Raises:
+        The last error once attempts run out, or any non-retryable error
+    """
+    attempts = attempts or RETRY_POLICY['attempts']
+    for attempt in range(attempts):
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            result = operation()
+        except Exception as e:
+            throttle = is_throttle_error(e)
+            retryable = throttle or (is_transient_error(e) if idempotent
+                                     else isinstance(e, ConnectionRefusedError))
+            if not retryable or attempt == attempts - 1:
+                raise
+            retry_after = getattr(e, 'retry_after', None)
+            if throttle and limiter is not None:
+                limiter.throttled(retry_after)
+            delay = max(backoff_delay(attempt), retry_after or 0)
+            metrics.incr("retries", step=step)
+            logger.warning(f"⚠️ {step} failed ({e}), retry {attempt + 1}/{attempts - 1} "
+                           f"in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+        if limiter is not None:
+            limiter.succeeded()
+        return result
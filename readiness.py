@@ -0,0 +1,97 @@
+"""
+Event-driven readiness waits for the Selenium filler.
+
+Replaces fixed sleeps with WebDriverWait conditions (form rendered,
+field interactable, submission outcome shown) and logs any step that
+runs over its latency budget.
+"""
+
+import time
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from configg import logger
+from form_dom import QUESTION_SELECTOR
+from submission_result import CONFIRMED, REJECTED, UNCONFIRMED
+
+CONFIRMATION_SELECTOR = "div.vHW8K, .freebirdFormviewerViewResponseConfirmationMessage"
+# Per-question error messages Google shows when it rejects answers
+VALIDATION_ERROR_SELECTOR = "div[role='listitem'] [role='alert'], .RHiWt"
+
+# One round trip per poll: which outcome, if any, the page shows
+_OUTCOME_SCRIPT = """
+if (document.querySelector(arguments[0])) return arguments[2];
+for (const el of document.querySelectorAll(arguments[1])) {
+    if (el.textContent.trim()) return arguments[3];
+}
+return null;
+"""
+
+# Maximum seconds to wait for each readiness condition
+STEP_TIMEOUTS = {
+    'form_rendered': 15,
+    'section_rendered': 15,
+    'field_interactable': 5,
+    'confirmation': 15,
+}
+
+# Seconds a step may take before it is logged as over budget
+LATENCY_BUDGETS = {
+    'navigate': 5.0,
+    'section': 3.0,
+    'fill_field': 0.5,
+    'submit': 5.0,
+}
+
+
+class LatencyBudget:
+    """Context manager that logs a warning when a step exceeds its budget"""
+
+    def __init__(self, step, budget=None):
+        self.step = step
+        self.budget = LATENCY_BUDGETS.get(step) if budget is None else budget
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.elapsed = time.perf_counter() - self._started
+        if self.budget is not None and self.elapsed > self.budget:
+            logger.warning(f"⏱ {self.step} took {self.elapsed:.2f}s "
+                           f"(budget {self.budget:.2f}s)")
+        return False
+
+
+def wait_for_form_rendered(driver, timeout=None):
+    """Wait until the document is parsed and the first question is present"""
+    timeout = STEP_TIMEOUTS['form_rendered'] if timeout is None else timeout
+    WebDriverWait(driver, timeout).until(
+        lambda d: d.execute_script("return document.readyState") != "loading"
+        and d.find_elements(By.CSS_SELECTOR, QUESTION_SELECTOR))
+
+
+def wait_for_interactable(driver, element, timeout=None):
+    """Wait until `element` is visible and enabled"""
+    timeout = STEP_TIMEOUTS['field_interactable'] if timeout is None else timeout
+    return WebDriverWait(driver, timeout).until(EC.element_to_be_clickable(element))
+
+
+def detect_submission_outcome(driver, timeout=None):
+    """
+    Wait for the page to show how the submission went.
+
+    Returns:
+        str: CONFIRMED (confirmation message shown), REJECTED (validation
+        errors shown) or UNCONFIRMED (neither within the timeout)
+    """
+    timeout = STEP_TIMEOUTS['confirmation'] if timeout is None else timeout
+    try:
+        return WebDriverWait(driver, timeout).until(
+            lambda d: d.execute_script(_OUTCOME_SCRIPT, CONFIRMATION_SELECTOR,
+                                       VALIDATION_ERROR_SELECTOR, CONFIRMED, REJECTED))
+    except TimeoutException:
+        logger.warning(f"Confirmation page not detected within {timeout}s")
+        return UNCONFIRMED
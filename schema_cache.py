@@ -0,0 +1,130 @@
+"""
+Persistent cache of compiled fill plans.
+
+A fill plan is everything derived from analyzing a form: question order,
+entry IDs or locators, and the FORM_DATA key each question maps to.
+Plans are kept in memory (LRU) and on disk, keyed by engine and form
+URL, and carry a content hash of the form so a changed form invalidates
+its plan automatically.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from configg import SCHEMA_CACHE_DIR, logger
+
+
+class FillPlanCache:
+    """Two-level (memory + disk) LRU cache of fill plans"""
+
+    def __init__(self, cache_dir=SCHEMA_CACHE_DIR, max_entries=64):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, engine, form_url):
+        return hashlib.sha1(f"{engine}|{form_url}".encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, engine, form_url, content_hash):
+        """
+        Look up the plan for a form.
+
+        Args:
+            engine: "http" or "browser"
+            form_url: Form URL the plan was built for
+            content_hash: Hash of the form as currently served
+
+        Returns:
+            dict: The cached plan, or None on a miss or a stale entry
+        """
+        key = self._key(engine, form_url)
+        with self._lock:
+            plan = self._memory.get(key)
+            if plan is not None:
+                self._memory.move_to_end(key)
+
+        if plan is None:
+            try:
+                with open(self._path(key), encoding="utf-8") as f:
+                    plan = json.load(f)
+                os.utime(self._path(key))
+            except (OSError, ValueError):
+                plan = None
+
+        if plan is not None and plan.get('content_hash') != content_hash:
+            logger.info("Form changed since its fill plan was cached, re-analyzing")
+            self.invalidate(engine, form_url)
+            plan = None
+
+        if plan is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._remember(key, plan)
+        return plan
+
+    def put(self, engine, form_url, content_hash, plan):
+        """Store a plan in memory and on disk"""
+        if not content_hash:
+            return
+        key = self._key(engine, form_url)
+        plan = dict(plan, content_hash=content_hash, form_url=form_url, engine=engine)
+        self._remember(key, plan)
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(plan, f)
+            os.replace(tmp_path, self._path(key))
+            self._evict_disk()
+        except OSError as e:
+            logger.warning(f"Could not persist fill plan: {e}")
+
+    def invalidate(self, engine, form_url):
+        """Drop the plan for a form from both levels"""
+        key = self._key(engine, form_url)
+        with self._lock:
+            self._memory.pop(key, None)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def clear_memory(self):
+        """Forget the in-memory plans; plans on disk are kept"""
+        with self._lock:
+            self._memory.clear()
+
+    def _remember(self, key, plan):
+        with self._lock:
+            self._memory[key] = plan
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        """Keep at most max_entries plans on disk, dropping the least recently used"""
+        entries = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                   if name.endswith(".json")]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=os.path.getmtime)
+        for path in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+# Shared per-process cache used by both engines
+fill_plan_cache = FillPlanCache()
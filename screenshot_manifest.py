@@ -0,0 +1,177 @@
+"""
+Append-only manifest of saved screenshots.
+
+Every capture is recorded as one JSON line (run ID, name, path,
+timestamp, size), so finding the screenshot for a submission is a
+dictionary lookup instead of a glob plus a stat of every file in the
+folder. Retention keeps the folder from growing without limit.
+"""
+
+import json
+import os
+import threading
+import time
+from configg import SCREENSHOTS_FOLDER, SCREENSHOT_RETENTION, logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are still line-atomic, compaction is best effort
+    fcntl = None
+
+MANIFEST_NAME = "manifest.jsonl"
+# Records appended by this process between retention passes
+RETENTION_CHECK_EVERY = 50
+
+
+class ScreenshotManifest:
+    """Index of screenshots by run ID, backed by an append-only JSONL file"""
+
+    def __init__(self, folder=SCREENSHOTS_FOLDER, max_files=None, max_age_days=None):
+        self.folder = folder
+        self.path = os.path.join(folder, MANIFEST_NAME)
+        self.max_files = max_files or SCREENSHOT_RETENTION['max_files']
+        self.max_age_days = max_age_days or SCREENSHOT_RETENTION['max_age_days']
+        self._by_run = {}
+        self._latest = None
+        self._offset = 0
+        self._since_retention = 0
+        self._lock = threading.Lock()
+
+    def _locked(self, f, exclusive=True):
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+    def _index(self, entry):
+        self._by_run.setdefault(entry['run_id'], {})[entry['name']] = entry
+        if self._latest is None or entry['ts'] >= self._latest['ts']:
+            self._latest = entry
+
+    def _refresh(self):
+        """Index lines appended since the last read (by any process)"""
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if size < self._offset:
+            # Compacted by a retention pass; start over
+            self._by_run, self._latest, self._offset = {}, None, 0
+        if size == self._offset:
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partially written line; pick it up next time
+                self._offset += len(line)
+                try:
+                    self._index(json.loads(line))
+                except ValueError:
+                    continue
+
+    def record(self, run_id, name, path):
+        """
+        Record a saved screenshot.
+
+        Returns:
+            dict: The manifest entry
+        """
+        entry = {
+            'run_id': run_id,
+            'name': name,
+            'path': path,
+            'ts': time.time(),
+            'size': os.path.getsize(path),
+        }
+        line = (json.dumps(entry) + "\n").encode('utf-8')
+
+        with self._lock:
+            os.makedirs(self.folder, exist_ok=True)
+            with open(self.path, 'ab') as f:
+                self._locked(f)
+                f.write(line)
+            self._index(entry)
+            self._since_retention += 1
+            run_retention = self._since_retention >= RETENTION_CHECK_EVERY
+
+        if run_retention:
+            self.enforce_retention()
+        return entry
+
+    def for_run(self, run_id, name=None):
+        """
+        Screenshot recorded for a run.
+
+        Args:
+            run_id: Submission run ID
+            name: Screenshot name (e.g. "after_submission"); newest of the run if omitted
+
+        Returns:
+            dict: Manifest entry, or None if the run has no screenshot
+        """
+        with self._lock:
+            shots = self._by_run.get(run_id)
+            if shots is None or (name is not None and name not in shots):
+                self._refresh()
+                shots = self._by_run.get(run_id)
+            if not shots:
+                return None
+            if name is not None:
+                return shots.get(name)
+            return max(shots.values(), key=lambda e: e['ts'])
+
+    def latest(self):
+        """Most recently recorded screenshot, or None"""
+        with self._lock:
+            self._refresh()
+            return self._latest
+
+    def enforce_retention(self):
+        """
+        Delete screenshots beyond `max_files` or older than `max_age_days`
+        and compact the manifest to the survivors.
+
+        Returns:
+            int: Number of screenshots removed
+        """
+        if not os.path.exists(self.path):
+            return 0
+        cutoff = time.time() - self.max_age_days * 86400
+
+        with self._lock, open(self.path, 'r+b') as f:
+            self._locked(f)
+            entries = []
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+
+            entries.sort(key=lambda e: e['ts'])
+            keep = [e for e in entries if e['ts'] >= cutoff][-self.max_files:]
+            kept_paths = {e['path'] for e in keep}
+            removed = 0
+            for entry in entries:
+                if entry['path'] not in kept_paths:
+                    try:
+                        os.remove(entry['path'])
+                        removed += 1
+                    except OSError:
+                        pass
+
+            # Rewrite in place while holding the lock so concurrent appends wait
+            data = b"".join((json.dumps(e) + "\n").encode('utf-8') for e in keep)
+            f.seek(0)
+            f.write(data)
+            f.truncate()
+
+            self._by_run, self._latest, self._offset = {}, None, 0
+            self._since_retention = 0
+            self._refresh()
+
+        if removed:
+            logger.info(f"Screenshot retention removed {removed} file(s)")
+        return removed
+
+
+# Shared per-process manifest for the configured screenshots folder
+screenshot_manifest = ScreenshotManifest()
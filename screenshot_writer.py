@@ -0,0 +1,173 @@
+"""
+Background screenshot writer.
+
+The filler grabs PNG bytes from the driver and hands them off; encoding,
+optional downscaling, the disk write and the manifest entry happen on a
+thread pool so `fill_form()` does not wait on them.
+
+Pillow is optional: with it installed screenshots can be downscaled and
+re-encoded; without it the PNG is losslessly recompressed with zlib.
+"""
+
+import io
+import os
+import struct
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, wait
+from configg import SCREENSHOT_OPTIONS, logger
+from screenshot_manifest import screenshot_manifest
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _png_chunk(kind, data):
+    return (struct.pack(">I", len(data)) + kind + data
+            + struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff))
+
+
+def recompress_png(png_bytes, level=9):
+    """
+    Losslessly recompress a PNG's image data at a higher zlib level.
+
+    Returns:
+        bytes: The smaller of the original and the recompressed PNG
+    """
+    if not png_bytes.startswith(PNG_SIGNATURE):
+        return png_bytes
+
+    chunks, idat = [], []
+    pos = len(PNG_SIGNATURE)
+    while pos + 8 <= len(png_bytes):
+        length, kind = struct.unpack(">I4s", png_bytes[pos:pos + 8])
+        data = png_bytes[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b"IDAT":
+            idat.append(data)
+        elif kind == b"IEND":
+            break
+        else:
+            chunks.append((kind, data))
+
+    raw = zlib.decompress(b"".join(idat))
+    out = [PNG_SIGNATURE]
+    for kind, data in chunks:
+        out.append(_png_chunk(kind, data))
+    out.append(_png_chunk(b"IDAT", zlib.compress(raw, level)))
+    out.append(_png_chunk(b"IEND", b""))
+    result = b"".join(out)
+    return result if len(result) < len(png_bytes) else png_bytes
+
+
+def shrink_png(png_bytes, max_width=None):
+    """Downscale (Pillow only) and recompress a PNG screenshot"""
+    if Image is None:
+        return recompress_png(png_bytes)
+
+    image = Image.open(io.BytesIO(png_bytes))
+    if max_width and image.width > max_width:
+        image.thumbnail((max_width, image.height * max_width // image.width))
+    out = io.BytesIO()
+    image.save(out, format="PNG", optimize=True)
+    result = out.getvalue()
+    return result if len(result) < len(png_bytes) else png_bytes
+
+
+class ScreenshotWriter:
+    """Thread pool that compresses and writes screenshots off the hot path"""
+
+    def __init__(self, max_workers=None, max_width=None):
+        self.max_workers = max_workers or SCREENSHOT_OPTIONS['workers']
+        self.max_width = max_width or SCREENSHOT_OPTIONS['max_width']
+        self._executor = None
+        self._pending = set()
+        self._lock = threading.Lock()
+        self.screenshots = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.offloaded_seconds = 0.0
+
+    def submit(self, png_bytes, path, run_id, name):
+        """
+        Queue a screenshot for compression and writing.
+
+        Returns:
+            Future: Resolves to the manifest entry once the file is on disk
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="screenshot")
+            future = self._executor.submit(self._write, png_bytes, path, run_id, name)
+            self._pending.add(future)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future):
+        with self._lock:
+            self._pending.discard(future)
+        if future.exception() is not None:
+            logger.error(f"Screenshot write failed: {future.exception()}")
+
+    def _write(self, png_bytes, path, run_id, name):
+        started = time.perf_counter()
+        data = shrink_png(png_bytes, self.max_width)
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        entry = screenshot_manifest.record(run_id, name, path)
+
+        with self._lock:
+            self.screenshots += 1
+            self.bytes_in += len(png_bytes)
+            self.bytes_out += len(data)
+            self.offloaded_seconds += time.perf_counter() - started
+        return entry
+
+    def flush(self, timeout=None):
+        """Wait until every queued screenshot is on disk"""
+        with self._lock:
+            pending = list(self._pending)
+        if pending:
+            wait(pending, timeout=timeout)
+
+    def report(self):
+        """
+        Summarize bytes saved and write latency moved off the hot path.
+
+        Returns:
+            dict: Screenshot count, bytes in/out/saved and offloaded milliseconds
+        """
+        self.flush()
+        report = {
+            'screenshots': self.screenshots,
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'bytes_saved': self.bytes_in - self.bytes_out,
+            'offloaded_ms': round(self.offloaded_seconds * 1000, 1),
+        }
+        logger.info(f"Screenshots: {report['screenshots']} written, "
+                    f"{report['bytes_saved']} bytes saved, "
+                    f"{report['offloaded_ms']} ms moved off fill_form()")
+        return report
+
+    def close(self):
+        """Flush and stop the worker threads"""
+        self.flush()
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+# Shared per-process writer
+screenshot_writer = ScreenshotWriter()
@@ -0,0 +1,104 @@
+"""
+Structured per-submission results and the screenshot policy.
+
+Both engines record a SubmissionResult instead of only returning a bool:
+whether Google's confirmation was actually seen, how long the submission
+took and which screenshot, if any, was kept. Results are appended to
+SUBMISSION_LOG as JSON lines.
+"""
+
+import json
+import os
+import time
+import zlib
+from configg import SCREENSHOT_POLICY, SUBMISSION_LOG, logger
+
+CONFIRMED = "confirmed"      # confirmation page / formResponse reply seen
+REJECTED = "rejected"        # the form came back with validation errors
+UNCONFIRMED = "unconfirmed"  # submitted, but no confirmation seen in time
+ERROR = "error"              # failed before or while submitting
+
+# Markers of Google's "Your response has been recorded" page
+CONFIRMATION_MARKERS = ("freebirdFormviewerViewResponseConfirmationMessage", 'class="vHW8K"')
+# A formResponse reply that still embeds the form definition re-renders the form
+FORM_MARKER = "FB_PUBLIC_LOAD_DATA_"
+
+
+class SubmissionResult:
+    """Outcome of one submission"""
+
+    __slots__ = ('run_id', 'engine', 'form_url', 'status', 'error', 'final_url',
+                 'screenshot', 'started', 'elapsed', 'posted')
+
+    def __init__(self, run_id, engine, form_url):
+        self.run_id = run_id
+        self.engine = engine
+        self.form_url = form_url
+        self.status = None
+        self.error = None
+        self.final_url = None
+        self.screenshot = None
+        self.started = time.time()
+        self.elapsed = None
+        # True once the answers were sent (POST written / submit clicked)
+        self.posted = False
+
+    @property
+    def ok(self):
+        return self.status == CONFIRMED
+
+    def finish(self, status, error=None, final_url=None):
+        self.status = status
+        self.error = error
+        self.final_url = final_url
+        self.elapsed = round(time.time() - self.started, 3)
+        return self
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def outcome_from_html(page_source):
+    """
+    Classify a formResponse reply.
+
+    Returns:
+        str: CONFIRMED, REJECTED or UNCONFIRMED
+    """
+    if any(marker in page_source for marker in CONFIRMATION_MARKERS):
+        return CONFIRMED
+    if FORM_MARKER in page_source:
+        return REJECTED
+    return UNCONFIRMED
+
+
+def should_capture_screenshot(run_id, ok, policy=None):
+    """
+    Decide whether to keep a screenshot for a submission.
+
+    Failures are always captured. Successes follow SCREENSHOT_POLICY:
+    "always", "sample" (1 in `sample_every`, chosen by run ID so every
+    process agrees without coordination) or "on_failure".
+    """
+    if not ok:
+        return True
+    policy = policy or SCREENSHOT_POLICY
+    if policy['mode'] == "always":
+        return True
+    if policy['mode'] == "sample":
+        return zlib.crc32(run_id.encode("utf-8")) % policy['sample_every'] == 0
+    return False
+
+
+def record_result(result, path=None):
+    """Append a result to the submission log (one JSON line)"""
+    path = path or SUBMISSION_LOG
+    if not path:
+        return
+    line = json.dumps(result.to_dict()) + "\n"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(line)
+    except OSError as e:
+        logger.warning(f"⚠️ Could not record submission result: {e}")
@@ -0,0 +1,214 @@
+"""
+Streaming validation and normalization of FORM_DATA rows.
+
+Bulk rows pass through validated_rows() before any browser or HTTP work:
+dates, phone numbers and pin codes are checked and rewritten into the
+form's format, gender answers are mapped onto the form's choices and
+required fields are enforced. Rows that fail go to a reject file with
+the reasons, so they never take a submission slot.
+
+Every rule is a precompiled pattern or a dict lookup, built once at
+import, and rows are processed one at a time, so memory stays flat at
+any input size.
+
+    python validation.py rows.csv --output clean.jsonl --rejects rejects.jsonl
+"""
+
+import json
+import re
+import sys
+import time
+from datetime import date
+from configg import VALIDATION, logger
+
+# Characters people put inside phone numbers and pin codes
+_PHONE_SEPARATORS = str.maketrans("", "", " -().")
+_PIN_SEPARATORS = str.maketrans("", "", " -")
+
+# Optional +91 / 91 / 0 prefix, then a 10-digit Indian mobile number
+PHONE_PATTERN = re.compile(r"(?:\+?91|0)?([6-9]\d{9})")
+PIN_CODE_PATTERN = re.compile(r"[1-9]\d{5}")
+EMAIL_PATTERN = re.compile(r"[^@\s]+@[^@\s]+\.[A-Za-z]{2,}")
+# DD/MM/YYYY with /, - or . separators, or ISO YYYY-MM-DD
+DATE_PATTERN = re.compile(r"(\d{1,2})[/.\-](\d{1,2})[/.\-](\d{4})|(\d{4})-(\d{1,2})-(\d{1,2})")
+_DAYS_IN_MONTH = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_THIS_YEAR = date.today().year
+
+# Free-text gender answers mapped onto the form's choices
+GENDER_CHOICES = {
+    "m": "Male", "male": "Male", "man": "Male",
+    "f": "Female", "female": "Female", "woman": "Female",
+    "o": "Other", "other": "Other", "non-binary": "Other", "nonbinary": "Other",
+}
+
+
+def normalize_phone(value):
+    """10-digit mobile number, or None"""
+    match = PHONE_PATTERN.fullmatch(value.translate(_PHONE_SEPARATORS))
+    return match.group(1) if match else None
+
+
+def normalize_pin_code(value):
+    """6-digit pin code, or None"""
+    value = value.translate(_PIN_SEPARATORS)
+    return value if PIN_CODE_PATTERN.fullmatch(value) else None
+
+
+def normalize_date(value):
+    """Calendar-valid date as DD/MM/YYYY, or None"""
+    match = DATE_PATTERN.fullmatch(value.strip())
+    if not match:
+        return None
+    if match.group(1):
+        day, month, year = int(match.group(1)), int(match.group(2)), int(match.group(3))
+    else:
+        year, month, day = int(match.group(4)), int(match.group(5)), int(match.group(6))
+    if not (1 <= month <= 12 and 1 <= day <= _DAYS_IN_MONTH[month - 1]
+            and 1900 <= year <= _THIS_YEAR):
+        return None
+    if month == 2 and day == 29 and not (year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)):
+        return None
+    return f"{day:02d}/{month:02d}/{year}"
+
+
+def normalize_gender(value):
+    """One of the form's gender choices, or None"""
+    return GENDER_CHOICES.get(value.strip().lower())
+
+
+def normalize_email(value):
+    """Trimmed email address, or None"""
+    value = value.strip()
+    return value if EMAIL_PATTERN.fullmatch(value) else None
+
+
+def normalize_text(value):
+    """Text with runs of whitespace collapsed"""
+    return " ".join(value.split()) or None
+
+
+# (FORM_DATA key, normalizer, message) applied to every row that has the key
+RULES = (
+    ("full_name", normalize_text, "empty"),
+    ("contact_number", normalize_phone, "not a 10-digit mobile number"),
+    ("email", normalize_email, "not an email address"),
+    ("address", normalize_text, "empty"),
+    ("pin_code", normalize_pin_code, "not a 6-digit pin code"),
+    ("dob", normalize_date, "not a valid date (DD/MM/YYYY or YYYY-MM-DD)"),
+    ("gender", normalize_gender, f"not one of {sorted(set(GENDER_CHOICES.values()))}"),
+)
+
+
+def normalize_row(row, required=None):
+    """
+    Validate one row and normalize its values.
+
+    Args:
+        row: FORM_DATA-shaped dict; keys without a rule pass through unchanged
+        required: Keys that must be present and non-empty (VALIDATION['required'])
+
+    Returns:
+        tuple: (normalized copy of the row, list of error strings)
+    """
+    required = VALIDATION['required'] if required is None else required
+    clean = dict(row)
+    errors = []
+    for key in required:
+        value = clean.get(key)
+        if value is None or str(value).strip() == "":
+            errors.append(f"{key}: required")
+    for key, normalize, message in RULES:
+        value = clean.get(key)
+        if value is None or value == "":
+            continue
+        normalized = normalize(str(value))
+        if normalized is None:
+            errors.append(f"{key}: {message}")
+        else:
+            clean[key] = normalized
+    return clean, errors
+
+
+class RejectFile:
+    """JSONL file of rejected rows with the reasons they failed"""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def write(self, row_id, row, errors):
+        self._file.write(json.dumps({'row_id': row_id, 'errors': errors, 'row': row},
+                                    ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def validated_rows(rows, rejects=None, required=None):
+    """
+    Filter and normalize a stream of (row_id, row) pairs.
+
+    Args:
+        rows: Iterable of (row_id, row) pairs, e.g. bulk.read_rows()
+        rejects: RejectFile (or anything with write(row_id, row, errors))
+            that receives the rows that fail
+        required: Keys that must be present and non-empty
+
+    Yields:
+        tuple: (row_id, normalized row) for every valid row
+    """
+    for row_id, row in rows:
+        clean, errors = normalize_row(row, required)
+        if errors:
+            if rejects is not None:
+                rejects.write(row_id, row, errors)
+            continue
+        yield row_id, clean
+
+
+def validate_file(input_path, output_path, rejects_path):
+    """
+    Validate a CSV/JSONL input without submitting anything.
+
+    Returns:
+        dict: Counts of valid and rejected rows and rows per second
+    """
+    from bulk import read_rows
+
+    started = time.perf_counter()
+    valid = 0
+    with open(output_path, 'w', encoding='utf-8') as out, RejectFile(rejects_path) as rejects:
+        for row_id, row in validated_rows(read_rows(input_path), rejects):
+            out.write(json.dumps(dict(row, row_id=row_id), ensure_ascii=False) + "\n")
+            valid += 1
+    elapsed = time.perf_counter() - started
+    report = {
+        'valid': valid,
+        'rejected': rejects.count,
+        'elapsed': round(elapsed, 3),
+        'rows_per_sec': round((valid + rejects.count) / elapsed, 1) if elapsed else 0.0,
+    }
+    logger.info(f"✓ {valid} valid, {rejects.count} rejected ({rejects_path}) "
+                f"in {report['elapsed']}s, {report['rows_per_sec']} rows/s")
+    return report
+
+
+def main():
+    # Same options as `python cli.py validate`
+    from cli import main as cli_main
+    sys.exit(cli_main(["validate"] + sys.argv[1:]))
+
+
+if __name__ == "__main__":
+    main()